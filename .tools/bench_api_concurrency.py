@@ -0,0 +1,118 @@
+"""
+Concurrent-request throughput benchmark for the FastAPI app.
+
+Fires a fixed number of GET requests at a running API with a given level of
+concurrency and reports throughput and latency percentiles. Run it once against
+a build that uses the blocking sync session and once against the async session
+to compare both paths under the same load.
+
+Usage:
+    python .tools/bench_api_concurrency.py --url http://localhost:8000/api/projects
+    python .tools/bench_api_concurrency.py --url http://localhost:8000/api/skills \
+        --requests 2000 --concurrency 50
+"""
+
+import argparse
+import statistics
+import time
+import urllib.request
+from concurrent.futures import ThreadPoolExecutor
+
+
+def timed_get(url: str, timeout: float) -> tuple[float, int]:
+    """
+    Perform a single GET request and measure how long it takes.
+
+    Args:
+        url (str): The URL to request.
+        timeout (float): The socket timeout in seconds.
+
+    Returns:
+        tuple[float, int]: The latency in seconds and the HTTP status code
+            (0 if the request failed).
+    """
+    start = time.perf_counter()
+    try:
+        with urllib.request.urlopen(url, timeout=timeout) as response:
+            response.read()
+            status = response.status
+    except Exception:
+        status = 0
+    return time.perf_counter() - start, status
+
+
+def percentile(values: list[float], pct: float) -> float:
+    """
+    Return the given percentile of a list of values.
+
+    Args:
+        values (list[float]): The sample.
+        pct (float): The percentile to compute, between 0 and 100.
+
+    Returns:
+        float: The percentile value.
+    """
+    ordered = sorted(values)
+    index = min(len(ordered) - 1, int(round(pct / 100 * (len(ordered) - 1))))
+    return ordered[index]
+
+
+def run_benchmark(url: str, requests: int, concurrency: int, timeout: float) -> dict:
+    """
+    Run the benchmark and collect the results.
+
+    Args:
+        url (str): The URL to request.
+        requests (int): The total number of requests to send.
+        concurrency (int): The number of requests in flight at the same time.
+        timeout (float): The socket timeout in seconds.
+
+    Returns:
+        dict: Throughput, error count and latency statistics.
+    """
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=concurrency) as pool:
+        results = list(pool.map(lambda _: timed_get(url, timeout), range(requests)))
+    elapsed = time.perf_counter() - start
+
+    latencies = [latency for latency, status in results if status == 200]
+    errors = len(results) - len(latencies)
+    if not latencies:
+        return {"elapsed": elapsed, "errors": errors}
+    return {
+        "elapsed": elapsed,
+        "errors": errors,
+        "throughput": len(latencies) / elapsed,
+        "mean": statistics.mean(latencies),
+        "p50": percentile(latencies, 50),
+        "p95": percentile(latencies, 95),
+        "p99": percentile(latencies, 99),
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(
+        description="Measure concurrent-request throughput of an API endpoint",
+        formatter_class=argparse.ArgumentDefaultsHelpFormatter,
+    )
+    parser.add_argument("--url", default="http://localhost:8000/api/projects")
+    parser.add_argument("--requests", type=int, default=1000)
+    parser.add_argument("--concurrency", type=int, default=20)
+    parser.add_argument("--timeout", type=float, default=30.0)
+    args = parser.parse_args()
+
+    stats = run_benchmark(args.url, args.requests, args.concurrency, args.timeout)
+    print(f"URL:          {args.url}")
+    print(f"Requests:     {args.requests} (concurrency {args.concurrency})")
+    print(f"Elapsed:      {stats['elapsed']:.2f} s")
+    print(f"Errors:       {stats['errors']}")
+    if "throughput" in stats:
+        print(f"Throughput:   {stats['throughput']:.1f} req/s")
+        print(f"Latency mean: {stats['mean'] * 1000:.1f} ms")
+        print(f"Latency p50:  {stats['p50'] * 1000:.1f} ms")
+        print(f"Latency p95:  {stats['p95'] * 1000:.1f} ms")
+        print(f"Latency p99:  {stats['p99'] * 1000:.1f} ms")
+
+
+if __name__ == "__main__":
+    main()
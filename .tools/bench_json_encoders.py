@@ -0,0 +1,152 @@
+"""
+Micro-benchmark of the API JSON response encoders.
+
+Builds list responses of ProjectSchema, ExperienceSchema and
+CertificationInfoResponse items (10k by default), serializes them the way
+FastAPI does for a route with a response model, and times how long Starlette's
+default ``JSONResponse`` and the API's ``FastJSONResponse`` take to render them.
+
+``FastJSONResponse`` uses orjson when it is installed and a compact
+standard-library encoder otherwise; the encoder in use is printed with the results.
+
+Usage:
+    python .tools/bench_json_encoders.py
+    python .tools/bench_json_encoders.py --items 50000 --repeat 10
+"""
+
+import argparse
+import os
+import statistics
+import sys
+import time
+from datetime import date, datetime, timedelta
+from typing import Callable, List
+
+from pydantic import TypeAdapter
+from starlette.responses import JSONResponse
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+# Importing the api package creates its engines; they never connect here
+os.environ.setdefault("DATABASE_URL", "postgresql+psycopg://bench@localhost/bench")
+
+from api.responses import JSON_ENCODER, FastJSONResponse  # noqa: E402
+from api.schemas.education import CertificationInfoResponse  # noqa: E402
+from api.schemas.experience import ExperienceSchema  # noqa: E402
+from api.schemas.project import ProjectSchema  # noqa: E402
+
+
+def build_items(count: int) -> dict[str, list]:
+    """
+    Build ``count`` items of every benchmarked schema.
+
+    Args:
+        count (int): The number of items per schema.
+
+    Returns:
+        dict[str, list]: The items keyed by schema name.
+    """
+    start = datetime(2020, 1, 1, 12, 30)
+    projects = [
+        ProjectSchema(
+            id=i,
+            user_id=1,
+            title=f"Project {i}",
+            description="A project description with some non-ASCII text: привіт",
+            tech_stack="Python, Flask, FastAPI, SQLAlchemy, PostgreSQL",
+            url=f"https://github.com/user/project-{i}",
+            created_at=start + timedelta(minutes=i),
+            project_category_id=i % 5,
+            images=[
+                {
+                    "id": i * 2 + n,
+                    "name": f"image-{n}",
+                    "url": "/img.png",
+                    "image_category_id": 1,
+                }
+                for n in range(2)
+            ],
+        )
+        for i in range(count)
+    ]
+    experiences = [
+        ExperienceSchema(
+            id=i,
+            user_id=1,
+            company_name=f"Company {i}",
+            role="Developer",
+            start_date=start + timedelta(days=i),
+            end_date=start + timedelta(days=i + 365) if i % 2 else None,
+            description="Worked on things",
+        )
+        for i in range(count)
+    ]
+    certifications = [
+        CertificationInfoResponse(
+            id=i,
+            user_id=1,
+            name=f"Certification {i}",
+            issuing_organization="Organization",
+            issue_date=date(2021, 1, 1) + timedelta(days=i % 1000),
+            credential_id=None,
+            credential_url=None,
+            skills_acquired="Python, SQL, Docker",
+        )
+        for i in range(count)
+    ]
+    return {
+        "ProjectSchema": projects,
+        "ExperienceSchema": experiences,
+        "CertificationInfoResponse": certifications,
+    }
+
+
+def best_of(repeat: int, func: Callable[[], object]) -> float:
+    """
+    Run a function several times and return its median duration.
+
+    Args:
+        repeat (int): The number of runs.
+        func (Callable[[], object]): The function to time.
+
+    Returns:
+        float: The median duration in seconds.
+    """
+    durations = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        durations.append(time.perf_counter() - start)
+    return statistics.median(durations)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(
+        description="Compare JSONResponse and FastJSONResponse on list responses",
+        formatter_class=argparse.ArgumentDefaultsHelpFormatter,
+    )
+    parser.add_argument("--items", type=int, default=10_000)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    print(f"FastJSONResponse encoder: {JSON_ENCODER}")
+    print(f"Items per response: {args.items}, median of {args.repeat} runs\n")
+    print(
+        f"{'schema':<27} {'JSONResponse':>13} {'FastJSONResponse':>17} {'speedup':>8}"
+    )
+
+    for name, items in build_items(args.items).items():
+        schema = type(items[0])
+        # FastAPI serializes the response model in JSON mode before rendering it
+        content = TypeAdapter(List[schema]).dump_python(items, mode="json")
+        if JSONResponse(content).body != FastJSONResponse(content).body:
+            sys.exit(f"{name}: encoders produced different JSON")
+        old = best_of(args.repeat, lambda: JSONResponse(content))
+        new = best_of(args.repeat, lambda: FastJSONResponse(content))
+        print(
+            f"{name:<27} {old * 1000:>10.1f} ms {new * 1000:>14.1f} ms {old / new:>7.1f}x"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,160 @@
+"""
+Latency of a regular endpoint during a login storm.
+
+Measures the latency of GET requests to a regular endpoint (``/api/projects`` by
+default) twice: once on an idle server and once while a pool of threads keeps
+POSTing login attempts to ``/api/token``. Password verification is the most CPU
+intensive request the API serves, so the difference between both runs shows how
+well the hashing pool and the login throttling shield regular traffic.
+
+Usage:
+    python .tools/bench_login_storm.py --base-url http://localhost:8000
+    python .tools/bench_login_storm.py --base-url http://localhost:8000 \\
+        --email admin@example.com --login-concurrency 64 --rotate-accounts
+"""
+
+import argparse
+import os
+import sys
+import threading
+import time
+import urllib.error
+import urllib.parse
+import urllib.request
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from bench_api_concurrency import run_benchmark  # noqa: E402
+
+
+def login(url: str, email: str, password: str, timeout: float) -> int:
+    """
+    Perform a single login attempt.
+
+    Args:
+        url (str): The URL of the token endpoint.
+        email (str): The account to log in with.
+        password (str): The password to log in with.
+        timeout (float): The socket timeout in seconds.
+
+    Returns:
+        int: The HTTP status code (0 if the request failed).
+    """
+    data = urllib.parse.urlencode({"username": email, "password": password}).encode()
+    try:
+        with urllib.request.urlopen(url, data=data, timeout=timeout) as response:
+            response.read()
+            return response.status
+    except urllib.error.HTTPError as e:
+        return e.code
+    except Exception:
+        return 0
+
+
+def storm(
+    url: str,
+    email: str,
+    password: str,
+    rotate_accounts: bool,
+    concurrency: int,
+    timeout: float,
+    stop: threading.Event,
+    statuses: Counter,
+) -> None:
+    """
+    Send login attempts from ``concurrency`` threads until ``stop`` is set.
+
+    Args:
+        url (str): The URL of the token endpoint.
+        email (str): The account to log in with.
+        password (str): The password to log in with.
+        rotate_accounts (bool): Use a different account for every attempt, so
+            only the per-IP limit applies.
+        concurrency (int): The number of login attempts in flight.
+        timeout (float): The socket timeout in seconds.
+        stop (threading.Event): Set to end the storm.
+        statuses (Counter): Collects the status codes of the attempts.
+    """
+    lock = threading.Lock()
+
+    def worker(index: int) -> None:
+        attempt = 0
+        while not stop.is_set():
+            account = f"{index}-{attempt}-{email}" if rotate_accounts else email
+            status = login(url, account, password, timeout)
+            with lock:
+                statuses[status] += 1
+            attempt += 1
+
+    with ThreadPoolExecutor(max_workers=concurrency) as pool:
+        for index in range(concurrency):
+            pool.submit(worker, index)
+
+
+def print_stats(label: str, stats: dict) -> None:
+    """Print the latency statistics of a benchmark run."""
+    if "throughput" not in stats:
+        print(f"{label:<14} all {stats['errors']} requests failed")
+        return
+    print(
+        f"{label:<14} {stats['throughput']:>8.1f} req/s"
+        f" {stats['p50'] * 1000:>8.1f} {stats['p95'] * 1000:>8.1f}"
+        f" {stats['p99'] * 1000:>8.1f} ms  errors {stats['errors']}"
+    )
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(
+        description="Measure endpoint latency during a login storm",
+        formatter_class=argparse.ArgumentDefaultsHelpFormatter,
+    )
+    parser.add_argument("--base-url", default="http://localhost:8000")
+    parser.add_argument("--path", default="/api/projects")
+    parser.add_argument("--email", default="storm@example.com")
+    parser.add_argument("--password", default="wrong-password")
+    parser.add_argument("--rotate-accounts", action="store_true")
+    parser.add_argument("--login-concurrency", type=int, default=32)
+    parser.add_argument("--requests", type=int, default=500)
+    parser.add_argument("--concurrency", type=int, default=10)
+    parser.add_argument("--timeout", type=float, default=30.0)
+    args = parser.parse_args()
+
+    url = args.base_url.rstrip("/") + args.path
+    token_url = args.base_url.rstrip("/") + "/api/token"
+
+    print(f"GET {url}: {args.requests} requests, concurrency {args.concurrency}")
+    print(f"{'':<14} {'':>14} {'p50':>8} {'p95':>8} {'p99':>8}")
+    print_stats(
+        "idle", run_benchmark(url, args.requests, args.concurrency, args.timeout)
+    )
+
+    stop = threading.Event()
+    statuses: Counter = Counter()
+    storm_thread = threading.Thread(
+        target=storm,
+        args=(
+            token_url,
+            args.email,
+            args.password,
+            args.rotate_accounts,
+            args.login_concurrency,
+            args.timeout,
+            stop,
+            statuses,
+        ),
+    )
+    storm_thread.start()
+    time.sleep(1)  # Let the storm build up
+    try:
+        stats = run_benchmark(url, args.requests, args.concurrency, args.timeout)
+    finally:
+        stop.set()
+        storm_thread.join()
+    print_stats("login storm", stats)
+    print(f"Login attempts by status: {dict(sorted(statuses.items()))}")
+
+
+if __name__ == "__main__":
+    main()
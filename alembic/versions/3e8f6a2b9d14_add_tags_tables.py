@@ -0,0 +1,90 @@
+"""Add tags tables
+
+Revision ID: 3e8f6a2b9d14
+Revises: 9c4d2e7f1a85
+Create Date: 2026-10-18 11:48:05.127390
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "3e8f6a2b9d14"
+down_revision: Union[str, None] = "9c4d2e7f1a85"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# The comma-separated column mirrored into each association table
+TAGGED_TABLES = (
+    ("projects", "tech_stack", "project_tags", "project_id"),
+    ("certifications", "skills_acquired", "certification_tags", "certification_id"),
+)
+
+
+def split_tags(value):
+    """Split a comma-separated string the way src.db.models.split_tags does."""
+    names = {}
+    for name in (value or "").split(","):
+        name = name.strip()
+        if name:
+            names.setdefault(name.casefold(), name)
+    return names
+
+
+def upgrade() -> None:
+    tags = op.create_table(
+        "tags",
+        sa.Column("id", sa.Integer(), nullable=False),
+        sa.Column("name", sa.String(length=255), nullable=False),
+        sa.Column("key", sa.String(length=255), nullable=False),
+        sa.PrimaryKeyConstraint("id"),
+        sa.UniqueConstraint("key"),
+    )
+    associations = {}
+    for table, _, association, owner in TAGGED_TABLES:
+        associations[association] = op.create_table(
+            association,
+            sa.Column(owner, sa.Integer(), nullable=False),
+            sa.Column("tag_id", sa.Integer(), nullable=False),
+            sa.ForeignKeyConstraint([owner], [f"{table}.id"], ondelete="CASCADE"),
+            sa.ForeignKeyConstraint(["tag_id"], ["tags.id"], ondelete="CASCADE"),
+            sa.PrimaryKeyConstraint(owner, "tag_id"),
+        )
+        op.create_index(
+            f"ix_{association}_tag_id", association, ["tag_id", owner], unique=False
+        )
+
+    # Backfill the tags from the existing comma-separated columns
+    connection = op.get_bind()
+    rows = {}
+    wanted = {}
+    for table, column, association, _ in TAGGED_TABLES:
+        result = connection.execute(sa.text(f"SELECT id, {column} FROM {table}"))
+        rows[association] = [(id_, split_tags(value)) for id_, value in result]
+        for _, names in rows[association]:
+            for key, name in names.items():
+                wanted.setdefault(key, name)
+    if not wanted:
+        return
+
+    op.bulk_insert(tags, [{"name": name, "key": key} for key, name in wanted.items()])
+    tag_ids = dict(connection.execute(sa.text("SELECT key, id FROM tags")).all())
+    for _, _, association, owner in TAGGED_TABLES:
+        links = [
+            {owner: id_, "tag_id": tag_ids[key]}
+            for id_, names in rows[association]
+            for key in names
+        ]
+        if links:
+            op.bulk_insert(associations[association], links)
+
+
+def downgrade() -> None:
+    for _, _, association, _ in reversed(TAGGED_TABLES):
+        op.drop_index(f"ix_{association}_tag_id", table_name=association)
+        op.drop_table(association)
+    op.drop_table("tags")
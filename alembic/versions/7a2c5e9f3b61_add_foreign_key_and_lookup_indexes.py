@@ -0,0 +1,42 @@
+"""Add foreign key and lookup indexes
+
+Revision ID: 7a2c5e9f3b61
+Revises: 3e8f6a2b9d14
+Create Date: 2026-10-18 12:31:44.860215
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = "7a2c5e9f3b61"
+down_revision: Union[str, None] = "3e8f6a2b9d14"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# (index name, table, columns)
+INDEXES = (
+    ("ix_projects_user_id", "projects", ["user_id"]),
+    ("ix_projects_project_category_id", "projects", ["project_category_id"]),
+    ("ix_projects_title", "projects", ["title"]),
+    ("ix_images_project_id", "images", ["project_id"]),
+    ("ix_images_image_category_id", "images", ["image_category_id"]),
+    ("ix_skills_user_id", "skills", ["user_id"]),
+    ("ix_skills_skill_category_id_id", "skills", ["skill_category_id", "id"]),
+    ("ix_experiences_user_id", "experiences", ["user_id"]),
+    ("ix_resume_user_id", "resume", ["user_id"]),
+    ("ix_certifications_user_id", "certifications", ["user_id"]),
+)
+
+
+def upgrade() -> None:
+    for name, table, columns in INDEXES:
+        op.create_index(op.f(name), table, columns, unique=False)
+
+
+def downgrade() -> None:
+    for name, table, _ in reversed(INDEXES):
+        op.drop_index(op.f(name), table_name=table)
@@ -0,0 +1,60 @@
+"""Add full-text search indexes
+
+Revision ID: 9c4d2e7f1a85
+Revises: 5b1e0c9a7d42
+Create Date: 2026-10-18 11:02:17.304528
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "9c4d2e7f1a85"
+down_revision: Union[str, None] = "5b1e0c9a7d42"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# Must stay identical to the search documents in src/db/models.py, otherwise
+# PostgreSQL will not use the indexes for the search queries
+PROJECTS_DOCUMENT = (
+    "to_tsvector('english'::regconfig, coalesce(title, '') || ' ' || "
+    "coalesce(description, '') || ' ' || coalesce(tech_stack, ''))"
+)
+CERTIFICATIONS_DOCUMENT = (
+    "to_tsvector('english'::regconfig, coalesce(name, '') || ' ' || "
+    "coalesce(skills_acquired, ''))"
+)
+
+
+def upgrade() -> None:
+    if op.get_bind().dialect.name != "postgresql":
+        return
+    op.create_index(
+        "ix_projects_search",
+        "projects",
+        [sa.text(PROJECTS_DOCUMENT)],
+        unique=False,
+        postgresql_using="gin",
+    )
+    op.create_index(
+        "ix_certifications_search",
+        "certifications",
+        [sa.text(CERTIFICATIONS_DOCUMENT)],
+        unique=False,
+        postgresql_using="gin",
+    )
+
+
+def downgrade() -> None:
+    if op.get_bind().dialect.name != "postgresql":
+        return
+    op.drop_index(
+        "ix_certifications_search",
+        table_name="certifications",
+        postgresql_using="gin",
+    )
+    op.drop_index("ix_projects_search", table_name="projects", postgresql_using="gin")
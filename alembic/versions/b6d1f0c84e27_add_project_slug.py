@@ -0,0 +1,61 @@
+"""Add project slug
+
+Revision ID: b6d1f0c84e27
+Revises: 7a2c5e9f3b61
+Create Date: 2026-10-18 13:20:52.418637
+
+"""
+
+import re
+import unicodedata
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "b6d1f0c84e27"
+down_revision: Union[str, None] = "7a2c5e9f3b61"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def slugify(title):
+    """Turn a title into a slug the way src.db.models.slugify does."""
+    ascii_title = (
+        unicodedata.normalize("NFKD", title or "").encode("ascii", "ignore").decode()
+    )
+    slug = re.sub(r"[^a-z0-9]+", "-", ascii_title.lower()).strip("-")
+    return slug[:90].rstrip("-") or "project"
+
+
+def upgrade() -> None:
+    op.add_column("projects", sa.Column("slug", sa.String(length=100), nullable=True))
+
+    # Backfill the slugs, the oldest project keeping the plain one on collisions
+    connection = op.get_bind()
+    projects = connection.execute(sa.text("SELECT id, title FROM projects ORDER BY id"))
+    used, slugs = set(), []
+    for id_, title in projects.all():
+        base = slug = slugify(title)
+        suffix = 2
+        while slug in used:
+            slug, suffix = f"{base}-{suffix}", suffix + 1
+        used.add(slug)
+        slugs.append({"id": id_, "slug": slug})
+    if slugs:
+        connection.execute(
+            sa.text("UPDATE projects SET slug = :slug WHERE id = :id"), slugs
+        )
+
+    with op.batch_alter_table("projects") as batch_op:
+        batch_op.alter_column(
+            "slug", existing_type=sa.String(length=100), nullable=False
+        )
+    op.create_index(op.f("ix_projects_slug"), "projects", ["slug"], unique=True)
+
+
+def downgrade() -> None:
+    op.drop_index(op.f("ix_projects_slug"), table_name="projects")
+    op.drop_column("projects", "slug")
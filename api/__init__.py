@@ -4,6 +4,10 @@ from dotenv import load_dotenv
 from fastapi import FastAPI, APIRouter
 
 from config import env_config
+from logging_setup import api_logger
+from src.compression import SUPPORTED_ENCODINGS, Compressor
+from .middleware import CompressionMiddleware, ETagMiddleware
+from .responses import JSON_ENCODER, FastJSONResponse
 from .routes import (
     about,
     projects,
@@ -12,7 +16,9 @@ from .routes import (
     education,
     contact,
     resume,
+    search,
     security,
+    status,
 )
 
 load_dotenv()
@@ -22,7 +28,22 @@ def create_api():
     """
     Create and configure the FastAPI application.
     """
-    api: FastAPI = FastAPI(title="PortfolioAPI", version="1.0.0")
+    api: FastAPI = FastAPI(
+        title="PortfolioAPI",
+        version="1.0.0",
+        default_response_class=FastJSONResponse,
+    )
+
+    if JSON_ENCODER != "orjson":
+        api_logger.warning(
+            "orjson is not installed, API responses are encoded with the slower "
+            "standard-library json module"
+        )
+
+    if "br" not in SUPPORTED_ENCODINGS:
+        api_logger.warning(
+            "brotli is not installed, responses are only gzip-compressed"
+        )
 
     # Dynamically load environment config
     env = os.getenv("FAST_ENV", "development")  # Default to 'development'
@@ -42,9 +63,25 @@ def create_api():
     api_router.include_router(projects.router)
     api_router.include_router(contact.router)
     api_router.include_router(resume.router)
+    api_router.include_router(search.router)
     api_router.include_router(security.router)
+    api_router.include_router(status.router)
 
     # Include the API router
     api.include_router(api_router)
 
+    # Answer conditional GETs with 304 Not Modified
+    api.add_middleware(ETagMiddleware)
+
+    # Compress responses, added last so it wraps the ETag middleware
+    api.add_middleware(
+        CompressionMiddleware,
+        compressor=Compressor(
+            min_size=api_config.COMPRESS_MIN_SIZE,
+            gzip_level=api_config.COMPRESS_GZIP_LEVEL,
+            brotli_quality=api_config.COMPRESS_BROTLI_QUALITY,
+            cache_size=api_config.COMPRESS_CACHE_SIZE,
+        ),
+    )
+
     return api
@@ -0,0 +1,296 @@
+"""
+Bulk write helpers
+
+The bulk endpoints accept arrays of the regular item schemas and write every
+valid item with a single statement per batch in one transaction:
+
+- creates are a multi-row ``INSERT ... RETURNING``,
+- updates an ORM bulk UPDATE by primary key (``executemany``),
+- deletes a single ``DELETE ... WHERE id IN (...) RETURNING id``.
+
+Every item belongs to the authenticated user: creates are owned by them, and
+updates and deletes carry ``user_id = :user_id`` in their WHERE clause, as the
+project writes do.
+
+Items are checked up front with one query per referenced table, and items that
+would fail (an unknown ID, a row of another user, a missing referenced row, an
+ID given twice) are reported back by their position in the request, with the
+status code a single-item request would get, instead of aborting the batch.
+
+"""
+
+from typing import Iterable, Optional, Sequence
+
+from fastapi import HTTPException
+from sqlalchemy import delete, insert, select, update
+from sqlalchemy.exc import SQLAlchemyError
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from logging_setup import api_logger
+
+# Upper bound for the number of items a single bulk request can carry
+MAX_BULK_ITEMS = 500
+
+
+def check_batch_size(items: Sequence) -> None:
+    """
+    Reject empty and oversized batches.
+
+    Args:
+        items (Sequence): The items of the request.
+
+    Raises:
+        HTTPException: 422 if the batch is empty or larger than ``MAX_BULK_ITEMS``.
+    """
+    if not items or len(items) > MAX_BULK_ITEMS:
+        raise HTTPException(
+            status_code=422,
+            detail=f"A bulk request must contain between 1 and {MAX_BULK_ITEMS} items",
+        )
+
+
+async def existing_ids(db: AsyncSession, model, ids: Iterable[int]) -> set[int]:
+    """
+    Return which of the given IDs exist in the table of a model.
+
+    Args:
+        db (AsyncSession): The database session.
+        model: The model class to look the IDs up in.
+        ids (Iterable[int]): The IDs to look up.
+
+    Returns:
+        set[int]: The IDs that exist.
+    """
+    ids = set(ids)
+    if not ids:
+        return set()
+    result = await db.scalars(select(model.id).where(model.id.in_(ids)))
+    return set(result.all())
+
+
+async def ownership_errors(
+    db: AsyncSession, model, ids: dict[int, int], user_id: int, action: str
+) -> dict[int, HTTPException]:
+    """
+    Find the items whose row is missing or belongs to another user.
+
+    Args:
+        db (AsyncSession): The database session.
+        model: The model class of the rows.
+        ids (dict[int, int]): The ID of every item to check, by its index.
+        user_id (int): The ID of the user the rows must belong to.
+        action (str): The action reported in the 403 errors, e.g. ``"update"``.
+
+    Returns:
+        dict[int, HTTPException]: A 404 or 403 error for every failing item by
+            its index.
+    """
+    if not ids:
+        return {}
+    result = await db.execute(
+        select(model.id, model.user_id).where(model.id.in_(set(ids.values())))
+    )
+    owners = dict(result.tuples().all())
+    errors = {}
+    for index, id_ in ids.items():
+        if id_ not in owners:
+            errors[index] = HTTPException(
+                status_code=404, detail=f"{model.__name__} {id_} not found"
+            )
+        elif owners[id_] != user_id:
+            errors[index] = HTTPException(
+                status_code=403,
+                detail=f"Not authorized to {action} {model.__name__} {id_}",
+            )
+    return errors
+
+
+async def find_errors(
+    db: AsyncSession,
+    rows: list[dict],
+    references: dict,
+    model=None,
+    user_id: Optional[int] = None,
+) -> dict[int, HTTPException]:
+    """
+    Find the rows of a batch that cannot be written.
+
+    Args:
+        db (AsyncSession): The database session.
+        rows (list[dict]): The column values of every item of the batch.
+        references (dict): The referenced model of every foreign key column,
+            e.g. ``{"skill_category_id": SkillCategory}``.
+        model (optional): The model being updated. When given, every row must
+            carry the ``id`` of an existing row of ``user_id``, at most once per
+            batch.
+        user_id (int, optional): The ID of the user updating the rows.
+
+    Returns:
+        dict[int, HTTPException]: The error of every failing item by its index.
+    """
+    errors = {}
+    for column, referenced in references.items():
+        found = await existing_ids(db, referenced, (row[column] for row in rows))
+        for index, row in enumerate(rows):
+            if row[column] not in found:
+                errors.setdefault(
+                    index,
+                    HTTPException(
+                        status_code=404,
+                        detail=f"{referenced.__name__} {row[column]} not found",
+                    ),
+                )
+
+    if model is not None:
+        ids = {index: row["id"] for index, row in enumerate(rows)}
+        for index, error in (
+            await ownership_errors(db, model, ids, user_id, "update")
+        ).items():
+            errors.setdefault(index, error)
+        seen = set()
+        for index, row in enumerate(rows):
+            if row["id"] in seen:
+                errors.setdefault(
+                    index,
+                    HTTPException(
+                        status_code=422,
+                        detail=f"{model.__name__} {row['id']} given twice",
+                    ),
+                )
+            seen.add(row["id"])
+    return errors
+
+
+def error_list(
+    errors: dict[int, HTTPException], ids: Optional[list] = None
+) -> list[dict]:
+    """
+    Format the errors of a batch for the response.
+
+    Args:
+        errors (dict[int, HTTPException]): The error of every failing item by its index.
+        ids (list, optional): The IDs of the items, by index.
+
+    Returns:
+        list[dict]: The errors ordered by item index.
+    """
+    return [
+        {
+            "index": index,
+            "id": ids[index] if ids else None,
+            "status_code": error.status_code,
+            "detail": error.detail,
+        }
+        for index, error in sorted(errors.items())
+    ]
+
+
+async def _execute(db: AsyncSession, model, action: str, statement, *args):
+    try:
+        result = await db.execute(statement, *args)
+    except SQLAlchemyError as e:
+        await db.rollback()
+        api_logger.error(f"SQLAlchemyError occurred: {e}")
+        raise HTTPException(
+            status_code=500,
+            detail=f"An error occurred while {action} {model.__tablename__}",
+        )
+    return result
+
+
+async def bulk_insert(
+    db: AsyncSession, model, rows: list[dict], loaders: Sequence = ()
+) -> list:
+    """
+    Insert rows with a single multi-row ``INSERT ... RETURNING``.
+
+    The returned rows are matched to the parameters by a sentinel column on
+    PostgreSQL. Backends that cannot guarantee the order of a batched RETURNING,
+    such as SQLite, fall back to one INSERT per row.
+
+    Args:
+        db (AsyncSession): The database session.
+        model: The model class to insert into.
+        rows (list[dict]): The column values of the rows.
+        loaders (Sequence): Loader options for the returned instances.
+
+    Returns:
+        list: The created instances, in the order of ``rows``.
+    """
+    if not rows:
+        return []
+    statement = (
+        insert(model).returning(model, sort_by_parameter_order=True).options(*loaders)
+    )
+    result = await _execute(db, model, "creating", statement, rows)
+    return list(result.scalars().all())
+
+
+async def bulk_update(
+    db: AsyncSession, model, rows: list[dict], user_id: int, loaders: Sequence = ()
+) -> list:
+    """
+    Update rows of a user by primary key with a single ``executemany`` UPDATE.
+
+    Args:
+        db (AsyncSession): The database session.
+        model: The model class to update.
+        rows (list[dict]): The ``id`` and the new column values of every row.
+        user_id (int): The ID of the user the rows must belong to.
+        loaders (Sequence): Loader options for the returned instances.
+
+    Returns:
+        list: The updated instances, in the order of ``rows``.
+    """
+    if not rows:
+        return []
+    # The instances are read back below, so the session is not synchronized
+    statement = (
+        update(model)
+        .where(model.user_id == user_id)
+        .execution_options(synchronize_session=None)
+    )
+    await _execute(db, model, "updating", statement, rows)
+    ids = [row["id"] for row in rows]
+    result = await db.scalars(
+        select(model)
+        .where(model.id.in_(ids), model.user_id == user_id)
+        .options(*loaders)
+        .execution_options(populate_existing=True)
+    )
+    updated = {instance.id: instance for instance in result.unique()}
+    return [updated[id_] for id_ in ids if id_ in updated]
+
+
+async def bulk_delete(
+    db: AsyncSession, model, ids: list[int], user_id: int
+) -> tuple[list[int], dict[int, HTTPException]]:
+    """
+    Delete rows of a user with a single ``DELETE ... RETURNING``.
+
+    The rows that were not deleted are only looked up when there are any, so a
+    fully authorized batch costs a single statement.
+
+    Args:
+        db (AsyncSession): The database session.
+        model: The model class to delete from.
+        ids (list[int]): The IDs of the rows.
+        user_id (int): The ID of the user the rows must belong to.
+
+    Returns:
+        tuple[list[int], dict[int, HTTPException]]: The IDs of the deleted rows,
+            and a 404 or 403 error for every other item by its index.
+    """
+    if not ids:
+        return [], {}
+    statement = (
+        delete(model)
+        .where(model.id.in_(ids), model.user_id == user_id)
+        .returning(model.id)
+    )
+    result = await _execute(db, model, "deleting", statement)
+    deleted = sorted(result.scalars().all())
+    deleted_ids = set(deleted)
+    failed = {index: id_ for index, id_ in enumerate(ids) if id_ not in deleted_ids}
+    errors = await ownership_errors(db, model, failed, user_id, "delete")
+    return deleted, errors
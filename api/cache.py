@@ -0,0 +1,268 @@
+"""
+Read-through response cache for the API
+
+Successful GET responses of the data routers are stored under their route and
+query parameters and served from the cache until they expire or until a write
+through ``api/crud`` invalidates the router's namespace.
+
+Every namespace has a generation counter that an invalidation increments, and
+entries are keyed by the generation read before their handler ran. A response
+rendered from data read before a write commits, but stored after the write's
+invalidation, is therefore filed under the old generation and never served.
+
+Redis is used when ``CACHE_REDIS_URL`` is configured, so every worker shares the
+same entries and invalidations. Without it each worker keeps a bounded
+in-process LRU; an invalidation then only reaches the worker that served the
+write, and other workers may serve the old data until ``CACHE_TTL`` expires.
+
+"""
+
+import json
+import os
+from typing import Callable, Optional
+from urllib.parse import urlencode
+
+from fastapi import Request, Response
+from fastapi.responses import StreamingResponse
+from fastapi.routing import APIRoute
+from redis.exceptions import RedisError
+
+from api.middleware import compute_etag
+from config import env_config
+from logging_setup import api_logger
+from src.cache_backends import AsyncLRUBackend, AsyncRedisBackend
+
+# Prefix for every key the cache writes to Redis
+KEY_PREFIX = "api-cache"
+
+
+def encode_response(response: Response) -> bytes:
+    """
+    Serialize a response into the bytes stored in the cache.
+
+    Args:
+        response (Response): The response to serialize.
+
+    Returns:
+        bytes: A JSON header line with the status code and headers, followed by the body.
+    """
+    headers = [
+        [name.decode("latin-1"), value.decode("latin-1")]
+        for name, value in response.raw_headers
+        if name != b"content-length"
+    ]
+    head = json.dumps({"status_code": response.status_code, "headers": headers})
+    return head.encode() + b"\n" + response.body
+
+
+def decode_response(value: bytes) -> Response:
+    """
+    Rebuild a response from the bytes stored in the cache.
+
+    Args:
+        value (bytes): The bytes produced by ``encode_response``.
+
+    Returns:
+        Response: The cached response.
+    """
+    head, body = value.split(b"\n", 1)
+    meta = json.loads(head)
+    response = Response(content=body, status_code=meta["status_code"])
+    for name, val in meta["headers"]:
+        response.headers.append(name, val)
+    return response
+
+
+class ResponseCache:
+    """
+    Response cache with hit/miss accounting.
+
+    Backend failures are logged and treated as misses, so an unavailable Redis
+    slows the API down instead of failing its requests.
+
+    """
+
+    def __init__(self, config=None):
+        """
+        Initialize the cache backend from the configuration.
+
+        Args:
+            config (type[Config], optional): The configuration class holding the
+                cache settings. Defaults to the class selected by ``FAST_ENV``.
+        """
+        if config is None:
+            config = env_config[os.getenv("FAST_ENV", "development")]
+        self.ttl = config.CACHE_TTL
+        if config.CACHE_REDIS_URL:
+            self.backend = AsyncRedisBackend(config.CACHE_REDIS_URL, KEY_PREFIX)
+        else:
+            self.backend = AsyncLRUBackend(config.CACHE_MAX_ENTRIES)
+        self.hits = 0
+        self.misses = 0
+        self.invalidations = 0
+        self.errors = 0
+
+    @property
+    def enabled(self) -> bool:
+        return self.ttl > 0
+
+    async def generation(self, namespace: str) -> Optional[int]:
+        """
+        Read the current generation of a namespace.
+
+        Args:
+            namespace (str): The namespace of the router the route belongs to.
+
+        Returns:
+            int, optional: The generation, or None if the backend failed.
+        """
+        try:
+            return await self.backend.generation(namespace)
+        except RedisError as e:
+            self.errors += 1
+            api_logger.warning(f"Cache generation lookup failed: {e}")
+            return None
+
+    async def get(self, namespace: str, key: str) -> Optional[Response]:
+        """
+        Look up a cached response.
+
+        Args:
+            namespace (str): The namespace of the router the route belongs to.
+            key (str): The key of the request.
+
+        Returns:
+            Response, optional: The cached response, or None on a miss.
+        """
+        try:
+            value = await self.backend.get(namespace, key)
+        except RedisError as e:
+            self.errors += 1
+            api_logger.warning(f"Cache lookup failed: {e}")
+            value = None
+        if value is None:
+            self.misses += 1
+            return None
+        self.hits += 1
+        return decode_response(value)
+
+    async def set(self, namespace: str, key: str, response: Response) -> None:
+        """
+        Store a response.
+
+        Args:
+            namespace (str): The namespace of the router the route belongs to.
+            key (str): The key of the request.
+            response (Response): The response to store.
+        """
+        try:
+            await self.backend.set(namespace, key, encode_response(response), self.ttl)
+        except RedisError as e:
+            self.errors += 1
+            api_logger.warning(f"Cache store failed: {e}")
+
+    async def invalidate(self, namespace: str) -> None:
+        """
+        Move a namespace to its next generation and drop its cached responses.
+
+        Args:
+            namespace (str): The namespace whose data has changed.
+        """
+        if not self.enabled:
+            return
+        try:
+            await self.backend.clear(namespace)
+            self.invalidations += 1
+        except RedisError as e:
+            self.errors += 1
+            api_logger.error(f"Cache invalidation of {namespace} failed: {e}")
+
+    def stats(self) -> dict:
+        """
+        Report the cache counters of the current worker.
+
+        Returns:
+            dict: The backend name, hit/miss/invalidation/error counters and the
+                number of entries (in-process backend only).
+        """
+        return {
+            "backend": self.backend.name,
+            "ttl": self.ttl,
+            "hits": self.hits,
+            "misses": self.misses,
+            "invalidations": self.invalidations,
+            "errors": self.errors,
+            "entries": self.backend.size(),
+        }
+
+
+def cache_key(request: Request) -> str:
+    """
+    Build the cache key of a request from its host, path and sorted query parameters.
+
+    The host is part of the key because paginated responses embed absolute URLs
+    in their ``Link`` header.
+
+    Args:
+        request (Request): The incoming request.
+
+    Returns:
+        str: The cache key.
+    """
+    query = urlencode(sorted(request.query_params.multi_items()))
+    return f"{request.url.netloc}{request.url.path}?{query}"
+
+
+def cached_route(namespace: str) -> type[APIRoute]:
+    """
+    Build a route class that serves the GET routes of a router through the cache.
+
+    Use it as the ``route_class`` of an ``APIRouter``. Other methods are passed
+    through untouched; the CRUD functions behind them invalidate ``namespace``.
+
+    Args:
+        namespace (str): The namespace the router's responses are stored under.
+
+    Returns:
+        type[APIRoute]: The route class.
+    """
+
+    class CachedRoute(APIRoute):
+        def get_route_handler(self) -> Callable:
+            handler = super().get_route_handler()
+
+            async def cached_handler(request: Request) -> Response:
+                if request.method != "GET" or not response_cache.enabled:
+                    return await handler(request)
+
+                # Read before the handler, so a write committing while it runs
+                # files the response under a generation that is already stale
+                generation = await response_cache.generation(namespace)
+                if generation is None:
+                    return await handler(request)
+
+                key = f"{generation}:{cache_key(request)}"
+                cached = await response_cache.get(namespace, key)
+                if cached is not None:
+                    cached.headers["X-Cache"] = "HIT"
+                    return cached
+
+                response = await handler(request)
+                if (
+                    response.status_code == 200
+                    and not isinstance(response, StreamingResponse)
+                    # The key does not cover the request headers a response varies on
+                    and "vary" not in response.headers
+                ):
+                    # Stored with the entry so hits skip hashing the body again
+                    response.headers["ETag"] = compute_etag(response.body)
+                    await response_cache.set(namespace, key, response)
+                response.headers["X-Cache"] = "MISS"
+                return response
+
+            return cached_handler
+
+    return CachedRoute
+
+
+response_cache = ResponseCache()
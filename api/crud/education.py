@@ -1,10 +1,22 @@
 from datetime import date
+from typing import AsyncIterator, List, Optional
 
 from fastapi import Depends, HTTPException
+from sqlalchemy import select
 from sqlalchemy.exc import SQLAlchemyError
-from sqlalchemy.orm import Session
+from sqlalchemy.ext.asyncio import AsyncSession
 
+from api.bulk import (
+    bulk_delete,
+    bulk_insert,
+    bulk_update,
+    check_batch_size,
+    error_list,
+    find_errors,
+)
+from api.cache import response_cache
 from api.db import database
+from api.pagination import DEFAULT_PAGE_LIMIT, paginate
 from api.schemas.education import (
     EducationInfoResponse,
     CertificationInfoResponse,
@@ -12,8 +24,19 @@ from api.schemas.education import (
     UpdateCertificationResponse,
     DeleteCertificationResponse,
 )
+from api.streaming import stream_scalars
 from logging_setup import api_logger
-from src.db.models import Certification
+from src.db.models import Certification, filter_by_tag, sync_tags
+
+# Columns written by the bulk endpoints
+CERTIFICATION_COLUMNS = {
+    "name",
+    "issuing_organization",
+    "issue_date",
+    "credential_id",
+    "credential_url",
+    "skills_acquired",
+}
 
 
 async def get_education_info():
@@ -46,17 +69,58 @@ async def get_education_info():
     )
 
 
-async def get_all_certifications(db: Session = Depends(database.get_db_session)):
-    """Retrieve all certifications from the database."""
+def _certifications_statement(skill: Optional[str] = None):
+    """Select certifications, optionally only those teaching a skill."""
+    statement = select(Certification)
+    if skill:
+        statement = filter_by_tag(statement, Certification, skill)
+    return statement
+
+
+async def get_all_certifications(
+    db: AsyncSession = Depends(database.get_async_db_session),
+    skill: Optional[str] = None,
+):
+    """Retrieve all certifications from the database, optionally only those teaching a skill."""
+    result = await db.scalars(_certifications_statement(skill))
     api_logger.info("Certifications. Status: retrieved")
-    return db.query(Certification).all()
+    return result.all()
+
+
+async def get_certifications_page(
+    db: AsyncSession,
+    limit: int = DEFAULT_PAGE_LIMIT,
+    cursor: Optional[str] = None,
+    skill: Optional[str] = None,
+) -> dict:
+    """Retrieve a single page of certifications ordered by ID, optionally only those teaching a skill."""
+    certifications, next_cursor = await paginate(
+        db, _certifications_statement(skill), Certification, limit, cursor
+    )
+    api_logger.info("Certifications page. Status: retrieved")
+    return {"items": certifications, "limit": limit, "next_cursor": next_cursor}
+
+
+def stream_all_certifications(
+    skill: Optional[str] = None,
+) -> AsyncIterator[Certification]:
+    """
+    Stream all certifications ordered by ID from a server-side cursor.
+
+    Args:
+        skill (str, optional): Only stream the certifications teaching this skill.
+
+    Returns:
+        AsyncIterator[Certification]: The certifications, fetched in batches as they are consumed.
+    """
+    return stream_scalars(_certifications_statement(skill).order_by(Certification.id))
 
 
 async def get_certification_by_id(
-    certification_id: int, db: Session = Depends(database.get_db_session)
+    certification_id: int, db: AsyncSession = Depends(database.get_async_db_session)
 ):
     """Retrieve a certification by ID."""
-    certification = db.query(Certification).get(certification_id)
+    certification = await db.get(Certification, certification_id)
     if not certification:
         api_logger.error(f"Certification {certification_id} not found")
         raise HTTPException(status_code=404, detail="Certification not found")
@@ -66,7 +130,7 @@ async def get_certification_by_id(
 
 async def create_certification(
     certification: CertificationInfoResponse,
-    db: Session = Depends(database.get_db_session),
+    db: AsyncSession = Depends(database.get_async_db_session),
 ) -> CreateCertificationResponse:
     """Create a new certification in the database."""
     try:
@@ -82,15 +146,16 @@ async def create_certification(
             ),  # Assuming skills_acquired is a list
         )
         db.add(new_certification)
-        db.commit()
-        db.refresh(new_certification)
+        await db.commit()
+        await response_cache.invalidate("certifications")
+        await db.refresh(new_certification)
         api_logger.info(f"Certification {new_certification.name} created")
         return CreateCertificationResponse(
             message="Certification created successfully",
             created_certification=new_certification,
         )
     except SQLAlchemyError as e:
-        db.rollback()
+        await db.rollback()
         api_logger.error(f"SQLAlchemyError occurred: {e}")
         raise HTTPException(
             status_code=500, detail="An error occurred while creating the certification"
@@ -100,7 +165,7 @@ async def create_certification(
 async def update_certification(
     certification_id: int,
     certification: CertificationInfoResponse,
-    db: Session = Depends(database.get_db_session),
+    db: AsyncSession = Depends(database.get_async_db_session),
 ) -> UpdateCertificationResponse:
     """Update an existing certification in the database."""
     try:
@@ -114,15 +179,17 @@ async def update_certification(
                 value = ", ".join(value or [])
             setattr(certification_to_update, key, value)
 
-        db.commit()
-        db.refresh(certification_to_update)
+        await db.commit()
+
+        await response_cache.invalidate("certifications")
+        await db.refresh(certification_to_update)
         api_logger.info(f"Certification {certification_to_update.name} updated")
         return UpdateCertificationResponse(
             message="Certification updated successfully",
             updated_certification=certification_to_update,
         )
     except SQLAlchemyError as e:
-        db.rollback()
+        await db.rollback()
         api_logger.error(f"SQLAlchemyError occurred: {e}")
         raise HTTPException(
             status_code=500, detail="An error occurred while updating the certification"
@@ -130,7 +197,7 @@ async def update_certification(
 
 
 async def delete_certification(
-    certification_id: int, db: Session = Depends(database.get_db_session)
+    certification_id: int, db: AsyncSession = Depends(database.get_async_db_session)
 ) -> DeleteCertificationResponse:
     """Delete an existing certification from the database."""
     try:
@@ -141,16 +208,124 @@ async def delete_certification(
                 message="Certification not found", deleted_certification=None
             )
 
-        db.delete(certification_to_delete)
-        db.commit()
+        await db.delete(certification_to_delete)
+        await db.commit()
+        await response_cache.invalidate("certifications")
         api_logger.info(f"Certification {certification_to_delete.name} deleted")
         return DeleteCertificationResponse(
             message="Certification deleted successfully",
             deleted_certification=certification_to_delete,
         )
     except SQLAlchemyError as e:
-        db.rollback()
+        await db.rollback()
         api_logger.error(f"SQLAlchemyError occurred: {e}")
         raise HTTPException(
             status_code=500, detail="An error occurred while deleting the certification"
         )
+
+
+def _certification_row(certification: CertificationInfoResponse, *extra: str) -> dict:
+    """Map a certification to the column values stored in the database."""
+    row = certification.model_dump(include=CERTIFICATION_COLUMNS | set(extra))
+    row["skills_acquired"] = ", ".join(row["skills_acquired"] or [])
+    return row
+
+
+async def _sync_certification_tags(
+    db: AsyncSession, certifications: List[Certification]
+) -> None:
+    """Mirror the skills of certifications written by a bulk statement into the tags."""
+    await db.run_sync(
+        sync_tags,
+        Certification,
+        {item.id: item.skills_acquired for item in certifications},
+    )
+
+
+async def bulk_create_certifications(
+    certifications: List[CertificationInfoResponse], user_id: int, db: AsyncSession
+) -> dict:
+    """
+    Create many certifications of a user in a single transaction.
+
+    Args:
+        certifications (List[CertificationInfoResponse]): The certifications to create, their IDs and user IDs are ignored.
+        user_id (int): The ID of the user creating the certifications.
+        db (AsyncSession): The database session.
+
+    Returns:
+        dict: The created certifications.
+    """
+    check_batch_size(certifications)
+    rows = [{**_certification_row(item), "user_id": user_id} for item in certifications]
+    created = await bulk_insert(db, Certification, rows)
+    await _sync_certification_tags(db, created)
+    await db.commit()
+    await response_cache.invalidate("certifications")
+    api_logger.info(f"Certifications bulk created: {len(created)}")
+    return {
+        "message": f"{len(created)} certifications created",
+        "items": created,
+        "errors": [],
+    }
+
+
+async def bulk_update_certifications(
+    certifications: List[CertificationInfoResponse], user_id: int, db: AsyncSession
+) -> dict:
+    """
+    Update many certifications of a user, identified by their IDs, in a single transaction.
+
+    Args:
+        certifications (List[CertificationInfoResponse]): The certifications to update, their user IDs are ignored.
+        user_id (int): The ID of the user updating the certifications.
+        db (AsyncSession): The database session.
+
+    Returns:
+        dict: The updated certifications and the errors of the certifications that were skipped.
+    """
+    check_batch_size(certifications)
+    rows = [_certification_row(item, "id") for item in certifications]
+    errors = await find_errors(db, rows, {}, Certification, user_id)
+    valid_rows = [row for index, row in enumerate(rows) if index not in errors]
+    updated = await bulk_update(db, Certification, valid_rows, user_id)
+    await _sync_certification_tags(db, updated)
+    await db.commit()
+    await response_cache.invalidate("certifications")
+    api_logger.info(
+        f"Certifications bulk updated: {len(updated)}, skipped: {len(errors)}"
+    )
+    return {
+        "message": f"{len(updated)} certifications updated",
+        "items": updated,
+        "errors": error_list(errors, [row["id"] for row in rows]),
+    }
+
+
+async def bulk_delete_certifications(
+    certification_ids: List[int], user_id: int, db: AsyncSession
+) -> dict:
+    """
+    Delete many certifications of a user in a single statement.
+
+    Args:
+        certification_ids (List[int]): The IDs of the certifications to delete.
+        user_id (int): The ID of the user deleting the certifications.
+        db (AsyncSession): The database session.
+
+    Returns:
+        dict: The IDs of the deleted certifications and an error for every unknown
+            ID or certification of another user.
+    """
+    check_batch_size(certification_ids)
+    deleted, errors = await bulk_delete(db, Certification, certification_ids, user_id)
+    await db.commit()
+    await response_cache.invalidate("certifications")
+    api_logger.info(
+        f"Certifications bulk deleted: {len(deleted)}, skipped: {len(errors)}"
+    )
+    return {
+        "message": f"{len(deleted)} certifications deleted",
+        "deleted_ids": deleted,
+        "errors": error_list(errors, certification_ids),
+    }
@@ -1,27 +1,84 @@
+from typing import AsyncIterator, List, Optional
+
 from fastapi import Depends
 from fastapi import HTTPException
+from sqlalchemy import select
 from sqlalchemy.exc import SQLAlchemyError
-from sqlalchemy.orm import Session
+from sqlalchemy.ext.asyncio import AsyncSession
 
+from api.bulk import (
+    bulk_delete,
+    bulk_insert,
+    bulk_update,
+    check_batch_size,
+    error_list,
+    find_errors,
+)
+from api.cache import response_cache
 from api.db import database
+from api.pagination import DEFAULT_PAGE_LIMIT, paginate
 from api.schemas.experience import ExperienceSchema
+from api.streaming import stream_scalars
 from logging_setup import api_logger
 from src.db.models import Experience
 
+# Columns written by the bulk endpoints
+EXPERIENCE_COLUMNS = {
+    "company_name",
+    "role",
+    "start_date",
+    "end_date",
+    "description",
+}
+
 
-def get_all_experiences(db: Session = Depends(database.get_db_session)):
+async def get_all_experiences(
+    db: AsyncSession = Depends(database.get_async_db_session),
+):
     """
     Retrieve all experiences from the database.
     """
+    result = await db.scalars(select(Experience))
     api_logger.info("Experiences. Status: retrieved")
-    return db.query(Experience).all()
+    return result.all()
+
+
+async def get_experiences_page(
+    db: AsyncSession, limit: int = DEFAULT_PAGE_LIMIT, cursor: Optional[str] = None
+) -> dict:
+    """
+    Retrieve a single page of experiences ordered by ID.
+
+    Args:
+        db (AsyncSession): The database session.
+        limit (int): The maximum number of experiences to return.
+        cursor (str, optional): The cursor of the page to fetch.
+
+    Returns:
+        dict: The experiences of the page, the page size and the cursor of the next page.
+    """
+    experiences, next_cursor = await paginate(
+        db, select(Experience), Experience, limit, cursor
+    )
+    api_logger.info("Experiences page. Status: retrieved")
+    return {"items": experiences, "limit": limit, "next_cursor": next_cursor}
+
+
+def stream_all_experiences() -> AsyncIterator[Experience]:
+    """
+    Stream all experiences ordered by ID from a server-side cursor.
+
+    Returns:
+        AsyncIterator[Experience]: The experiences, fetched in batches as they are consumed.
+    """
+    return stream_scalars(select(Experience).order_by(Experience.id))
 
 
 async def get_experience_by_id(
-    experience_id: int, db: Session = Depends(database.get_db_session)
+    experience_id: int, db: AsyncSession = Depends(database.get_async_db_session)
 ):
     """Retrieve an experience by ID"""
-    experience = db.query(Experience).get(experience_id)
+    experience = await db.get(Experience, experience_id)
     if not experience:
         api_logger.error(f"Experience {experience_id} not found")
         raise HTTPException(status_code=404, detail="Experience not found")
@@ -30,13 +87,14 @@ async def get_experience_by_id(
 
 
 async def create_experience(
-    experience: ExperienceSchema, db: Session = Depends(database.get_db_session)
+    experience: ExperienceSchema,
+    db: AsyncSession = Depends(database.get_async_db_session),
 ) -> dict:
     """Create a new experience in the database.
 
     Args:
         experience (ExperienceSchema): The experience to create.
-        db (Session): The database session.
+        db (AsyncSession): The database session.
 
     Returns:
         dict: A dictionary containing the message "Experience created successfully" and the created experience.
@@ -51,15 +109,16 @@ async def create_experience(
             description=experience.description,
         )
         db.add(new_experience)
-        db.commit()
-        db.refresh(new_experience)
+        await db.commit()
+        await response_cache.invalidate("experiences")
+        await db.refresh(new_experience)
         api_logger.info(f"Experience {new_experience.company_name} created")
         return {
             "message": "Experience created successfully",
             "created_experience": new_experience,
         }
     except SQLAlchemyError as e:
-        db.rollback()
+        await db.rollback()
         api_logger.error(f"SQLAlchemyError occurred: {e}")
         raise HTTPException(
             status_code=500, detail="An error occurred while creating the experience"
@@ -69,14 +128,14 @@ async def create_experience(
 async def update_experience(
     experience_id: int,
     experience: ExperienceSchema,
-    db: Session = Depends(database.get_db_session),
+    db: AsyncSession = Depends(database.get_async_db_session),
 ) -> dict:
     """Update an existing experience in the database.
 
     Args:
         experience_id (int): The ID of the experience to update.
         experience (ExperienceSchema): The experience to update.
-        db (Session): The database session.
+        db (AsyncSession): The database session.
 
     Returns:
         dict: A dictionary containing the message "Experience updated successfully" and the updated experience.
@@ -90,15 +149,17 @@ async def update_experience(
         for key, value in experience.model_dump(exclude_unset=True).items():
             setattr(experience_to_update, key, value)
 
-        db.commit()
-        db.refresh(experience_to_update)
+        await db.commit()
+
+        await response_cache.invalidate("experiences")
+        await db.refresh(experience_to_update)
         api_logger.info(f"Experience {experience_to_update.company_name} updated")
         return {
             "message": "Experience updated successfully",
             "updated_experience": experience_to_update,
         }
     except SQLAlchemyError as e:
-        db.rollback()
+        await db.rollback()
         api_logger.error(f"SQLAlchemyError occurred: {e}")
         raise HTTPException(
             status_code=500, detail="An error occurred while updating the experience"
@@ -106,13 +167,13 @@ async def update_experience(
 
 
 async def delete_experience(
-    experience_id: int, db: Session = Depends(database.get_db_session)
+    experience_id: int, db: AsyncSession = Depends(database.get_async_db_session)
 ) -> dict:
     """Delete an existing experience from the database.
 
     Args:
         experience_id (int): The ID of the experience to delete.
-        db (Session): The database session.
+        db (AsyncSession): The database session.
 
     Returns:
         dict: A dictionary containing the message "Experience deleted successfully" and the deleted experience.
@@ -124,16 +185,105 @@ async def delete_experience(
             api_logger.error(f"Experience {experience_id} not found")
             return {"message": "Experience not found", "deleted_experience": None}
 
-        db.delete(experience_to_delete)
-        db.commit()
+        await db.delete(experience_to_delete)
+        await db.commit()
+        await response_cache.invalidate("experiences")
         api_logger.info(f"Experience {experience_to_delete.company_name} deleted")
         return {
             "message": "Experience deleted successfully",
             "deleted_experience": experience_to_delete,
         }
     except SQLAlchemyError as e:
-        db.rollback()
+        await db.rollback()
         api_logger.error(f"SQLAlchemyError occurred: {e}")
         raise HTTPException(
             status_code=500, detail="An error occurred while deleting the experience"
         )
+
+
+async def bulk_create_experiences(
+    experiences: List[ExperienceSchema], user_id: int, db: AsyncSession
+) -> dict:
+    """
+    Create many experiences of a user in a single transaction.
+
+    Args:
+        experiences (List[ExperienceSchema]): The experiences to create, their IDs and user IDs are ignored.
+        user_id (int): The ID of the user creating the experiences.
+        db (AsyncSession): The database session.
+
+    Returns:
+        dict: The created experiences.
+    """
+    check_batch_size(experiences)
+    rows = [
+        {**item.model_dump(include=EXPERIENCE_COLUMNS), "user_id": user_id}
+        for item in experiences
+    ]
+    created = await bulk_insert(db, Experience, rows)
+    await db.commit()
+    await response_cache.invalidate("experiences")
+    api_logger.info(f"Experiences bulk created: {len(created)}")
+    return {
+        "message": f"{len(created)} experiences created",
+        "items": created,
+        "errors": [],
+    }
+
+
+async def bulk_update_experiences(
+    experiences: List[ExperienceSchema], user_id: int, db: AsyncSession
+) -> dict:
+    """
+    Update many experiences of a user, identified by their IDs, in a single transaction.
+
+    Args:
+        experiences (List[ExperienceSchema]): The experiences to update, their user IDs are ignored.
+        user_id (int): The ID of the user updating the experiences.
+        db (AsyncSession): The database session.
+
+    Returns:
+        dict: The updated experiences and the errors of the experiences that were skipped.
+    """
+    check_batch_size(experiences)
+    rows = [
+        item.model_dump(include=EXPERIENCE_COLUMNS | {"id"}) for item in experiences
+    ]
+    errors = await find_errors(db, rows, {}, Experience, user_id)
+    valid_rows = [row for index, row in enumerate(rows) if index not in errors]
+    updated = await bulk_update(db, Experience, valid_rows, user_id)
+    await db.commit()
+    await response_cache.invalidate("experiences")
+    api_logger.info(f"Experiences bulk updated: {len(updated)}, skipped: {len(errors)}")
+    return {
+        "message": f"{len(updated)} experiences updated",
+        "items": updated,
+        "errors": error_list(errors, [row["id"] for row in rows]),
+    }
+
+
+async def bulk_delete_experiences(
+    experience_ids: List[int], user_id: int, db: AsyncSession
+) -> dict:
+    """
+    Delete many experiences of a user in a single statement.
+
+    Args:
+        experience_ids (List[int]): The IDs of the experiences to delete.
+        user_id (int): The ID of the user deleting the experiences.
+        db (AsyncSession): The database session.
+
+    Returns:
+        dict: The IDs of the deleted experiences and an error for every unknown ID
+            or experience of another user.
+    """
+    check_batch_size(experience_ids)
+    deleted, errors = await bulk_delete(db, Experience, experience_ids, user_id)
+    await db.commit()
+    await response_cache.invalidate("experiences")
+    api_logger.info(f"Experiences bulk deleted: {len(deleted)}, skipped: {len(errors)}")
+    return {
+        "message": f"{len(deleted)} experiences deleted",
+        "deleted_ids": deleted,
+        "errors": error_list(errors, experience_ids),
+    }
@@ -1,34 +1,92 @@
+from typing import AsyncIterator, Optional
+
 from fastapi import HTTPException
 from fastapi.params import Depends
+from sqlalchemy import delete, select, update
 from sqlalchemy.exc import SQLAlchemyError
-from sqlalchemy.orm import Session, joinedload
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm.attributes import set_committed_value
 
+from api.cache import response_cache
 from api.db import database
+from api.pagination import DEFAULT_PAGE_LIMIT, paginate
 from api.schemas.project import ProjectSchema
+from api.streaming import stream_scalars
 from logging_setup import api_logger
-from src.db.models import Project
+from src.db.loaders import PROJECT_SCHEMA_LOADERS
+from src.db.models import Image, Project, filter_by_tag, sync_tags, unique_slug
+
 
+def _projects_statement(tech: Optional[str] = None):
+    """Select projects with their schema loaders, optionally only those using a technology."""
+    statement = select(Project).options(*PROJECT_SCHEMA_LOADERS)
+    if tech:
+        statement = filter_by_tag(statement, Project, tech)
+    return statement
 
-async def get_all_projects(db: Session):
+
+async def get_all_projects(db: AsyncSession, tech: Optional[str] = None):
     """
     Retrieve all projects from the database.
 
+    Args:
+        db (AsyncSession): The database session.
+        tech (str, optional): Only return the projects using this technology.
+
     Returns:
         list: A list of all projects.
     """
+    result = await db.scalars(_projects_statement(tech))
     api_logger.info("Projects. Status: retrieved")
-    return db.query(Project).all()
+    return result.all()
+
+
+async def get_projects_page(
+    db: AsyncSession,
+    limit: int = DEFAULT_PAGE_LIMIT,
+    cursor: Optional[str] = None,
+    tech: Optional[str] = None,
+) -> dict:
+    """
+    Retrieve a single page of projects ordered by ID.
+
+    Args:
+        db (AsyncSession): The database session.
+        limit (int): The maximum number of projects to return.
+        cursor (str, optional): The cursor of the page to fetch.
+        tech (str, optional): Only return the projects using this technology.
+
+    Returns:
+        dict: The projects of the page, the page size and the cursor of the next page.
+    """
+    statement = _projects_statement(tech)
+    projects, next_cursor = await paginate(db, statement, Project, limit, cursor)
+    api_logger.info("Projects page. Status: retrieved")
+    return {"items": projects, "limit": limit, "next_cursor": next_cursor}
+
+
+def stream_all_projects(tech: Optional[str] = None) -> AsyncIterator[Project]:
+    """
+    Stream all projects ordered by ID from a server-side cursor.
+
+    Args:
+        tech (str, optional): Only stream the projects using this technology.
+
+    Returns:
+        AsyncIterator[Project]: The projects, fetched in batches as they are consumed.
+    """
+    return stream_scalars(_projects_statement(tech).order_by(Project.id))
 
 
 async def get_project_by_id(
-    project_id: int, db: Session = Depends(database.get_db_session)
+    project_id: int, db: AsyncSession = Depends(database.get_async_db_session)
 ) -> Project:
     """
     Retrieve a specific project by its ID.
 
     Args:
         project_id (int): The ID of the project to retrieve.
-        db (Session): The database session.
+        db (AsyncSession): The database session.
 
     Returns:
         Project: The project instance.
@@ -36,7 +94,7 @@ async def get_project_by_id(
     Raises:
         HTTPException: If the project is not found.
     """
-    project = db.query(Project).get(project_id)
+    project = await db.get(Project, project_id, options=PROJECT_SCHEMA_LOADERS)
     if not project:
         api_logger.error(f"Project {project_id} not found")
         raise HTTPException(status_code=404, detail="Project not found")
@@ -45,7 +103,9 @@ async def get_project_by_id(
 
 
 async def create_project(
-    project: ProjectSchema, user_id: int, db: Session = Depends(database.get_db_session)
+    project: ProjectSchema,
+    user_id: int,
+    db: AsyncSession = Depends(database.get_async_db_session),
 ) -> dict:
     """
     Create a new project in the database.
@@ -53,7 +113,7 @@ async def create_project(
     Args:
         project (ProjectSchema): The project data to create.
         user_id (int): The ID of the user who created the project.
-        db (Session): The database session.
+        db (AsyncSession): The database session.
 
     Returns:
         dict: A dictionary containing the message "Project created successfully" and the created project instance.
@@ -69,15 +129,16 @@ async def create_project(
             project_category_id=project.project_category_id,
         )
         db.add(new_project)
-        db.commit()
-        db.refresh(new_project)
+        await db.commit()
+        await response_cache.invalidate("projects")
+        await db.refresh(new_project, ["created_at", "images"])
         api_logger.info(f"Project {new_project.title} created")
         return {
             "message": "Project created successfully",
             "created_project": new_project,
         }
     except SQLAlchemyError as e:
-        db.rollback()
+        await db.rollback()
         api_logger.error(f"SQLAlchemyError occurred: {e}")
         raise HTTPException(
             status_code=500, detail="An error occurred while creating the project"
@@ -88,50 +149,73 @@ async def update_project(
     project_id: int,
     project: ProjectSchema,
     user_id: int,
-    db: Session = Depends(database.get_db_session),
+    db: AsyncSession = Depends(database.get_async_db_session),
 ) -> dict:
     """
     Update an existing project in the database.
 
+    The ownership check is part of the statement itself
+    (``UPDATE ... WHERE id = :id AND user_id = :user_id RETURNING ...``), so an
+    authorized update costs a single round trip, plus a probe of the slug index
+    when the title is written.
+
     Args:
         project_id (int): The ID of the project to update.
         project (ProjectSchema): The updated project data.
         user_id (int): The ID of the user who is updating the project.
-        db (Session): The database session.
+        db (AsyncSession): The database session.
 
     Returns:
         dict: A dictionary containing the message "Project updated successfully" and the updated project instance.
+
+    Raises:
+        HTTPException: If the project does not exist or belongs to another user.
     """
     try:
-        project_to_update = await get_project_by_id(project_id, db)
-        if not project_to_update:
-            api_logger.error(f"Project {project_id} not found")
-            raise HTTPException(status_code=404, detail="Project not found")
-
-        # Ensure the project belongs to the current user
-        if project_to_update.user_id != user_id:
+        # Exclude nested relationships, keys, derived and unset values from the update
+        update_data = project.model_dump(
+            exclude={"id", "user_id", "slug", "project_category", "images"},
+            exclude_unset=True,
+        )
+        # The UPDATE statement bypasses the flush that sets the slug
+        if "title" in update_data:
+            update_data["slug"] = await db.run_sync(
+                lambda session: unique_slug(
+                    session.connection(), update_data["title"], project_id
+                )
+            )
+        updated_project = await db.scalar(
+            update(Project)
+            .where(Project.id == project_id, Project.user_id == user_id)
+            .values(**update_data)
+            .returning(Project)
+            .options(*PROJECT_SCHEMA_LOADERS)
+            .execution_options(populate_existing=True)
+        )
+        if updated_project is None:
+            await db.rollback()
+            if not await project_exists(project_id, db):
+                api_logger.error(f"Project {project_id} not found")
+                raise HTTPException(status_code=404, detail="Project not found")
             api_logger.error("Not authorized to update this project")
             raise HTTPException(
                 status_code=403, detail="Not authorized to update this project"
             )
+        # The UPDATE statement also bypasses the flush that keeps the tags in sync
+        if "tech_stack" in update_data:
+            await db.run_sync(
+                sync_tags, Project, {project_id: updated_project.tech_stack}
+            )
 
-        # Exclude nested relationships and unset values from the update
-        update_data = project.model_dump(
-            exclude={"project_category", "images"}, exclude_unset=True
-        )
-
-        for key, value in update_data.items():
-            setattr(project_to_update, key, value)
-
-        db.commit()
-        db.refresh(project_to_update)
-        api_logger.info(f"Project {project_to_update.title} updated")
+        await db.commit()
+        await response_cache.invalidate("projects")
+        api_logger.info(f"Project {updated_project.title} updated")
         return {
             "message": "Project updated successfully",
-            "updated_project": project_to_update,
+            "updated_project": updated_project,
         }
     except SQLAlchemyError as e:
-        db.rollback()
+        await db.rollback()
         api_logger.error(f"SQLAlchemyError occurred: {e}")
         raise HTTPException(
             status_code=500, detail="An error occurred while updating the project"
@@ -139,47 +223,85 @@ async def update_project(
 
 
 async def delete_project(
-    project_id: int, user_id: int, db: Session = Depends(database.get_db_session)
+    project_id: int,
+    user_id: int,
+    db: AsyncSession = Depends(database.get_async_db_session),
 ) -> dict:
     """
     Delete a project from the database.
 
+    The ownership check is part of the statements themselves: the project's
+    images are detached and the project is deleted with
+    ``... WHERE id = :id AND user_id = :user_id RETURNING ...``.
+
     Args:
         project_id (int): The ID of the project to delete.
         user_id (int): The ID of the user who is deleting the project.
-        db (Session): The database session.
+        db (AsyncSession): The database session.
 
     Returns:
         dict: A dictionary containing the message "Project deleted successfully" and the deleted project.
             If the project does not exist, the message will be "Project not found" and the deleted_project will be None.
+
+    Raises:
+        HTTPException: If the project belongs to another user.
     """
+    owned = select(Project.id).where(
+        Project.id == project_id, Project.user_id == user_id
+    )
     try:
-        db_project = (
-            db.query(Project)
-            .options(joinedload(Project.project_category))
-            .get(project_id)
+        # Images outlive their project, as with the ORM's default delete behavior
+        detached_images = await db.scalars(
+            update(Image)
+            .where(Image.project_id.in_(owned.scalar_subquery()))
+            .values(project_id=None)
+            .returning(Image)
         )
-        if not db_project:
-            api_logger.error(f"Project {project_id} not found")
-            return {"message": "Project not found", "deleted_project": None}
-
-        # Ensure the project belongs to the current user
-        if db_project.user_id != user_id:
+        images = detached_images.all()
+        deleted_project = await db.scalar(
+            delete(Project)
+            .where(Project.id == project_id, Project.user_id == user_id)
+            .returning(Project)
+        )
+        if deleted_project is None:
+            await db.rollback()
+            if not await project_exists(project_id, db):
+                api_logger.error(f"Project {project_id} not found")
+                return {"message": "Project not found", "deleted_project": None}
             api_logger.error("Not authorized to delete this project")
             raise HTTPException(
                 status_code=403, detail="Not authorized to delete this project"
             )
+        set_committed_value(deleted_project, "images", images)
 
-        db.delete(db_project)
-        db.commit()
-        api_logger.info(f"Project {db_project.title} deleted")
+        await db.commit()
+        await response_cache.invalidate("projects")
+        api_logger.info(f"Project {deleted_project.title} deleted")
         return {
             "message": "Project deleted successfully",
-            "deleted_project": db_project,
+            "deleted_project": deleted_project,
         }
     except SQLAlchemyError as e:
-        db.rollback()
+        await db.rollback()
         api_logger.error(f"SQLAlchemyError occurred: {e}")
         raise HTTPException(
             status_code=500, detail="An error occurred while deleting the project"
         )
+
+
+async def project_exists(project_id: int, db: AsyncSession) -> bool:
+    """
+    Check whether a project exists.
+
+    Used to tell a missing project from someone else's after an ownership-filtered
+    write matched no row, so authorized writes never pay for it.
+
+    Args:
+        project_id (int): The ID of the project.
+        db (AsyncSession): The database session.
+
+    Returns:
+        bool: True if the project exists, False otherwise.
+    """
+    project = await db.scalar(select(Project.id).where(Project.id == project_id))
+    return project is not None
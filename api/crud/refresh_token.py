@@ -0,0 +1,153 @@
+from datetime import datetime, timezone
+from typing import Optional
+
+from fastapi import HTTPException, status
+from sqlalchemy import delete, select, update
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from api.security import (
+    create_refresh_token,
+    decode_refresh_token,
+    revoked_refresh_tokens,
+    revoked_token_families,
+)
+from logging_setup import api_logger
+from src.db.models import RefreshToken, User
+
+
+def _utc(timestamp: float) -> datetime:
+    return datetime.fromtimestamp(timestamp, timezone.utc).replace(tzinfo=None)
+
+
+def _invalid_refresh_token() -> HTTPException:
+    return HTTPException(
+        status_code=status.HTTP_401_UNAUTHORIZED,
+        detail="Invalid refresh token",
+        headers={"WWW-Authenticate": "Bearer"},
+    )
+
+
+async def issue_refresh_token(
+    db: AsyncSession, user_id: int, family_id: Optional[str] = None
+) -> tuple[dict, str]:
+    """
+    Issue a refresh token and record it, dropping the expired tokens of the user.
+
+    The caller commits the session.
+
+    Args:
+        db (AsyncSession): The database session.
+        user_id (int): The ID of the user the token is issued to.
+        family_id (str, optional): The family of the token being rotated,
+            a new family is started when omitted.
+
+    Returns:
+        tuple[dict, str]: The claims and the encoded refresh token.
+    """
+    claims, token = create_refresh_token(user_id, family_id)
+    await db.execute(
+        delete(RefreshToken).where(
+            RefreshToken.user_id == user_id,
+            RefreshToken.expires_at < _utc(datetime.now(timezone.utc).timestamp()),
+        )
+    )
+    db.add(
+        RefreshToken(
+            jti=claims["jti"],
+            family_id=claims["fam"],
+            user_id=user_id,
+            expires_at=_utc(claims["exp"]),
+        )
+    )
+    return claims, token
+
+
+async def revoke_token_family(db: AsyncSession, claims: dict) -> None:
+    """
+    Revoke every refresh token of the family the given token belongs to.
+
+    Args:
+        db (AsyncSession): The database session.
+        claims (dict): The claims of a token of the family.
+    """
+    await db.execute(
+        update(RefreshToken)
+        .where(RefreshToken.family_id == claims["fam"])
+        .values(revoked=True)
+    )
+    await db.commit()
+    revoked_token_families.add(claims["fam"], claims["exp"])
+
+
+async def rotate_refresh_token(db: AsyncSession, token: str) -> tuple[User, dict, str]:
+    """
+    Exchange a refresh token for the next token of its family.
+
+    The presented token is revoked and its successor issued in the same
+    transaction. Revoking is a conditional UPDATE, so of two requests presenting
+    the same token only one can win. A token that was already rotated is a sign
+    that it leaked, in which case its whole family is revoked and the legitimate
+    client has to log in again.
+
+    Args:
+        db (AsyncSession): The database session.
+        token (str): The encoded refresh token.
+
+    Returns:
+        tuple[User, dict, str]: The user, and the claims and encoded value of the
+            new refresh token.
+
+    Raises:
+        HTTPException: 401 if the token is invalid, expired, revoked or reused.
+    """
+    claims = decode_refresh_token(token)
+    if claims["fam"] in revoked_token_families:
+        raise _invalid_refresh_token()
+    if claims["jti"] in revoked_refresh_tokens:
+        api_logger.warning(f"Refresh token reused, revoking family {claims['fam']}")
+        await revoke_token_family(db, claims)
+        raise _invalid_refresh_token()
+
+    user_id = await db.scalar(
+        update(RefreshToken)
+        .where(RefreshToken.jti == claims["jti"], RefreshToken.revoked.is_(False))
+        .values(revoked=True)
+        .returning(RefreshToken.user_id)
+    )
+    if user_id is None:
+        known = await db.scalar(
+            select(RefreshToken.id).where(RefreshToken.jti == claims["jti"])
+        )
+        await db.rollback()
+        if known is not None:
+            api_logger.warning(f"Refresh token reused, revoking family {claims['fam']}")
+            await revoke_token_family(db, claims)
+        raise _invalid_refresh_token()
+
+    user = await db.get(User, user_id)
+    if user is None:
+        await db.rollback()
+        raise _invalid_refresh_token()
+
+    new_claims, new_token = await issue_refresh_token(db, user_id, claims["fam"])
+    await db.commit()
+    revoked_refresh_tokens.add(claims["jti"], claims["exp"])
+    api_logger.info(f"Refresh token rotated for user {user_id}")
+    return user, new_claims, new_token
+
+
+async def revoke_refresh_token(db: AsyncSession, token: str) -> None:
+    """
+    Revoke a refresh token together with the rest of its family, e.g. on logout.
+
+    Args:
+        db (AsyncSession): The database session.
+        token (str): The encoded refresh token.
+
+    Raises:
+        HTTPException: 401 if the token is invalid or expired.
+    """
+    claims = decode_refresh_token(token)
+    if claims["fam"] not in revoked_token_families:
+        await revoke_token_family(db, claims)
+    api_logger.info(f"Refresh token family {claims['fam']} revoked")
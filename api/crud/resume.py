@@ -1,18 +1,22 @@
 from fastapi import HTTPException
 from fastapi.params import Depends
-from sqlalchemy.orm import Session
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
 
+from api.cache import response_cache
 from api.db import database
 from logging_setup import api_logger
 from src.db.models import Resume
 
 
-async def get_resume_link(db: Session = Depends(database.get_db_session)) -> Resume:
+async def get_resume_link(
+    db: AsyncSession = Depends(database.get_async_db_session),
+) -> Resume:
     """
     Retrieve the resume instance from the database.
 
     Args:
-        db (Session): The database session.
+        db (AsyncSession): The database session.
 
     Returns:
         Resume: The resume instance.
@@ -20,7 +24,7 @@ async def get_resume_link(db: Session = Depends(database.get_db_session)) -> Res
     Raises:
         HTTPException: If the resume is not found.
     """
-    resume = db.query(Resume).first()
+    resume = await db.scalar(select(Resume).limit(1))
     if not resume:
         api_logger.error("Resume not found")
         raise HTTPException(status_code=404, detail="Resume not found")
@@ -29,14 +33,14 @@ async def get_resume_link(db: Session = Depends(database.get_db_session)) -> Res
 
 
 async def update_resume_link(
-    link: str, db: Session = Depends(database.get_db_session)
+    link: str, db: AsyncSession = Depends(database.get_async_db_session)
 ) -> Resume:
     """
     Update the resume link in the database.
 
     Args:
         link (str): The new link to update.
-        db (Session): The database session.
+        db (AsyncSession): The database session.
 
     Returns:
         Resume: The updated resume instance.
@@ -44,13 +48,14 @@ async def update_resume_link(
     Raises:
         HTTPException: If the resume is not found.
     """
-    resume = db.query(Resume).first()
+    resume = await db.scalar(select(Resume).limit(1))
     if not resume:
         api_logger.error("Resume not found")
         raise HTTPException(status_code=404, detail="Resume not found")
     resume.link = link
-    db.commit()
-    db.refresh(resume)
+    await db.commit()
+    await response_cache.invalidate("resume")
+    await db.refresh(resume)
     api_logger.info("Resume updated")
 
     return resume
@@ -0,0 +1,94 @@
+from fastapi import HTTPException
+from sqlalchemy import column, desc, func, literal, literal_column, select, table
+from sqlalchemy import union_all
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from logging_setup import api_logger
+from src.db.models import (
+    CERTIFICATION_SEARCH_DOCUMENT,
+    PROJECT_SEARCH_DOCUMENT,
+    SEARCH_CONFIG,
+    Certification,
+    Project,
+)
+
+# Result type, model, title column and PostgreSQL search document of every
+# searched table
+SEARCHED = (
+    ("project", Project, Project.title, PROJECT_SEARCH_DOCUMENT),
+    ("certification", Certification, Certification.name, CERTIFICATION_SEARCH_DOCUMENT),
+)
+
+
+def _postgresql_search(q: str):
+    """Rank the matching rows with ``ts_rank`` over the GIN-indexed documents."""
+    query = func.websearch_to_tsquery(SEARCH_CONFIG, q)
+    selects = []
+    for kind, model, title, document in SEARCHED:
+        rank = func.ts_rank(document, query)
+        selects.append(
+            select(
+                literal(kind).label("type"),
+                model.id.label("id"),
+                title.label("title"),
+                rank.label("rank"),
+            ).where(document.op("@@")(query))
+        )
+    return union_all(*selects)
+
+
+def _sqlite_search(q: str):
+    """Rank the matching rows with ``bm25`` over the FTS5 tables."""
+    # Every word is quoted, so FTS5 query syntax in the input is matched literally
+    match = " ".join('"' + word.replace('"', '""') + '"' for word in q.split())
+    selects = []
+    for kind, model, title, _ in SEARCHED:
+        fts_name = f"{model.__tablename__}_fts"
+        fts = table(fts_name, column("rowid"))
+        selects.append(
+            select(
+                literal(kind).label("type"),
+                model.id.label("id"),
+                title.label("title"),
+                # bm25() scores better matches lower
+                (-func.bm25(literal_column(fts_name))).label("rank"),
+            )
+            .join(fts, fts.c.rowid == model.id)
+            .where(literal_column(fts_name).op("MATCH")(match))
+        )
+    return union_all(*selects)
+
+
+async def search_content(db: AsyncSession, q: str, limit: int) -> list[dict]:
+    """
+    Search projects and certifications, best matches first.
+
+    PostgreSQL matches ``q`` with ``websearch_to_tsquery`` (quoted phrases,
+    ``or`` and ``-word`` are supported) against the GIN-indexed ``tsvector``
+    documents. SQLite, e.g. in development, falls back to FTS5 and requires
+    every word of ``q``.
+
+    Args:
+        db (AsyncSession): The database session.
+        q (str): The search query.
+        limit (int): The maximum number of results.
+
+    Returns:
+        list[dict]: The type, ID, title and rank of every matching row.
+
+    Raises:
+        HTTPException: 501 if the database supports neither search backend.
+    """
+    dialect = db.bind.dialect.name
+    if dialect == "postgresql":
+        statement = _postgresql_search(q)
+    elif dialect == "sqlite":
+        statement = _sqlite_search(q)
+    else:
+        api_logger.error(f"Full-text search is not supported on {dialect}")
+        raise HTTPException(status_code=501, detail="Search is not available")
+
+    statement = statement.order_by(desc("rank"), "type", "id").limit(limit)
+    results = (await db.execute(statement)).mappings().all()
+    api_logger.info(f"Search for {q!r}. Status: {len(results)} results")
+    return [dict(result) for result in results]
@@ -1,35 +1,87 @@
+from typing import AsyncIterator, List, Optional
+
 from fastapi import HTTPException
 from fastapi.params import Depends
+from sqlalchemy import select
 from sqlalchemy.exc import SQLAlchemyError
-from sqlalchemy.orm import Session, joinedload
-
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from api.bulk import (
+    bulk_delete,
+    bulk_insert,
+    bulk_update,
+    check_batch_size,
+    error_list,
+    find_errors,
+)
+from api.cache import response_cache
 from api.db import database
+from api.pagination import DEFAULT_PAGE_LIMIT, paginate
 from api.schemas.skill import SkillSchema
+from api.streaming import stream_scalars
 from logging_setup import api_logger
-from src.db.models import Skill
+from src.db.loaders import SKILL_RETURNING_LOADERS, SKILL_SCHEMA_LOADERS
+from src.db.models import Skill, SkillCategory
+
+# Columns written by the bulk endpoints
+SKILL_COLUMNS = {"skill_category_id", "skill_name", "proficiency_level"}
+SKILL_REFERENCES = {"skill_category_id": SkillCategory}
 
 
-async def get_all_skills(db: Session = Depends(database.get_db_session)):
+async def get_all_skills(db: AsyncSession = Depends(database.get_async_db_session)):
     """
     Retrieve all skills from the database.
 
     Returns:
         List[Skill]: A list of all skills stored in the database.
     """
-    skills = db.query(Skill).all()
+    result = await db.scalars(select(Skill).options(*SKILL_SCHEMA_LOADERS))
+    skills = result.all()
     api_logger.info("Skills. Status: retrieved")
     return skills
 
 
+async def get_skills_page(
+    db: AsyncSession, limit: int = DEFAULT_PAGE_LIMIT, cursor: Optional[str] = None
+) -> dict:
+    """
+    Retrieve a single page of skills ordered by ID.
+
+    Args:
+        db (AsyncSession): The database session.
+        limit (int): The maximum number of skills to return.
+        cursor (str, optional): The cursor of the page to fetch.
+
+    Returns:
+        dict: The skills of the page, the page size and the cursor of the next page.
+    """
+    statement = select(Skill).options(*SKILL_SCHEMA_LOADERS)
+    skills, next_cursor = await paginate(db, statement, Skill, limit, cursor)
+    api_logger.info("Skills page. Status: retrieved")
+    return {"items": skills, "limit": limit, "next_cursor": next_cursor}
+
+
+def stream_all_skills() -> AsyncIterator[Skill]:
+    """
+    Stream all skills ordered by ID from a server-side cursor.
+
+    Returns:
+        AsyncIterator[Skill]: The skills, fetched in batches as they are consumed.
+    """
+    return stream_scalars(
+        select(Skill).options(*SKILL_SCHEMA_LOADERS).order_by(Skill.id)
+    )
+
+
 async def get_skill_by_id(
-    skill_id: int, db: Session = Depends(database.get_db_session)
+    skill_id: int, db: AsyncSession = Depends(database.get_async_db_session)
 ):
     """
     Retrieve a specific skill by its ID.
 
     Args:
         skill_id (int): The ID of the skill to retrieve.
-        db (Session): The database session.
+        db (AsyncSession): The database session.
 
     Returns:
         Skill: The skill instance.
@@ -37,7 +89,7 @@ async def get_skill_by_id(
     Raises:
         HTTPException: If the skill is not found.
     """
-    skill = db.query(Skill).get(skill_id)
+    skill = await db.get(Skill, skill_id, options=SKILL_SCHEMA_LOADERS)
     if not skill:
         api_logger.error(f"Skill {skill_id} not found")
         raise HTTPException(status_code=404, detail="Skill not found")
@@ -46,32 +98,38 @@ async def get_skill_by_id(
 
 
 async def get_skills_by_category(
-    skill_category_id: int, db: Session = Depends(database.get_db_session)
+    skill_category_id: int, db: AsyncSession = Depends(database.get_async_db_session)
 ):
     """
     Retrieve all skills for a specific category.
 
     Args:
         skill_category_id (int): The ID of the skill category to filter by.
-        db (Session): The database session.
+        db (AsyncSession): The database session.
 
     Returns:
-        List[Skill]: A list of skills belonging to the specified category.
+        List[Skill]: A list of skills belonging to the specified category, ordered by ID.
     """
-    skills = db.query(Skill).filter_by(skill_category_id=skill_category_id).all()
+    result = await db.scalars(
+        select(Skill)
+        .filter_by(skill_category_id=skill_category_id)
+        .options(*SKILL_SCHEMA_LOADERS)
+        .order_by(Skill.id)
+    )
+    skills = result.all()
     api_logger.info(f"Skills in category {skill_category_id}. Status: retrieved")
     return skills
 
 
 async def create_skill(
-    skill: SkillSchema, db: Session = Depends(database.get_db_session)
+    skill: SkillSchema, db: AsyncSession = Depends(database.get_async_db_session)
 ):
     """
     Create a new skill in the database.
 
     Args:
         skill (SkillSchema): The skill data to create.
-        db (Session): The database session.
+        db (AsyncSession): The database session.
 
     Returns:
         dict: A dictionary containing the message "Skill created successfully" and the created skill instance.
@@ -87,15 +145,16 @@ async def create_skill(
             proficiency_level=skill.proficiency_level,
         )
         db.add(new_skill)
-        db.commit()
-        db.refresh(new_skill)
+        await db.commit()
+        await response_cache.invalidate("skills")
+        await db.refresh(new_skill, ["created_at", "skill_category"])
         api_logger.info(f"Skill {new_skill.skill_name} created")
         return {
             "message": "Skill created successfully",
             "created_skill": new_skill,
         }
     except SQLAlchemyError as e:
-        db.rollback()
+        await db.rollback()
         api_logger.error(f"SQLAlchemyError occurred: {e}")
         raise HTTPException(
             status_code=500, detail="An error occurred while creating the skill"
@@ -103,7 +162,9 @@ async def create_skill(
 
 
 async def update_skill(
-    skill_id: int, skill: SkillSchema, db: Session = Depends(database.get_db_session)
+    skill_id: int,
+    skill: SkillSchema,
+    db: AsyncSession = Depends(database.get_async_db_session),
 ):
     """
     Update a skill in the database.
@@ -111,7 +172,7 @@ async def update_skill(
     Args:
         skill_id (int): The id of the skill to update.
         skill (SkillSchema): The skill data to update.
-        db (Session): The database session.
+        db (AsyncSession): The database session.
 
     Returns:
         dict: A dictionary containing the message "Skill updated successfully" and the updated skill instance.
@@ -132,15 +193,18 @@ async def update_skill(
         for key, value in update_data.items():
             setattr(skill_to_update, key, value)
 
-        db.commit()
-        db.refresh(skill_to_update)
+        await db.commit()
+
+        await response_cache.invalidate("skills")
+        # The category may have changed, so reload it for the response
+        await db.refresh(skill_to_update, ["skill_category"])
         api_logger.info(f"Skill {skill_to_update.skill_name} updated")
         return {
             "message": "Skill updated successfully",
             "updated_skill": skill_to_update,
         }
     except SQLAlchemyError as e:
-        db.rollback()
+        await db.rollback()
         api_logger.error(f"SQLAlchemyError occurred: {e}")
         raise HTTPException(
             status_code=500, detail="An error occurred while updating the skill"
@@ -148,14 +212,14 @@ async def update_skill(
 
 
 async def delete_skill(
-    skill_id: int, db: Session = Depends(database.get_db_session)
+    skill_id: int, db: AsyncSession = Depends(database.get_async_db_session)
 ) -> dict:
     """
     Delete a skill in the database.
 
     Args:
         skill_id (int): The id of the skill to delete.
-        db (Session): The database session.
+        db (AsyncSession): The database session.
 
     Returns:
         dict: A dictionary containing the message "Skill deleted successfully" and the deleted skill instance.
@@ -165,23 +229,111 @@ async def delete_skill(
     """
 
     try:
-        skill_to_delete = (
-            db.query(Skill).options(joinedload(Skill.skill_category)).get(skill_id)
-        )
+        skill_to_delete = await db.get(Skill, skill_id, options=SKILL_SCHEMA_LOADERS)
         if not skill_to_delete:
             api_logger.error(f"Skill {skill_id} not found")
             return {"message": "Skill not found", "deleted_skill": None}
 
-        db.delete(skill_to_delete)
-        db.commit()
+        await db.delete(skill_to_delete)
+        await db.commit()
+        await response_cache.invalidate("skills")
         api_logger.info(f"Skill {skill_to_delete.skill_name} deleted")
         return {
             "message": "Skill deleted successfully",
             "deleted_skill": skill_to_delete,
         }
     except SQLAlchemyError as e:
-        db.rollback()
+        await db.rollback()
         api_logger.error(f"SQLAlchemyError occurred: {e}")
         raise HTTPException(
             status_code=500, detail="An error occurred while deleting the skill"
         )
+
+
+async def bulk_create_skills(
+    skills: List[SkillSchema], user_id: int, db: AsyncSession
+) -> dict:
+    """
+    Create many skills of a user in a single transaction.
+
+    Args:
+        skills (List[SkillSchema]): The skills to create, their IDs and user IDs
+            are ignored.
+        user_id (int): The ID of the user creating the skills.
+        db (AsyncSession): The database session.
+
+    Returns:
+        dict: The created skills and the errors of the skills that were skipped.
+    """
+    check_batch_size(skills)
+    rows = [
+        {**skill.model_dump(include=SKILL_COLUMNS), "user_id": user_id}
+        for skill in skills
+    ]
+    errors = await find_errors(db, rows, SKILL_REFERENCES)
+    valid_rows = [row for index, row in enumerate(rows) if index not in errors]
+    created = await bulk_insert(db, Skill, valid_rows, SKILL_RETURNING_LOADERS)
+    await db.commit()
+    await response_cache.invalidate("skills")
+    api_logger.info(f"Skills bulk created: {len(created)}, skipped: {len(errors)}")
+    return {
+        "message": f"{len(created)} skills created",
+        "items": created,
+        "errors": error_list(errors),
+    }
+
+
+async def bulk_update_skills(
+    skills: List[SkillSchema], user_id: int, db: AsyncSession
+) -> dict:
+    """
+    Update many skills of a user, identified by their IDs, in a single transaction.
+
+    Args:
+        skills (List[SkillSchema]): The skills to update, their user IDs are ignored.
+        user_id (int): The ID of the user updating the skills.
+        db (AsyncSession): The database session.
+
+    Returns:
+        dict: The updated skills and the errors of the skills that were skipped.
+    """
+    check_batch_size(skills)
+    rows = [skill.model_dump(include=SKILL_COLUMNS | {"id"}) for skill in skills]
+    errors = await find_errors(db, rows, SKILL_REFERENCES, Skill, user_id)
+    valid_rows = [row for index, row in enumerate(rows) if index not in errors]
+    updated = await bulk_update(db, Skill, valid_rows, user_id, SKILL_SCHEMA_LOADERS)
+    await db.commit()
+    await response_cache.invalidate("skills")
+    api_logger.info(f"Skills bulk updated: {len(updated)}, skipped: {len(errors)}")
+    return {
+        "message": f"{len(updated)} skills updated",
+        "items": updated,
+        "errors": error_list(errors, [row["id"] for row in rows]),
+    }
+
+
+async def bulk_delete_skills(
+    skill_ids: List[int], user_id: int, db: AsyncSession
+) -> dict:
+    """
+    Delete many skills of a user in a single statement.
+
+    Args:
+        skill_ids (List[int]): The IDs of the skills to delete.
+        user_id (int): The ID of the user deleting the skills.
+        db (AsyncSession): The database session.
+
+    Returns:
+        dict: The IDs of the deleted skills and an error for every unknown ID or
+            skill of another user.
+    """
+    check_batch_size(skill_ids)
+    deleted, errors = await bulk_delete(db, Skill, skill_ids, user_id)
+    await db.commit()
+    await response_cache.invalidate("skills")
+    api_logger.info(f"Skills bulk deleted: {len(deleted)}, skipped: {len(errors)}")
+    return {
+        "message": f"{len(deleted)} skills deleted",
+        "deleted_ids": deleted,
+        "errors": error_list(errors, skill_ids),
+    }
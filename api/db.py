@@ -4,20 +4,78 @@ Database setup and session management
 This module contains functions for initializing the database, creating database sessions,
 and providing a context manager for database sessions.
 
+Two engines are maintained side by side: a synchronous one for scripts and tooling,
+and an asynchronous one (psycopg3 async driver) for the FastAPI request handlers, so
+that database round trips do not block the event loop.
+
 """
 
 import os
+import time
+from contextlib import asynccontextmanager, contextmanager
 
 from dotenv import load_dotenv
 from sqlalchemy import create_engine
+from sqlalchemy.exc import TimeoutError as PoolTimeoutError
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
 from sqlalchemy.orm import scoped_session
 from sqlalchemy.orm.session import sessionmaker
+from sqlalchemy.pool import AsyncAdaptedQueuePool, QueuePool
 
+from config import engine_options, env_config
 from src.db.models import metadata
 
 load_dotenv()
 
 
+class PoolWaitStats:
+    """
+    Counters of the checkouts that had to wait for a free connection of a pool.
+
+    A checkout waits when no idle connection is available and the overflow limit
+    has been reached. Checkouts are measured around ``engine.connect()`` by the
+    session helpers of ``Database``, using the public pool gauges only.
+
+    Attributes:
+        pool (Pool): The pool of the engine.
+        max_overflow (int): The configured overflow limit of the pool.
+        waits (int): The number of checkouts that waited.
+        wait_time (float): The total time spent waiting, in seconds.
+        timeouts (int): The number of waits that ended in a pool timeout.
+    """
+
+    def __init__(self, pool, max_overflow: int):
+        self.pool = pool
+        self.max_overflow = max_overflow
+        self.waits = 0
+        self.wait_time = 0.0
+        self.timeouts = 0
+
+    def at_capacity(self) -> bool:
+        # A negative max_overflow means the pool can always open a new connection
+        return (
+            self.pool.checkedin() == 0
+            and self.max_overflow > -1
+            and self.pool.overflow() >= self.max_overflow
+        )
+
+    @contextmanager
+    def measure(self):
+        """Count the checkout run in the block as a wait if the pool is full."""
+        if not self.at_capacity():
+            yield
+            return
+        start = time.perf_counter()
+        try:
+            yield
+        except PoolTimeoutError:
+            self.timeouts += 1
+            raise
+        finally:
+            self.waits += 1
+            self.wait_time += time.perf_counter() - start
+
+
 class Database:
     """
     Database setup and session management
@@ -27,14 +85,43 @@ class Database:
 
     """
 
-    def __init__(self):
+    def __init__(self, config=None):
         """
-        Initialize the database engine and session maker.
+        Initialize the database engines and session makers.
+
+        The async engine uses ``ASYNC_DATABASE_URL`` when it is set and falls back to
+        ``DATABASE_URL``. A ``postgresql+psycopg://`` URL selects the psycopg3 async
+        driver automatically.
+
+        Args:
+            config (type[Config], optional): The configuration class holding the pool
+                settings. Defaults to the class selected by ``FAST_ENV``.
 
         """
-        self.engine = create_engine(os.getenv("DATABASE_URL"))
+        if config is None:
+            config = env_config[os.getenv("FAST_ENV", "development")]
+        options = engine_options(config)
+
+        self.engine = create_engine(
+            os.getenv("DATABASE_URL"), poolclass=QueuePool, **options
+        )
         self.session = scoped_session(sessionmaker(bind=self.engine))
 
+        self.async_engine = create_async_engine(
+            os.getenv("ASYNC_DATABASE_URL", os.getenv("DATABASE_URL")),
+            poolclass=AsyncAdaptedQueuePool,
+            **options,
+        )
+        # Objects are handed to Pydantic after commit, so keep their state loaded
+        self.async_session = async_sessionmaker(
+            bind=self.async_engine, class_=AsyncSession, expire_on_commit=False
+        )
+
+        self.wait_stats = {
+            "sync": PoolWaitStats(self.engine.pool, options["max_overflow"]),
+            "async": PoolWaitStats(self.async_engine.pool, options["max_overflow"]),
+        }
+
     def init_db(self):
         """
         Initialize the database.
@@ -44,22 +131,85 @@ class Database:
         """
         metadata.create_all(self.engine)
 
+    def pool_status(self) -> dict:
+        """
+        Report live usage of the connection pools of this worker process.
+
+        Returns:
+            dict: Pool usage of the sync and async engines, keyed by engine name.
+
+        """
+        status = {}
+        for name, stats in self.wait_stats.items():
+            pool = stats.pool
+            status[name] = {
+                "status": pool.status(),
+                "size": pool.size(),
+                "checked_in": pool.checkedin(),
+                "checked_out": pool.checkedout(),
+                "overflow": max(pool.overflow(), 0),
+                "max_overflow": stats.max_overflow,
+                "timeout": pool.timeout(),
+                "waits": stats.waits,
+                "wait_time": round(stats.wait_time, 6),
+                "timeouts": stats.timeouts,
+            }
+        return status
+
     def get_db_session(self):
         """
         Get a database session.
 
         This is a context manager that yields a database session.
-        The session is closed at the end of the context.
+        The session is bound to a connection checked out up front, so waits for
+        a free connection are counted, and is removed at the end of the context.
 
         Yields:
             sqlalchemy.orm.Session: The database session
 
         """
-        session = self.session()
+        with self.wait_stats["sync"].measure():
+            connection = self.engine.connect()
         try:
+            yield self.session(bind=connection)
+        finally:
+            self.session.remove()
+            connection.close()
+
+    async def get_async_db_session(self):
+        """
+        Get an async database session.
+
+        This is the async counterpart of ``get_db_session`` and is meant to be used
+        as a FastAPI dependency. The session is closed at the end of the request.
+
+        Yields:
+            sqlalchemy.ext.asyncio.AsyncSession: The async database session
+
+        """
+        async with self.async_session_scope() as session:
             yield session
+
+    @asynccontextmanager
+    async def async_session_scope(self):
+        """
+        Open an async session bound to a connection checked out up front.
+
+        Checking the connection out before the session is used lets the wait for
+        a free connection be measured around ``engine.connect()``.
+
+        Yields:
+            sqlalchemy.ext.asyncio.AsyncSession: The async database session
+
+        """
+        connection = self.async_engine.connect()
+        with self.wait_stats["async"].measure():
+            await connection.start()
+        try:
+            async with self.async_session(bind=connection) as session:
+                yield session
         finally:
-            session.close()
+            await connection.close()
 
 
 # Make an instance of the Database class
@@ -0,0 +1,91 @@
+"""
+Pre-serialized static API documents
+
+Some endpoints (about, interests, contact, education) return documents built
+from literal data that never changes while the process runs. Each of them is
+rendered, JSON-encoded, hashed and compressed once, on its first request, and
+every later hit is served straight from those bytes.
+
+"""
+
+from typing import Awaitable, Callable, Optional
+
+from fastapi import Request, Response
+from pydantic import BaseModel
+
+from api.middleware import compute_etag, etag_matches
+from src.compression import (
+    SUPPORTED_ENCODINGS,
+    compress,
+    encoded_etag,
+    negotiate_encoding,
+)
+
+
+class StaticDocument:
+    """
+    A JSON document encoded once and served from memory.
+
+    Every encoding of the document is its own representation with its own
+    strong ETag, and responses carry ``Vary: Accept-Encoding`` so shared caches
+    keep them apart.
+
+    """
+
+    def __init__(self, builder: Callable[[], Awaitable[BaseModel]]):
+        """
+        Initialize the document.
+
+        Args:
+            builder (Callable[[], Awaitable[BaseModel]]): The coroutine function
+                that builds the document, e.g. ``get_about_info``.
+        """
+        self.builder = builder
+        # Content encoding ("identity" for none) -> (body, etag)
+        self.variants: Optional[dict[str, tuple[bytes, str]]] = None
+
+    async def render(self) -> dict[str, tuple[bytes, str]]:
+        """
+        Build, encode and compress the document on first use.
+
+        Returns:
+            dict[str, tuple[bytes, str]]: The body and ETag of every encoding.
+        """
+        if self.variants is None:
+            document = await self.builder()
+            body = document.model_dump_json().encode()
+            etag = compute_etag(body)
+            variants = {"identity": (body, etag)}
+            for encoding in SUPPORTED_ENCODINGS:
+                variants[encoding] = (
+                    compress(body, encoding),
+                    encoded_etag(etag, encoding),
+                )
+            self.variants = variants
+        return self.variants
+
+    async def response(self, request: Request) -> Response:
+        """
+        Serve the representation the client accepts, or 304 if it already has it.
+
+        Args:
+            request (Request): The incoming request.
+
+        Returns:
+            Response: The document response.
+        """
+        variants = await self.render()
+        encoding = negotiate_encoding(request.headers.get("accept-encoding"))
+        body, etag = variants[encoding or "identity"]
+        headers = {"ETag": etag, "Vary": "Accept-Encoding"}
+
+        # CompressionMiddleware maps encoded tags back to the identity tag
+        if_none_match = request.headers.get("if-none-match")
+        if if_none_match and (
+            etag_matches(etag, if_none_match)
+            or etag_matches(variants["identity"][1], if_none_match)
+        ):
+            return Response(status_code=304, headers=headers)
+        if encoding:
+            headers["Content-Encoding"] = encoding
+        return Response(content=body, media_type="application/json", headers=headers)
@@ -0,0 +1,216 @@
+"""
+ASGI middleware for the API
+
+Middleware here wraps the whole FastAPI application and is registered in
+``create_api()``. It is written against the raw ASGI interface so that response
+bodies are only buffered when a middleware actually needs them.
+
+"""
+
+import hashlib
+
+from starlette.datastructures import Headers, MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from src.compression import (
+    Compressor,
+    encoded_etag,
+    negotiate_encoding,
+    strip_encoded_etags,
+)
+
+# Headers a 304 response repeats from the response it stands in for (RFC 9110 15.4.5)
+NOT_MODIFIED_HEADERS = (
+    b"cache-control",
+    b"content-location",
+    b"date",
+    b"etag",
+    b"expires",
+    b"vary",
+)
+
+
+def compute_etag(body: bytes) -> str:
+    """
+    Compute a strong ETag from a response body.
+
+    Args:
+        body (bytes): The serialized response body.
+
+    Returns:
+        str: The quoted entity tag.
+    """
+    return f'"{hashlib.blake2b(body, digest_size=16).hexdigest()}"'
+
+
+def etag_matches(etag: str, if_none_match: str) -> bool:
+    """
+    Check an ETag against the value of an ``If-None-Match`` request header.
+
+    ``If-None-Match`` uses the weak comparison, so a ``W/`` prefix on either side
+    is ignored.
+
+    Args:
+        etag (str): The entity tag of the current representation.
+        if_none_match (str): The header value, a comma separated list of tags or ``*``.
+
+    Returns:
+        bool: Whether the client already holds the current representation.
+    """
+    if if_none_match.strip() == "*":
+        return True
+    etag = etag.removeprefix("W/")
+    return any(
+        candidate.strip().removeprefix("W/") == etag
+        for candidate in if_none_match.split(",")
+    )
+
+
+class ETagMiddleware:
+    """
+    Add ETags to successful GET responses and answer conditional GETs with 304.
+
+    An ``ETag`` set by the route (or stored with a cached response) is kept;
+    otherwise one is computed from the body. Streaming responses, whose body
+    arrives in several messages, are passed through untouched.
+
+    """
+
+    def __init__(self, app: ASGIApp):
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http" or scope["method"] != "GET":
+            await self.app(scope, receive, send)
+            return
+
+        if_none_match = Headers(scope=scope).get("if-none-match")
+        start_message: Message = {}
+
+        async def send_with_etag(message: Message) -> None:
+            nonlocal start_message
+            if message["type"] == "http.response.start":
+                if message["status"] != 200:
+                    await send(message)
+                    return
+                # Hold the start message back until the body is known
+                start_message = message
+                return
+
+            if not start_message:
+                await send(message)
+                return
+
+            if message.get("more_body", False):
+                # Streaming response: release the held start message unchanged
+                await send(start_message)
+                start_message = {}
+                await send(message)
+                return
+
+            headers = MutableHeaders(scope=start_message)
+            etag = headers.get("etag")
+            if etag is None:
+                etag = compute_etag(message.get("body", b""))
+                headers["ETag"] = etag
+
+            if if_none_match and etag_matches(etag, if_none_match):
+                await send(
+                    {
+                        "type": "http.response.start",
+                        "status": 304,
+                        "headers": [
+                            (name, value)
+                            for name, value in headers.raw
+                            if name in NOT_MODIFIED_HEADERS
+                        ],
+                    }
+                )
+                await send({"type": "http.response.body", "body": b""})
+            else:
+                await send(start_message)
+                await send(message)
+            start_message = {}
+
+        await self.app(scope, receive, send_with_etag)
+
+
+class CompressionMiddleware:
+    """
+    Compress response bodies with the encoding negotiated from ``Accept-Encoding``.
+
+    Only complete (non-streaming) bodies of compressible media types above the
+    compressor's minimum size are compressed, and responses that are already
+    encoded are left alone. A compressed representation gets its own ETag,
+    derived from the identity one, and ``If-None-Match`` tags are mapped back
+    before the request reaches ``ETagMiddleware``, so conditional GETs keep
+    working for compressed responses.
+
+    """
+
+    def __init__(self, app: ASGIApp, compressor: Compressor):
+        self.app = app
+        self.compressor = compressor
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        request_headers = Headers(scope=scope)
+        encoding = negotiate_encoding(request_headers.get("accept-encoding"))
+        if encoding is None:
+            await self.app(scope, receive, send)
+            return
+
+        # Tags of encoded representations are sent back by clients on revalidation
+        if_none_match = request_headers.get("if-none-match")
+        revalidating_encoded = False
+        if if_none_match:
+            stripped = strip_encoded_etags(if_none_match)
+            if stripped != if_none_match:
+                revalidating_encoded = True
+                scope = dict(scope)
+                scope["headers"] = [
+                    (name, value)
+                    for name, value in scope["headers"]
+                    if name != b"if-none-match"
+                ] + [(b"if-none-match", stripped.encode("latin-1"))]
+
+        start_message: Message = {}
+
+        async def send_compressed(message: Message) -> None:
+            nonlocal start_message
+            if message["type"] == "http.response.start":
+                # Hold the start message back until the body is known
+                start_message = message
+                return
+
+            if not start_message:
+                await send(message)
+                return
+
+            headers = MutableHeaders(scope=start_message)
+            body = message.get("body", b"")
+            etag = headers.get("etag")
+            if message.get("more_body", False) or not self.compressor.should_compress(
+                headers.get("content-type"), headers.get("content-encoding"), len(body)
+            ):
+                if start_message["status"] == 304 and etag and revalidating_encoded:
+                    headers["ETag"] = encoded_etag(etag, encoding)
+                await send(start_message)
+                start_message = {}
+                await send(message)
+                return
+
+            compressed = self.compressor.compress(body, encoding, etag)
+            headers["Content-Encoding"] = encoding
+            headers["Content-Length"] = str(len(compressed))
+            headers.add_vary_header("Accept-Encoding")
+            if etag:
+                headers["ETag"] = encoded_etag(etag, encoding)
+            await send(start_message)
+            start_message = {}
+            await send({"type": "http.response.body", "body": compressed})
+
+        await self.app(scope, receive, send_compressed)
@@ -0,0 +1,146 @@
+"""
+Keyset (cursor) pagination helpers
+
+List endpoints page through their tables by primary key instead of LIMIT/OFFSET,
+so fetching any page costs a single index range scan regardless of its depth.
+The position of a page is handed to clients as an opaque cursor.
+
+"""
+
+import base64
+import binascii
+import json
+from typing import Literal, Optional
+
+from fastapi import HTTPException, Query, Request, Response
+from sqlalchemy import Select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from logging_setup import api_logger
+
+# Number of rows returned when the client does not ask for a specific page size
+DEFAULT_PAGE_LIMIT = 50
+
+# Upper bound for the page size a client can ask for
+MAX_PAGE_LIMIT = 200
+
+
+class PageParams:
+    """
+    Query parameters shared by the paginated list endpoints.
+
+    Attributes:
+        limit (int): The maximum number of rows to return.
+        cursor (str, optional): The cursor of the page to fetch.
+        unpaginated (bool): Whether the client explicitly asked for every row
+            as a plain list (``?all=true``).
+        stream (bool): Whether the client asked for every row as a streamed
+            NDJSON document (``?format=ndjson``).
+    """
+
+    def __init__(
+        self,
+        limit: int = Query(DEFAULT_PAGE_LIMIT, ge=1, le=MAX_PAGE_LIMIT),
+        cursor: Optional[str] = Query(None, description="Cursor of the next page"),
+        unpaginated: bool = Query(
+            False, alias="all", description="Return every row as a plain list"
+        ),
+        format: Literal["json", "ndjson"] = Query(
+            "json", description="ndjson streams every row, one JSON document per line"
+        ),
+    ):
+        self.limit = limit
+        self.cursor = cursor
+        self.unpaginated = unpaginated
+        self.stream = format == "ndjson"
+
+
+def encode_cursor(last_id: int) -> str:
+    """
+    Encode the position after the given row ID as an opaque cursor.
+
+    Args:
+        last_id (int): The ID of the last row of the current page.
+
+    Returns:
+        str: The URL-safe cursor.
+    """
+    raw = json.dumps({"id": last_id}, separators=(",", ":")).encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str) -> int:
+    """
+    Decode a cursor produced by ``encode_cursor``.
+
+    Args:
+        cursor (str): The cursor received from the client.
+
+    Returns:
+        int: The ID of the last row of the previous page.
+
+    Raises:
+        HTTPException: If the cursor is malformed.
+    """
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        last_id = json.loads(base64.urlsafe_b64decode(padded))["id"]
+    except (ValueError, KeyError, TypeError, binascii.Error):
+        last_id = None
+    if not isinstance(last_id, int):
+        api_logger.error(f"Invalid pagination cursor: {cursor}")
+        raise HTTPException(status_code=400, detail="Invalid pagination cursor")
+    return last_id
+
+
+async def paginate(
+    db: AsyncSession,
+    statement: Select,
+    model,
+    limit: int = DEFAULT_PAGE_LIMIT,
+    cursor: Optional[str] = None,
+) -> tuple[list, Optional[str]]:
+    """
+    Fetch a single page of rows ordered by primary key.
+
+    One extra row is requested to find out whether another page follows,
+    so no separate COUNT query is needed.
+
+    Args:
+        db (AsyncSession): The database session.
+        statement (Select): The select statement for the model.
+        model (type): The model class being paginated.
+        limit (int): The maximum number of rows to return.
+        cursor (str, optional): The cursor of the page to fetch.
+
+    Returns:
+        tuple[list, Optional[str]]: The rows of the page and the cursor of the
+            next page, or None if this is the last page.
+    """
+    if cursor:
+        statement = statement.where(model.id > decode_cursor(cursor))
+    statement = statement.order_by(model.id).limit(limit + 1)
+
+    rows = (await db.scalars(statement)).all()
+    if len(rows) > limit:
+        rows = rows[:limit]
+        return rows, encode_cursor(rows[-1].id)
+    return rows, None
+
+
+def set_pagination_headers(
+    request: Request, response: Response, limit: int, next_cursor: Optional[str]
+) -> None:
+    """
+    Advertise the next page through an RFC 8288 ``Link`` header.
+
+    Args:
+        request (Request): The incoming request.
+        response (Response): The response to add the header to.
+        limit (int): The page size of the current request.
+        next_cursor (str, optional): The cursor of the next page, if any.
+    """
+    if next_cursor is None:
+        return
+    next_url = request.url.include_query_params(limit=limit, cursor=next_cursor)
+    response.headers["Link"] = f'<{next_url}>; rel="next"'
@@ -0,0 +1,81 @@
+"""
+JSON response class of the API
+
+``FastJSONResponse`` is the ``default_response_class`` of the application. It
+encodes with orjson, a dependency of the project. A compact standard-library
+encoder is kept as a fallback for environments where orjson cannot be installed,
+and a warning is logged at startup when it is in use. Both produce the same
+JSON: UTF-8, no whitespace, and ISO 8601 dates and datetimes.
+
+"""
+
+import json
+from datetime import date, datetime, time
+from decimal import Decimal
+from typing import Any
+from uuid import UUID
+
+from fastapi.responses import JSONResponse
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover - fallback when orjson is missing
+    orjson = None
+
+# Name of the encoder in use, reported by the JSON encoder benchmark
+JSON_ENCODER = "orjson" if orjson is not None else "json"
+
+
+def encode_default(value: Any) -> Any:
+    """
+    Convert values the standard-library encoder does not know to JSON types.
+
+    Response models are already serialized in JSON mode by FastAPI, so this is only
+    reached by routes that return raw content without a response model.
+
+    Args:
+        value (Any): The value to convert.
+
+    Returns:
+        Any: A JSON-serializable representation of the value.
+
+    Raises:
+        TypeError: If the value has no JSON representation.
+    """
+    if isinstance(value, (date, datetime, time)):
+        return value.isoformat()
+    if isinstance(value, (Decimal, UUID)):
+        return str(value)
+    if isinstance(value, (set, frozenset)):
+        return list(value)
+    raise TypeError(f"Object of type {type(value).__name__} is not JSON serializable")
+
+
+def dumps(content: Any) -> bytes:
+    """
+    Encode content as compact UTF-8 JSON.
+
+    Args:
+        content (Any): The content to encode.
+
+    Returns:
+        bytes: The encoded JSON.
+    """
+    if orjson is not None:
+        return orjson.dumps(
+            content, default=encode_default, option=orjson.OPT_NON_STR_KEYS
+        )
+    return json.dumps(
+        content,
+        ensure_ascii=False,
+        allow_nan=False,
+        separators=(",", ":"),
+        default=encode_default,
+    ).encode("utf-8")
+
+
+class FastJSONResponse(JSONResponse):
+    """JSON response encoded with orjson when available."""
+
+    def render(self, content: Any) -> bytes:
+        return dumps(content)
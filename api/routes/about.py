@@ -1,22 +1,26 @@
-from fastapi import APIRouter
+from fastapi import APIRouter, Request, Response
 
-from api.schemas.about import AboutInfoResponse, AboutInterestsResponse
 from api.crud.about import get_all_interests, get_about_info
+from api.documents import StaticDocument
+from api.schemas.about import AboutInfoResponse, AboutInterestsResponse
 
 router = APIRouter(tags=["About"])
 
+about_document = StaticDocument(get_about_info)
+interests_document = StaticDocument(get_all_interests)
+
 
 @router.get("/about", response_model=AboutInfoResponse)
-async def about_info() -> AboutInfoResponse:
+async def about_info(request: Request) -> Response:
     """
     Retrieve the about me information.
     """
-    return await get_about_info()
+    return await about_document.response(request)
 
 
 @router.get("/interests", response_model=AboutInterestsResponse)
-async def get_interests() -> AboutInterestsResponse:
+async def get_interests(request: Request) -> Response:
     """
     Retrieve the list of interests.
     """
-    return await get_all_interests()
+    return await interests_document.response(request)
@@ -1,14 +1,17 @@
-from fastapi import APIRouter
+from fastapi import APIRouter, Request, Response
 
 from api.crud.contact import get_contact_info
+from api.documents import StaticDocument
 from api.schemas.contact import ContactInfoResponse
 
 router = APIRouter(tags=["Contact"])
 
+contact_document = StaticDocument(get_contact_info)
+
 
 @router.get("/contact", response_model=ContactInfoResponse)
-async def contact_info() -> ContactInfoResponse:
+async def contact_info(request: Request) -> Response:
     """
     Retrieve the contact information.
     """
-    return await get_contact_info()
+    return await contact_document.response(request)
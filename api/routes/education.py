@@ -1,15 +1,27 @@
-from fastapi import APIRouter, Depends, HTTPException
-from sqlalchemy.orm import Session
+from typing import List, Optional, Union
 
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, Response
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from api.cache import cached_route
 from api.crud.education import (
     get_education_info,
     get_all_certifications,
+    stream_all_certifications,
+    get_certifications_page,
     get_certification_by_id,
     create_certification,
     update_certification,
     delete_certification,
+    bulk_create_certifications,
+    bulk_update_certifications,
+    bulk_delete_certifications,
 )
 from api.db import database
+from api.documents import StaticDocument
+from api.pagination import PageParams, set_pagination_headers
+from api.schemas.bulk import BulkDeleteRequest, BulkDeleteResponse, BulkResponse
+from api.schemas.pagination import Page
 from api.schemas.education import (
     EducationInfoResponse,
     CertificationInfoResponse,
@@ -17,27 +29,93 @@ from api.schemas.education import (
     UpdateCertificationResponse,
     DeleteCertificationResponse,
 )
+from api.schemas.user import UserSchema
+from api.security import get_current_user
+from api.streaming import ndjson_response
+
+router = APIRouter(tags=["Education"], route_class=cached_route("certifications"))
 
-router = APIRouter(tags=["Education"])
+education_document = StaticDocument(get_education_info)
 
 
 @router.get("/education", response_model=EducationInfoResponse)
-async def get_education():
+async def get_education(request: Request):
     """Get education info"""
-    return await get_education_info()
+    return await education_document.response(request)
+
+
+@router.get(
+    "/certifications",
+    response_model=Union[
+        Page[CertificationInfoResponse], List[CertificationInfoResponse]
+    ],
+)
+async def list_certifications(
+    request: Request,
+    response: Response,
+    page: PageParams = Depends(),
+    skill: Optional[str] = Query(
+        None, max_length=255, description="Only certifications teaching this skill"
+    ),
+    db: AsyncSession = Depends(database.get_async_db_session),
+):
+    """
+    Retrieve certifications page by page.
+
+    ``?all=true`` returns every one of them as a plain list and ``?format=ndjson``
+    streams them as NDJSON, one certification per line. ``?skill=`` keeps the
+    certifications listing a skill among their acquired skills, in any case.
+    """
+    if page.stream:
+        return ndjson_response(
+            stream_all_certifications(skill), CertificationInfoResponse
+        )
+    if page.unpaginated:
+        return await get_all_certifications(db, skill)
+    certifications = await get_certifications_page(db, page.limit, page.cursor, skill)
+    set_pagination_headers(request, response, page.limit, certifications["next_cursor"])
+    return certifications
+
+
+@router.post(
+    "/certifications/bulk", response_model=BulkResponse[CertificationInfoResponse]
+)
+async def create_certifications_in_bulk(
+    certifications: List[CertificationInfoResponse],
+    db: AsyncSession = Depends(database.get_async_db_session),
+    current_user: UserSchema = Depends(get_current_user),
+):
+    """Create many certifications for the current user at once"""
+    return await bulk_create_certifications(certifications, current_user.id, db)
 
 
-@router.get("/certifications", response_model=list[CertificationInfoResponse])
-async def list_certifications(db: Session = Depends(database.get_db_session)):
-    """Retrieve all certifications"""
-    return await get_all_certifications(db)
+@router.put(
+    "/certifications/bulk", response_model=BulkResponse[CertificationInfoResponse]
+)
+async def update_certifications_in_bulk(
+    certifications: List[CertificationInfoResponse],
+    db: AsyncSession = Depends(database.get_async_db_session),
+    current_user: UserSchema = Depends(get_current_user),
+):
+    """Update many certifications of the current user at once, skipping and reporting the invalid ones"""
+    return await bulk_update_certifications(certifications, current_user.id, db)
+
+
+@router.delete("/certifications/bulk", response_model=BulkDeleteResponse)
+async def delete_certifications_in_bulk(
+    body: BulkDeleteRequest,
+    db: AsyncSession = Depends(database.get_async_db_session),
+    current_user: UserSchema = Depends(get_current_user),
+):
+    """Delete many certifications of the current user at once, reporting the failing IDs"""
+    return await bulk_delete_certifications(body.ids, current_user.id, db)
 
 
 @router.get(
     "/certifications/{certification_id}", response_model=CertificationInfoResponse
 )
 async def get_certification(
-    certification_id: int, db: Session = Depends(database.get_db_session)
+    certification_id: int, db: AsyncSession = Depends(database.get_async_db_session)
 ):
     """Retrieve a certification by ID"""
     certification = await get_certification_by_id(certification_id, db)
@@ -49,7 +127,7 @@ async def get_certification(
 @router.post("/certifications", response_model=CreateCertificationResponse)
 async def create_new_certification(
     certification: CertificationInfoResponse,
-    db: Session = Depends(database.get_db_session),
+    db: AsyncSession = Depends(database.get_async_db_session),
 ):
     """Create a new certification"""
     return await create_certification(certification, db)
@@ -61,7 +139,7 @@ async def create_new_certification(
 async def update_certification_details(
     certification_id: int,
     certification: CertificationInfoResponse,
-    db: Session = Depends(database.get_db_session),
+    db: AsyncSession = Depends(database.get_async_db_session),
 ):
     """Update an existing certification"""
     return await update_certification(certification_id, certification, db)
@@ -71,7 +149,7 @@ async def update_certification_details(
     "/certifications/{certification_id}", response_model=DeleteCertificationResponse
 )
 async def delete_certification_by_id(
-    certification_id: int, db: Session = Depends(database.get_db_session)
+    certification_id: int, db: AsyncSession = Depends(database.get_async_db_session)
 ):
     """Delete a certification"""
     return await delete_certification(certification_id, db)
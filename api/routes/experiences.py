@@ -1,39 +1,99 @@
-from typing import List
+from typing import List, Union
 
-from fastapi import APIRouter, Depends, HTTPException
-from sqlalchemy.orm import Session
+from fastapi import APIRouter, Depends, HTTPException, Request, Response
+from sqlalchemy.ext.asyncio import AsyncSession
 
 # from api.security import check_authorization
+from api.cache import cached_route
 from api.crud.experience import (
     get_all_experiences,
+    stream_all_experiences,
+    get_experiences_page,
     get_experience_by_id,
     create_experience,
     update_experience,
     delete_experience,
+    bulk_create_experiences,
+    bulk_update_experiences,
+    bulk_delete_experiences,
 )
 from api.db import database
+from api.pagination import PageParams, set_pagination_headers
+from api.schemas.bulk import BulkDeleteRequest, BulkDeleteResponse, BulkResponse
+from api.schemas.pagination import Page
 from api.schemas.experience import (
     ExperienceSchema,
     UpdateExperienceResponse,
     CreateExperienceResponse,
     DeleteExperienceResponse,
 )
+from api.schemas.user import UserSchema
+from api.security import get_current_user
+from api.streaming import ndjson_response
 
 # from src.db.models import Experience
 
-router = APIRouter(tags=["Experiences"])
+router = APIRouter(tags=["Experiences"], route_class=cached_route("experiences"))
 
 
-@router.get("/experiences", response_model=List[ExperienceSchema])
-async def list_experiences(db: Session = Depends(database.get_db_session)):
-    """Retrieve all experiences"""
-    experiences = get_all_experiences(db)
+@router.get(
+    "/experiences",
+    response_model=Union[Page[ExperienceSchema], List[ExperienceSchema]],
+)
+async def list_experiences(
+    request: Request,
+    response: Response,
+    page: PageParams = Depends(),
+    db: AsyncSession = Depends(database.get_async_db_session),
+):
+    """
+    Retrieve experiences page by page.
+
+    ``?all=true`` returns every one of them as a plain list and ``?format=ndjson``
+    streams them as NDJSON, one experience per line.
+    """
+    if page.stream:
+        return ndjson_response(stream_all_experiences(), ExperienceSchema)
+    if page.unpaginated:
+        return await get_all_experiences(db)
+    experiences = await get_experiences_page(db, page.limit, page.cursor)
+    set_pagination_headers(request, response, page.limit, experiences["next_cursor"])
     return experiences
 
 
+@router.post("/experiences/bulk", response_model=BulkResponse[ExperienceSchema])
+async def create_experiences_in_bulk(
+    experiences: List[ExperienceSchema],
+    db: AsyncSession = Depends(database.get_async_db_session),
+    current_user: UserSchema = Depends(get_current_user),
+):
+    """Create many experiences for the current user at once"""
+    return await bulk_create_experiences(experiences, current_user.id, db)
+
+
+@router.put("/experiences/bulk", response_model=BulkResponse[ExperienceSchema])
+async def update_experiences_in_bulk(
+    experiences: List[ExperienceSchema],
+    db: AsyncSession = Depends(database.get_async_db_session),
+    current_user: UserSchema = Depends(get_current_user),
+):
+    """Update many experiences of the current user at once, skipping and reporting the invalid ones"""
+    return await bulk_update_experiences(experiences, current_user.id, db)
+
+
+@router.delete("/experiences/bulk", response_model=BulkDeleteResponse)
+async def delete_experiences_in_bulk(
+    body: BulkDeleteRequest,
+    db: AsyncSession = Depends(database.get_async_db_session),
+    current_user: UserSchema = Depends(get_current_user),
+):
+    """Delete many experiences of the current user at once, reporting the failing IDs"""
+    return await bulk_delete_experiences(body.ids, current_user.id, db)
+
+
 @router.get("/experiences/{experience_id}", response_model=ExperienceSchema)
 async def get_experience(
-    experience_id: int, db: Session = Depends(database.get_db_session)
+    experience_id: int, db: AsyncSession = Depends(database.get_async_db_session)
 ):
     """Retrieve an experience by ID"""
     experience = await get_experience_by_id(experience_id, db)
@@ -45,7 +105,8 @@ async def get_experience(
 # TODO: add authorization
 @router.post("/experiences", response_model=CreateExperienceResponse)
 async def create_new_experience(
-    experience: ExperienceSchema, db: Session = Depends(database.get_db_session)
+    experience: ExperienceSchema,
+    db: AsyncSession = Depends(database.get_async_db_session),
 ):
     """Create a new experience"""
     new_experience = await create_experience(experience, db)
@@ -57,7 +118,7 @@ async def create_new_experience(
 async def update_experience_details(
     experience_id: int,
     experience: ExperienceSchema,
-    db: Session = Depends(database.get_db_session),
+    db: AsyncSession = Depends(database.get_async_db_session),
 ):
     """Update an existing experience"""
     updated_experience = await update_experience(experience_id, experience, db)
@@ -69,7 +130,7 @@ async def update_experience_details(
 # TODO: add authorization
 @router.delete("/experiences/{experience_id}", response_model=DeleteExperienceResponse)
 async def delete_experience_by_id(
-    experience_id: int, db: Session = Depends(database.get_db_session)
+    experience_id: int, db: AsyncSession = Depends(database.get_async_db_session)
 ):
     """Delete an experience"""
     return await delete_experience(experience_id, db)
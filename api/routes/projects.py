@@ -1,76 +1,98 @@
-from typing import List
+from typing import List, Optional, Union
 
-from fastapi import APIRouter, Depends
-from sqlalchemy.orm import Session
+from fastapi import APIRouter, Depends, Query, Request, Response
+from sqlalchemy.ext.asyncio import AsyncSession
 
+from api.cache import cached_route
 from api.crud.project import (
     get_all_projects,
+    stream_all_projects,
+    get_projects_page,
     get_project_by_id,
     create_project,
     update_project,
     delete_project,
 )
 from api.db import database
+from api.pagination import PageParams, set_pagination_headers
+from api.schemas.pagination import Page
 from api.schemas.project import (
     CreateProjectResponse,
     DeleteProjectResponse,
     ProjectSchema,
     UpdateProjectResponse,
 )
-from api.security import check_authorization, get_current_user
-from src.db.models import Project, User
+from api.schemas.user import UserSchema
+from api.security import get_current_user
+from api.streaming import ndjson_response
 
-router = APIRouter(tags=["Projects"])
+router = APIRouter(tags=["Projects"], route_class=cached_route("projects"))
 
 
-@router.get("/projects", response_model=List[ProjectSchema])
-async def list_projects(db: Session = Depends(database.get_db_session)):
-    """Retrieve all projects"""
-    projects = await get_all_projects(db)
+@router.get("/projects", response_model=Union[Page[ProjectSchema], List[ProjectSchema]])
+async def list_projects(
+    request: Request,
+    response: Response,
+    page: PageParams = Depends(),
+    tech: Optional[str] = Query(
+        None, max_length=255, description="Only projects using this technology"
+    ),
+    db: AsyncSession = Depends(database.get_async_db_session),
+):
+    """
+    Retrieve projects page by page.
+
+    ``?all=true`` returns every one of them as a plain list and ``?format=ndjson``
+    streams them as NDJSON, one project per line. ``?tech=`` keeps the projects
+    using a technology of their tech stack, in any case.
+    """
+    if page.stream:
+        return ndjson_response(stream_all_projects(tech), ProjectSchema)
+    if page.unpaginated:
+        return await get_all_projects(db, tech)
+    projects = await get_projects_page(db, page.limit, page.cursor, tech)
+    set_pagination_headers(request, response, page.limit, projects["next_cursor"])
     return projects
 
 
 @router.get("/projects/{project_id}", response_model=ProjectSchema)
-async def get_project(project_id: int, db: Session = Depends(database.get_db_session)):
+async def get_project(
+    project_id: int, db: AsyncSession = Depends(database.get_async_db_session)
+):
     """Retrieve details of a specific project by its ID"""
     project = await get_project_by_id(project_id, db)
     return project
 
 
-# TODO: Add authorization
 @router.post("/projects", response_model=CreateProjectResponse)
 async def create_new_project(
     project: ProjectSchema,
-    current_user: User = Depends(get_current_user),
-    db: Session = Depends(database.get_db_session),
+    current_user: UserSchema = Depends(get_current_user),
+    db: AsyncSession = Depends(database.get_async_db_session),
 ):
     """Create a new project"""
     new_project = await create_project(project, current_user.id, db)
     return new_project
 
 
-# TODO: Add authorization
 @router.put("/projects/{project_id}", response_model=UpdateProjectResponse)
-@check_authorization(Project)
 async def update_existing_project(
     project_id: int,
     project: ProjectSchema,
-    current_user: User = Depends(get_current_user),
-    db: Session = Depends(database.get_db_session),
+    current_user: UserSchema = Depends(get_current_user),
+    db: AsyncSession = Depends(database.get_async_db_session),
 ):
     """Update an existing project"""
     updated_project = await update_project(project_id, project, current_user.id, db)
     return updated_project
 
 
-# TODO: Add authorization
 @router.delete("/projects/{project_id}", response_model=DeleteProjectResponse)
-@check_authorization(Project)
 async def delete_existing_project(
     project_id: int,
-    db: Session = Depends(database.get_db_session),
-    current_user: User = Depends(get_current_user),
+    db: AsyncSession = Depends(database.get_async_db_session),
+    current_user: UserSchema = Depends(get_current_user),
 ):
     """Delete an existing project"""
-    await delete_project(project_id, current_user.id, db)
-    return {"detail": "Project deleted successfully"}
+    deleted_project = await delete_project(project_id, current_user.id, db)
+    return deleted_project
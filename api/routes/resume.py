@@ -1,15 +1,16 @@
 from fastapi import APIRouter, Depends
-from sqlalchemy.orm import Session
+from sqlalchemy.ext.asyncio import AsyncSession
 
+from api.cache import cached_route
 from api.crud.resume import get_resume_link, update_resume_link
 from api.db import database
 from api.schemas.resume import ResumeLinkResponse, UpdateResumeLinkResponse
 
-router = APIRouter(tags=["Resume"])
+router = APIRouter(tags=["Resume"], route_class=cached_route("resume"))
 
 
 @router.get("/resume", response_model=ResumeLinkResponse)
-async def get_resume_url(db: Session = Depends(database.get_db_session)):
+async def get_resume_url(db: AsyncSession = Depends(database.get_async_db_session)):
     """
     Retrieve the current resume link from the database.
     """
@@ -18,7 +19,9 @@ async def get_resume_url(db: Session = Depends(database.get_db_session)):
 
 
 @router.put("/resume", response_model=UpdateResumeLinkResponse)
-async def update_resume_url(link: str, db: Session = Depends(database.get_db_session)):
+async def update_resume_url(
+    link: str, db: AsyncSession = Depends(database.get_async_db_session)
+):
     """
     Update the resume link in the database.
     """
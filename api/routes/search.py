@@ -0,0 +1,25 @@
+"""
+API endpoint for searching the portfolio
+"""
+
+from fastapi import APIRouter, Depends, Query
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from api.crud.search import search_content
+from api.db import database
+from api.schemas.search import SearchResponse
+
+# Create FastAPI router for the search endpoint
+router = APIRouter(tags=["Search"])
+
+
+@router.get("/search", response_model=SearchResponse)
+async def search(
+    q: str = Query(..., min_length=1, max_length=200, description="Search query"),
+    limit: int = Query(20, ge=1, le=100),
+    db: AsyncSession = Depends(database.get_async_db_session),
+):
+    """Full-text search over projects and certifications, best matches first"""
+    q = q.strip()
+    results = await search_content(db, q, limit) if q else []
+    return {"query": q, "results": results}
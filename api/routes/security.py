@@ -2,45 +2,118 @@
 API endpoints for authentication
 """
 
-from datetime import timedelta, datetime, timezone
+import time
 
-from fastapi import APIRouter, status, Depends
+from fastapi import APIRouter, Request, Response, status, Depends
 from fastapi.security import OAuth2PasswordRequestForm
-from sqlalchemy.orm import Session
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
 
+from api.crud.refresh_token import (
+    issue_refresh_token,
+    revoke_refresh_token,
+    rotate_refresh_token,
+)
 from api.db import database
-from api.security import verify_password, AuthorizationError, create_access_token
+from api.schemas.token import RefreshTokenRequest, TokenResponse
+from api.security import (
+    ACCESS_TOKEN_TTL,
+    AuthorizationError,
+    create_access_token,
+    login_throttle,
+    verify_password_async,
+)
 from src.db.models import User
 
 # Create FastAPI router for authentication endpoints
 router = APIRouter(tags=["Authentication"])
 
 
-@router.post("/token")
+def token_response(user_id: int, refresh_claims: dict, refresh_token: str) -> dict:
+    """
+    Build the token response for a user and their new refresh token.
+
+    Args:
+        user_id (int): The ID of the user the tokens are issued to.
+        refresh_claims (dict): The claims of the refresh token.
+        refresh_token (str): The encoded refresh token.
+
+    Returns:
+        dict: A new access token together with the refresh token.
+    """
+    now = int(time.time())
+    expires_in = ACCESS_TOKEN_TTL
+    access_token = create_access_token({"sub": str(user_id), "exp": now + expires_in})
+    return {
+        "access_token": access_token,
+        "token_type": "bearer",
+        "expires_in": expires_in,
+        "refresh_token": refresh_token,
+        "refresh_expires_in": refresh_claims["exp"] - now,
+    }
+
+
+@router.post("/token", response_model=TokenResponse)
 async def login_for_access_token(
+    request: Request,
     form_data: OAuth2PasswordRequestForm = Depends(),
-    db: Session = Depends(database.get_db_session),
+    db: AsyncSession = Depends(database.get_async_db_session),
 ):
     """
     Generate a new access token for a user.
 
     This endpoint takes an OAuth2 password request form and verifies the user's
     credentials. If the credentials are valid, the endpoint returns a new access
-    token.
+    token and a refresh token, which ``/token/refresh`` exchanges for new tokens
+    without the password.
+
+    Attempts are throttled per client IP and per account, and the password is
+    verified in the bounded password hashing pool, off the event loop.
     """
-    user = db.query(User).filter(User.email == form_data.username).first()
-    if not user or not verify_password(form_data.password, user.password_hash):
+    client_ip = request.client.host if request.client else "unknown"
+    login_throttle.check(form_data.username, client_ip)
+
+    user = await db.scalar(select(User).where(User.email == form_data.username))
+    if not user or not await verify_password_async(
+        form_data.password, user.password_hash
+    ):
+        login_throttle.record_failure(form_data.username)
         raise AuthorizationError(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="Incorrect username or password",
             headers={"WWW-Authenticate": "Bearer"},
         )
-    expire = timedelta(minutes=30)
-    now = datetime.now(timezone.utc)
-    token_data = {"sub": str(user.id), "exp": now + expire}
-    access_token = create_access_token(token_data)
-    return {
-        "access_token": access_token,
-        "token_type": "bearer",
-        "expires_in": expire.total_seconds(),
-    }
+    login_throttle.record_success(form_data.username)
+    refresh_claims, refresh_token = await issue_refresh_token(db, user.id)
+    await db.commit()
+    return token_response(user.id, refresh_claims, refresh_token)
+
+
+@router.post("/token/refresh", response_model=TokenResponse)
+async def refresh_access_token(
+    body: RefreshTokenRequest,
+    db: AsyncSession = Depends(database.get_async_db_session),
+):
+    """
+    Exchange a refresh token for a new access token and refresh token.
+
+    The presented refresh token is revoked, so each one can be used once.
+    Presenting a revoked token again revokes every token issued since the
+    login it came from.
+    """
+    user, refresh_claims, refresh_token = await rotate_refresh_token(
+        db, body.refresh_token
+    )
+    return token_response(user.id, refresh_claims, refresh_token)
+
+
+@router.post("/token/revoke", status_code=status.HTTP_204_NO_CONTENT)
+async def revoke_token(
+    body: RefreshTokenRequest,
+    db: AsyncSession = Depends(database.get_async_db_session),
+):
+    """
+    Revoke a refresh token and every token rotated from the same login (logout).
+    """
+    await revoke_refresh_token(db, body.refresh_token)
+    return Response(status_code=status.HTTP_204_NO_CONTENT)
@@ -1,36 +1,95 @@
-from typing import List
+from typing import List, Union
 
-from fastapi import APIRouter, Depends
-from sqlalchemy.orm import Session
+from fastapi import APIRouter, Depends, Request, Response
+from sqlalchemy.ext.asyncio import AsyncSession
 
+from api.cache import cached_route
 from api.crud.skill import (
     get_all_skills,
+    stream_all_skills,
+    get_skills_page,
     get_skill_by_id,
     get_skills_by_category,
     create_skill,
     update_skill,
     delete_skill,
+    bulk_create_skills,
+    bulk_update_skills,
+    bulk_delete_skills,
 )
 from api.db import database
+from api.pagination import PageParams, set_pagination_headers
+from api.schemas.bulk import BulkDeleteRequest, BulkDeleteResponse, BulkResponse
+from api.schemas.pagination import Page
 from api.schemas.skill import (
     SkillSchema,
     CreateSkillResponse,
     DeleteSkillResponse,
     UpdateSkillResponse,
 )
+from api.schemas.user import UserSchema
+from api.security import get_current_user
+from api.streaming import ndjson_response
 
-router = APIRouter(tags=["Skills"])
+router = APIRouter(tags=["Skills"], route_class=cached_route("skills"))
 
 
-@router.get("/skills", response_model=List[SkillSchema])
-async def list_skills(db: Session = Depends(database.get_db_session)):
-    """Retrieve all skills"""
-    skills = await get_all_skills(db)
+@router.get("/skills", response_model=Union[Page[SkillSchema], List[SkillSchema]])
+async def list_skills(
+    request: Request,
+    response: Response,
+    page: PageParams = Depends(),
+    db: AsyncSession = Depends(database.get_async_db_session),
+):
+    """
+    Retrieve skills page by page.
+
+    ``?all=true`` returns every one of them as a plain list and ``?format=ndjson``
+    streams them as NDJSON, one skill per line.
+    """
+    if page.stream:
+        return ndjson_response(stream_all_skills(), SkillSchema)
+    if page.unpaginated:
+        return await get_all_skills(db)
+    skills = await get_skills_page(db, page.limit, page.cursor)
+    set_pagination_headers(request, response, page.limit, skills["next_cursor"])
     return skills
 
 
+@router.post("/skills/bulk", response_model=BulkResponse[SkillSchema])
+async def create_skills_in_bulk(
+    skills: List[SkillSchema],
+    db: AsyncSession = Depends(database.get_async_db_session),
+    current_user: UserSchema = Depends(get_current_user),
+):
+    """Create many skills for the current user, skipping and reporting the invalid ones"""
+    return await bulk_create_skills(skills, current_user.id, db)
+
+
+@router.put("/skills/bulk", response_model=BulkResponse[SkillSchema])
+async def update_skills_in_bulk(
+    skills: List[SkillSchema],
+    db: AsyncSession = Depends(database.get_async_db_session),
+    current_user: UserSchema = Depends(get_current_user),
+):
+    """Update many skills of the current user at once, skipping and reporting the invalid ones"""
+    return await bulk_update_skills(skills, current_user.id, db)
+
+
+@router.delete("/skills/bulk", response_model=BulkDeleteResponse)
+async def delete_skills_in_bulk(
+    body: BulkDeleteRequest,
+    db: AsyncSession = Depends(database.get_async_db_session),
+    current_user: UserSchema = Depends(get_current_user),
+):
+    """Delete many skills of the current user at once, reporting the failing IDs"""
+    return await bulk_delete_skills(body.ids, current_user.id, db)
+
+
 @router.get("/skills/{skill_id}", response_model=SkillSchema)
-async def get_skill(skill_id: int, db: Session = Depends(database.get_db_session)):
+async def get_skill(
+    skill_id: int, db: AsyncSession = Depends(database.get_async_db_session)
+):
     """Retrieve details of a specific skill by its ID"""
     skill = await get_skill_by_id(skill_id, db)
     return skill
@@ -38,7 +97,7 @@ async def get_skill(skill_id: int, db: Session = Depends(database.get_db_session
 
 @router.get("/skills/category/{skill_category_id}", response_model=List[SkillSchema])
 async def get_skills_sorted_by_category(
-    skill_category_id: int, db: Session = Depends(database.get_db_session)
+    skill_category_id: int, db: AsyncSession = Depends(database.get_async_db_session)
 ):
     """Retrieve skills by category ID"""
     skills = await get_skills_by_category(skill_category_id, db)
@@ -47,7 +106,7 @@ async def get_skills_sorted_by_category(
 
 @router.post("/skills", response_model=CreateSkillResponse)
 async def create_new_skill(
-    skill: SkillSchema, db: Session = Depends(database.get_db_session)
+    skill: SkillSchema, db: AsyncSession = Depends(database.get_async_db_session)
 ):
     """Create a new skill"""
     new_skill = await create_skill(skill, db)
@@ -56,7 +115,9 @@ async def create_new_skill(
 
 @router.put("/skills/{skill_id}", response_model=UpdateSkillResponse)
 async def update_skill_details(
-    skill_id: int, skill: SkillSchema, db: Session = Depends(database.get_db_session)
+    skill_id: int,
+    skill: SkillSchema,
+    db: AsyncSession = Depends(database.get_async_db_session),
 ):
     """Update an existing skill"""
     updated_skill = await update_skill(skill_id, skill, db)
@@ -65,7 +126,7 @@ async def update_skill_details(
 
 @router.delete("/skills/{skill_id}", response_model=DeleteSkillResponse)
 async def delete_skill_by_id(
-    skill_id: int, db: Session = Depends(database.get_db_session)
+    skill_id: int, db: AsyncSession = Depends(database.get_async_db_session)
 ):
     """Delete a skill"""
     deleted_skill = await delete_skill(skill_id, db)
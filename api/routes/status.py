@@ -0,0 +1,37 @@
+"""
+API endpoints for inspecting the state of the running worker
+"""
+
+import os
+
+from fastapi import APIRouter, Depends
+
+from api.cache import response_cache
+from api.db import database
+from api.schemas.status import CacheStatusResponse, PoolStatusResponse
+from api.schemas.user import UserSchema
+from api.security import get_current_user
+
+router = APIRouter(prefix="/status", tags=["Status"])
+
+
+@router.get("/pool", response_model=PoolStatusResponse)
+async def pool_status(current_user: UserSchema = Depends(get_current_user)):
+    """
+    Report live connection pool usage of the worker that serves the request.
+
+    Each gunicorn worker owns its own pools, so the numbers describe a single
+    worker process, identified by ``pid``.
+    """
+    return {"pid": os.getpid(), **database.pool_status()}
+
+
+@router.get("/cache", response_model=CacheStatusResponse)
+async def cache_status(current_user: UserSchema = Depends(get_current_user)):
+    """
+    Report response cache counters of the worker that serves the request.
+
+    Hits and misses are counted per worker process, identified by ``pid``, even
+    when the entries themselves live in a shared Redis.
+    """
+    return {"pid": os.getpid(), **response_cache.stats()}
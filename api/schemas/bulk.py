@@ -0,0 +1,36 @@
+from typing import Generic, List, Optional, TypeVar
+
+from pydantic import BaseModel
+
+T = TypeVar("T")
+
+
+class BulkItemError(BaseModel):
+    """A Pydantic model for representing an item of a bulk request that failed."""
+
+    index: int
+    id: Optional[int] = None
+    status_code: int
+    detail: str
+
+
+class BulkResponse(BaseModel, Generic[T]):
+    """A Pydantic model for representing the response after a bulk create or update."""
+
+    message: str
+    items: List[T]
+    errors: List[BulkItemError]
+
+
+class BulkDeleteRequest(BaseModel):
+    """A Pydantic model for representing the IDs of a bulk delete request."""
+
+    ids: List[int]
+
+
+class BulkDeleteResponse(BaseModel):
+    """A Pydantic model for representing the response after a bulk delete."""
+
+    message: str
+    deleted_ids: List[int]
+    errors: List[BulkItemError]
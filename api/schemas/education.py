@@ -3,6 +3,8 @@ from typing import Optional, List
 
 from pydantic import BaseModel, field_validator, Field
 
+from src.db.models import split_tags
+
 
 class EducationInfoResponse(BaseModel):
     """A Pydantic model for representing education information."""
@@ -35,9 +37,7 @@ class CertificationInfoResponse(BaseModel):
 
     # Convert comma-separated string, which is defined in database, to list of strings for better representation
     _convert_skills_acquired = field_validator("skills_acquired", mode="before")(
-        lambda v: (
-            [skill.strip() for skill in str(v).split(",")] if isinstance(v, str) else v
-        )
+        lambda v: split_tags(v) if isinstance(v, str) else v
     )
 
     class Config:
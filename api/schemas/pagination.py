@@ -0,0 +1,13 @@
+from typing import Generic, List, Optional, TypeVar
+
+from pydantic import BaseModel
+
+T = TypeVar("T")
+
+
+class Page(BaseModel, Generic[T]):
+    """A Pydantic model for representing a single page of a collection."""
+
+    items: List[T]
+    limit: int
+    next_cursor: Optional[str] = None
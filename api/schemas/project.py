@@ -19,6 +19,7 @@ class ProjectSchema(BaseModel):
     id: Optional[int]
     user_id: int
     title: str
+    slug: Optional[str] = None
     description: str
     tech_stack: str
     url: str
@@ -0,0 +1,19 @@
+from typing import List, Literal
+
+from pydantic import BaseModel
+
+
+class SearchResult(BaseModel):
+    """A Pydantic model for representing a single search hit."""
+
+    type: Literal["project", "certification"]
+    id: int
+    title: str
+    rank: float
+
+
+class SearchResponse(BaseModel):
+    """A Pydantic model for representing the ranked results of a search."""
+
+    query: str
+    results: List[SearchResult]
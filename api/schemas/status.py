@@ -0,0 +1,42 @@
+from typing import Optional
+
+from pydantic import BaseModel, Field
+
+
+class PoolUsage(BaseModel):
+    """A Pydantic model for representing the usage of a connection pool."""
+
+    status: str
+    size: int
+    checked_in: int
+    checked_out: int
+    overflow: int
+    max_overflow: int
+    timeout: float
+    waits: int
+    wait_time: float
+    timeouts: int
+
+
+class PoolStatusResponse(BaseModel):
+    """A Pydantic model for representing the connection pools of a worker process."""
+
+    pid: int
+    sync: PoolUsage
+    async_: PoolUsage = Field(alias="async")
+
+    class Config:
+        populate_by_name = True
+
+
+class CacheStatusResponse(BaseModel):
+    """A Pydantic model for representing the response cache of a worker process."""
+
+    pid: int
+    backend: str
+    ttl: int
+    hits: int
+    misses: int
+    invalidations: int
+    errors: int
+    entries: Optional[int]
@@ -0,0 +1,17 @@
+from pydantic import BaseModel
+
+
+class TokenResponse(BaseModel):
+    """A Pydantic model for representing an issued access and refresh token pair."""
+
+    access_token: str
+    token_type: str = "bearer"
+    expires_in: float
+    refresh_token: str
+    refresh_expires_in: float
+
+
+class RefreshTokenRequest(BaseModel):
+    """A Pydantic model for representing a refresh token submitted by a client."""
+
+    refresh_token: str
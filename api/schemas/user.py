@@ -0,0 +1,14 @@
+from pydantic import BaseModel
+
+
+class UserSchema(BaseModel):
+    """A Pydantic model for representing the authenticated user."""
+
+    id: int
+    name: str
+    email: str
+    is_admin: bool
+
+    class Config:
+        from_attributes = True
+        frozen = True
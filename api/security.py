@@ -1,5 +1,11 @@
+import asyncio
+import hashlib
 import os
-from functools import wraps
+import time
+import uuid
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, Optional
 
 from dotenv import load_dotenv
 from fastapi import Depends, HTTPException
@@ -8,11 +14,15 @@ from fastapi.security import OAuth2PasswordBearer
 from jose import jwt
 from jose.exceptions import JWTError
 from passlib.context import CryptContext
-from sqlalchemy.orm import Session
+from sqlalchemy.ext.asyncio import AsyncSession
 from werkzeug.security import check_password_hash
 
 from api.db import database
+from api.schemas.user import UserSchema
+from api.throttle import LoginThrottle
+from config import env_config
 from logging_setup import api_logger
+from src.db.events import models_committed
 from src.db.models import User
 
 load_dotenv()
@@ -21,6 +31,9 @@ load_dotenv()
 SECRET_KEY = os.getenv("SECRET_KEY")
 ALGORITHM = "HS256"
 
+# Value of the "typ" claim of refresh tokens, which are not valid access tokens
+REFRESH_TOKEN_TYPE = "refresh"
+
 # Initialize the password hashing context
 pwd_context = CryptContext(schemes=["scrypt"], deprecated="auto")
 
@@ -28,6 +41,207 @@ pwd_context = CryptContext(schemes=["scrypt"], deprecated="auto")
 oauth2_scheme = OAuth2PasswordBearer(tokenUrl="token")
 
 
+class TokenCache:
+    """
+    Cache of verified access tokens and the users they belong to.
+
+    Entries are keyed by the SHA-256 digest of the token, so raw tokens are never
+    kept in memory, and live until the token's ``exp`` but no longer than ``ttl``
+    seconds. A token served from the cache skips both the signature verification
+    and the user lookup. The ``ttl`` bounds how long a user changed outside this
+    process (e.g. in the admin panel) keeps being served from the cache.
+
+    """
+
+    def __init__(self, ttl: int, max_entries: int):
+        """
+        Initialize the cache.
+
+        Args:
+            ttl (int): The maximum lifetime of an entry in seconds, 0 disables the cache.
+            max_entries (int): The maximum number of cached tokens.
+        """
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self.entries: OrderedDict[bytes, tuple[float, dict, UserSchema]] = OrderedDict()
+
+    @staticmethod
+    def key(token: str) -> bytes:
+        return hashlib.sha256(token.encode()).digest()
+
+    def get(self, token: str) -> Optional[tuple[dict, UserSchema]]:
+        """
+        Look up a verified token.
+
+        Args:
+            token (str): The raw access token.
+
+        Returns:
+            tuple[dict, UserSchema], optional: The claims and the user of the token,
+                or None if it is not cached or has expired.
+        """
+        key = self.key(token)
+        entry = self.entries.get(key)
+        if entry is None:
+            return None
+        expires_at, claims, user = entry
+        if expires_at <= time.time():
+            del self.entries[key]
+            return None
+        self.entries.move_to_end(key)
+        return claims, user
+
+    def set(self, token: str, claims: dict, user: UserSchema) -> None:
+        """
+        Store a verified token.
+
+        Args:
+            token (str): The raw access token.
+            claims (dict): The decoded claims of the token.
+            user (UserSchema): The user the token belongs to.
+        """
+        if not self.ttl:
+            return
+        expires_at = time.time() + self.ttl
+        if "exp" in claims:
+            expires_at = min(expires_at, float(claims["exp"]))
+        self.entries[self.key(token)] = (expires_at, claims, user)
+        self.entries.move_to_end(self.key(token))
+        while len(self.entries) > self.max_entries:
+            self.entries.popitem(last=False)
+
+    def invalidate_users(self, user_ids) -> None:
+        """
+        Drop the cached tokens of the given users.
+
+        Args:
+            user_ids (Iterable[int]): The IDs of the users whose rows have changed.
+        """
+        user_ids = set(user_ids)
+        for key in [k for k, entry in self.entries.items() if entry[2].id in user_ids]:
+            del self.entries[key]
+
+
+_auth_config = env_config[os.getenv("FAST_ENV", "development")]
+ACCESS_TOKEN_TTL = _auth_config.ACCESS_TOKEN_TTL
+token_cache = TokenCache(
+    _auth_config.AUTH_CACHE_TTL, _auth_config.AUTH_CACHE_MAX_ENTRIES
+)
+
+
+@models_committed.connect_via(User)
+def invalidate_user_tokens(sender, ids, **kwargs):
+    """Drop cached tokens of users whose rows were updated or deleted."""
+    token_cache.invalidate_users(ids)
+
+
+class RevokedTokens:
+    """
+    Bounded in-process set of revoked refresh token IDs or token families.
+
+    Lets a worker reject a refresh token it has already seen revoked without a
+    database round trip. Entries are kept until the token would have expired
+    anyway. The set is only a fast path: the ``refresh_tokens`` table stays the
+    source of truth, so a miss here is always followed by a database check.
+
+    """
+
+    def __init__(self, max_entries: int):
+        """
+        Initialize the set.
+
+        Args:
+            max_entries (int): The maximum number of remembered IDs.
+        """
+        self.max_entries = max_entries
+        self.entries: OrderedDict[str, float] = OrderedDict()
+
+    def __contains__(self, key: str) -> bool:
+        expires_at = self.entries.get(key)
+        if expires_at is None:
+            return False
+        if expires_at <= time.time():
+            del self.entries[key]
+            return False
+        return True
+
+    def add(self, key: str, expires_at: float) -> None:
+        """
+        Remember a revoked ID.
+
+        Args:
+            key (str): The token ID or the token family ID.
+            expires_at (float): The UNIX time after which the token expires anyway.
+        """
+        self.entries[key] = expires_at
+        self.entries.move_to_end(key)
+        while len(self.entries) > self.max_entries:
+            self.entries.popitem(last=False)
+
+
+revoked_refresh_tokens = RevokedTokens(_auth_config.REFRESH_REVOKED_CACHE_SIZE)
+revoked_token_families = RevokedTokens(_auth_config.REFRESH_REVOKED_CACHE_SIZE)
+
+
+# Password hashing (scrypt) runs in a small dedicated pool, off the event loop, and
+# the number of hashes running or waiting is capped so a burst of logins cannot
+# take all the CPU away from regular API traffic
+password_executor = ThreadPoolExecutor(
+    max_workers=_auth_config.AUTH_HASH_WORKERS, thread_name_prefix="password-hash"
+)
+password_slots = asyncio.Semaphore(_auth_config.AUTH_HASH_MAX_PENDING)
+
+login_throttle = LoginThrottle(
+    window=_auth_config.AUTH_THROTTLE_WINDOW,
+    max_account_failures=_auth_config.AUTH_MAX_FAILURES_PER_ACCOUNT,
+    max_ip_attempts=_auth_config.AUTH_MAX_ATTEMPTS_PER_IP,
+)
+
+
+async def run_in_password_pool(func: Callable, *args):
+    """
+    Run a password hashing function in the password hashing pool.
+
+    Args:
+        func (Callable): The function to run, e.g. ``verify_password``.
+        *args: The arguments of the function.
+
+    Returns:
+        The result of the function.
+
+    Raises:
+        HTTPException: 503 if the pool stays saturated for ``AUTH_HASH_WAIT`` seconds.
+    """
+    try:
+        await asyncio.wait_for(password_slots.acquire(), _auth_config.AUTH_HASH_WAIT)
+    except asyncio.TimeoutError:
+        api_logger.warning("Password hashing pool saturated")
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail="Authentication is busy, try again later",
+            headers={"Retry-After": "1"},
+        )
+    try:
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(password_executor, func, *args)
+    finally:
+        password_slots.release()
+
+
+async def verify_password_async(plain_password, hashed_password) -> bool:
+    """
+    Verify a plain password against a hashed password without blocking the event loop.
+
+    Args:
+        plain_password (str): The plain text password to verify.
+        hashed_password (str): The hashed password to compare against.
+
+    Returns:
+        bool: True if the password matches the hash, False otherwise.
+    """
+    return await run_in_password_pool(verify_password, plain_password, hashed_password)
+
+
 def verify_password(plain_password, hashed_password):
     """
     Verify a plain password against a hashed password.
@@ -69,88 +283,30 @@ class AuthorizationError(HTTPException):
         super().__init__(status_code=status_code, detail=detail, headers=headers)
 
 
-def check_authorization(
-    resource_model,
-    unauthorized_message: str = "Unauthorized to access this resource",
-):
-    """
-    Decorator to check if the current user is authorized to access a resource.
-
-    Args:
-    - resource_model (type): The model type of the resource.
-    - unauthorized_message (str): The unauthorized error message.
-
-    Returns:
-    - function: A decorator that checks if the current user is authorized to access the resource.
-    """
-
-    def decorator(func):
-        """
-        Decorator function to check if the current user is authorized to access a resource.
-        """
-
-        @wraps(func)
-        async def wrapper(
-            *args,
-            db: Session = Depends(database.get_db_session),
-            current_user: User = Depends(get_current_user),
-            **kwargs,
-        ):
-            """
-            Wrapper function that checks if the current user is authorized to access a resource.
-            """
-            # Retrieve the resource from the database
-            resource_id = kwargs.get("id")
-            if resource_id is None:
-                api_logger.error("Resource ID not provided")
-                raise HTTPException(status_code=400, detail="Resource ID not provided")
-
-            resource = (
-                db.query(resource_model)
-                .filter(resource_model.id == resource_id)
-                .first()
-            )
-
-            # Check if the user is authenticated
-            if not current_user or not current_user.id:
-                api_logger.error("User not authenticated")
-                raise HTTPException(status_code=401, detail="Invalid user credentials")
-
-            # Check if the resource exists
-            if not resource:
-                api_logger.error(f"{resource_model.__name__} not found")
-                raise HTTPException(
-                    status_code=404, detail=f"{resource_model.__name__} not found"
-                )
-
-            # Check if the current user is authorized
-            if resource.user_id != current_user.id:
-                api_logger.error(unauthorized_message)
-                raise HTTPException(status_code=403, detail=unauthorized_message)
-
-            return await func(*args, **kwargs)
-
-        return wrapper
-
-    return decorator
-
-
 async def get_current_user(
-    token: str = Depends(oauth2_scheme), db: Session = Depends(database.get_db_session)
-) -> User:
+    token: str = Depends(oauth2_scheme),
+    db: AsyncSession = Depends(database.get_async_db_session),
+) -> UserSchema:
     """
     Retrieve the current user from the provided token.
 
+    Tokens seen before are answered from ``token_cache`` without verifying the
+    signature again or querying the database.
+
     Args:
         token (str): The OAuth2 access token.
-        db (Session): The database session.
+        db (AsyncSession): The database session.
 
     Returns:
-        User: The user instance associated with the token.
+        UserSchema: The user associated with the token.
 
     Raises:
         HTTPException: If the token is invalid or the user does not exist.
     """
+    cached = token_cache.get(token)
+    if cached is not None:
+        return cached[1]
+
     # Define the exception to be raised for invalid credentials
     credentials_exception = HTTPException(
         status_code=status.HTTP_401_UNAUTHORIZED,
@@ -162,7 +318,7 @@ async def get_current_user(
         payload = jwt.decode(token, SECRET_KEY, algorithms=[ALGORITHM])
         # Extract user ID from the token payload
         user_id: str = payload.get("sub")
-        if user_id is None:
+        if user_id is None or payload.get("typ") == REFRESH_TOKEN_TYPE:
             api_logger.error("Invalid token payload")
             raise credentials_exception
     except JWTError:
@@ -171,14 +327,16 @@ async def get_current_user(
         raise credentials_exception
 
     # Query the database to find the user by ID
-    user = db.query(User).filter(User.id == user_id).first()
+    user = await db.get(User, int(user_id))
     if user is None:
         api_logger.error("User not found")
         # Raise an exception if the user does not exist
         raise credentials_exception
 
-    # Return the user instance if found
-    return user
+    # Cache the verified token together with the user it belongs to
+    current_user = UserSchema.model_validate(user)
+    token_cache.set(token, payload, current_user)
+    return current_user
 
 
 def create_access_token(data: dict) -> str:
@@ -194,3 +352,59 @@ def create_access_token(data: dict) -> str:
     token = jwt.encode(data, SECRET_KEY, algorithm=ALGORITHM)
     api_logger.info("Access token created")
     return token
+
+
+def create_refresh_token(
+    user_id: int, family_id: Optional[str] = None
+) -> tuple[dict, str]:
+    """
+    Create a new signed refresh token.
+
+    Args:
+        user_id (int): The ID of the user the token is issued to.
+        family_id (str, optional): The family of the token being rotated.
+            A new family is started when omitted, i.e. on login.
+
+    Returns:
+        tuple[dict, str]: The claims and the encoded JWT refresh token.
+    """
+    claims = {
+        "sub": str(user_id),
+        "typ": REFRESH_TOKEN_TYPE,
+        "jti": uuid.uuid4().hex,
+        "fam": family_id or uuid.uuid4().hex,
+        "exp": int(time.time()) + _auth_config.REFRESH_TOKEN_TTL,
+    }
+    return claims, jwt.encode(claims, SECRET_KEY, algorithm=ALGORITHM)
+
+
+def decode_refresh_token(token: str) -> dict:
+    """
+    Verify the signature and expiry of a refresh token.
+
+    Only the token itself is checked, whether it has been rotated or revoked is
+    up to the caller.
+
+    Args:
+        token (str): The encoded JWT refresh token.
+
+    Returns:
+        dict: The claims of the token.
+
+    Raises:
+        HTTPException: If the token is invalid, expired or not a refresh token.
+    """
+    try:
+        claims = jwt.decode(token, SECRET_KEY, algorithms=[ALGORITHM])
+    except JWTError:
+        claims = {}
+    if claims.get("typ") != REFRESH_TOKEN_TYPE or not all(
+        claims.get(claim) for claim in ("sub", "jti", "fam")
+    ):
+        api_logger.error("Invalid refresh token")
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="Invalid refresh token",
+            headers={"WWW-Authenticate": "Bearer"},
+        )
+    return claims
@@ -0,0 +1,90 @@
+"""
+NDJSON streaming of whole collections
+
+List endpoints called with ``?format=ndjson`` return every row as one JSON
+document per line instead of a page. Rows are fetched from a server-side cursor
+in batches of ``STREAM_BATCH_SIZE`` and serialized one at a time while the
+response is being sent, so neither the result set nor the encoded body is ever
+held in memory as a whole.
+
+The rows are read in a session of their own: the request's session dependency
+is closed before a streaming body is sent.
+
+"""
+
+from typing import AsyncIterator
+
+from fastapi.responses import StreamingResponse
+from pydantic import BaseModel
+from sqlalchemy import Select
+
+from api.db import database
+from logging_setup import api_logger
+
+NDJSON_MEDIA_TYPE = "application/x-ndjson"
+
+# Number of rows fetched from the server-side cursor at a time
+STREAM_BATCH_SIZE = 500
+
+# Size in bytes above which the encoded rows are handed to the server
+STREAM_CHUNK_SIZE = 16 * 1024
+
+
+async def stream_scalars(statement: Select) -> AsyncIterator:
+    """
+    Stream the ORM instances selected by a statement from a server-side cursor.
+
+    Args:
+        statement (Select): The select statement. Its loader options must be
+            compatible with ``yield_per``, i.e. no joined eager loading of
+            collections.
+
+    Yields:
+        The selected instances, one at a time.
+    """
+    async with database.async_session_scope() as session:
+        result = await session.stream_scalars(
+            statement.execution_options(yield_per=STREAM_BATCH_SIZE)
+        )
+        async for instance in result:
+            yield instance
+
+
+async def _encode_lines(
+    instances: AsyncIterator, schema: type[BaseModel]
+) -> AsyncIterator[bytes]:
+    chunk = bytearray()
+    count = 0
+    async for instance in instances:
+        chunk += (
+            schema.model_validate(instance, from_attributes=True)
+            .model_dump_json()
+            .encode()
+        )
+        chunk += b"\n"
+        count += 1
+        # Send a few rows per message instead of one ASGI message per row
+        if len(chunk) >= STREAM_CHUNK_SIZE:
+            yield bytes(chunk)
+            chunk.clear()
+    if chunk:
+        yield bytes(chunk)
+    api_logger.info(f"{schema.__name__} stream. Status: {count} rows sent")
+
+
+def ndjson_response(
+    instances: AsyncIterator, schema: type[BaseModel]
+) -> StreamingResponse:
+    """
+    Build a streaming NDJSON response from ORM instances.
+
+    Args:
+        instances (AsyncIterator): The instances to send, e.g. from ``stream_scalars``.
+        schema (type[BaseModel]): The schema every instance is serialized with.
+
+    Returns:
+        StreamingResponse: The response sending one JSON document per line.
+    """
+    return StreamingResponse(
+        _encode_lines(instances, schema), media_type=NDJSON_MEDIA_TYPE
+    )
@@ -0,0 +1,170 @@
+"""
+Login attempt throttling
+
+Attempts are counted in a sliding window per client IP (every attempt) and per
+account (failed attempts only, so a user who logs in successfully is not held
+back by earlier typos). A key that exceeds its limit is rejected with
+``429 Too Many Requests`` before any database lookup or password hashing.
+
+Counters are kept per worker process, so the effective limits scale with the
+number of workers.
+
+"""
+
+import time
+from collections import deque
+
+from fastapi import HTTPException, status
+
+from logging_setup import api_logger
+
+
+class SlidingWindowCounter:
+    """
+    Count events per key over the last ``window`` seconds.
+
+    The number of tracked keys is bounded; once ``max_keys`` is reached the key
+    that was recorded first is forgotten.
+
+    """
+
+    def __init__(self, window: int, max_keys: int = 10_000):
+        """
+        Initialize the counter.
+
+        Args:
+            window (int): The length of the window in seconds.
+            max_keys (int): The maximum number of keys to track.
+        """
+        self.window = window
+        self.max_keys = max_keys
+        self.events: dict[str, deque[float]] = {}
+
+    def _prune(self, key: str, now: float) -> deque[float]:
+        events = self.events.get(key)
+        if events is None:
+            return deque()
+        while events and events[0] <= now - self.window:
+            events.popleft()
+        if not events:
+            del self.events[key]
+        return events
+
+    def count(self, key: str) -> int:
+        """
+        Return the number of events recorded for a key within the window.
+
+        Args:
+            key (str): The key to count.
+
+        Returns:
+            int: The number of events.
+        """
+        return len(self._prune(key, time.monotonic()))
+
+    def retry_after(self, key: str) -> int:
+        """
+        Return the number of seconds until the oldest event of a key leaves the window.
+
+        Args:
+            key (str): The key to check.
+
+        Returns:
+            int: The number of seconds, at least 1.
+        """
+        events = self._prune(key, time.monotonic())
+        if not events:
+            return 1
+        return max(1, int(events[0] + self.window - time.monotonic()) + 1)
+
+    def add(self, key: str) -> None:
+        """
+        Record an event for a key.
+
+        Args:
+            key (str): The key to record the event for.
+        """
+        now = time.monotonic()
+        events = self._prune(key, now)
+        if key not in self.events:
+            if len(self.events) >= self.max_keys:
+                self.events.pop(next(iter(self.events)))
+            self.events[key] = events
+        events.append(now)
+
+    def reset(self, key: str) -> None:
+        """
+        Forget the events of a key.
+
+        Args:
+            key (str): The key to forget.
+        """
+        self.events.pop(key, None)
+
+
+class LoginThrottle:
+    """
+    Per-IP and per-account limits for login attempts.
+
+    """
+
+    def __init__(self, window: int, max_account_failures: int, max_ip_attempts: int):
+        """
+        Initialize the throttle.
+
+        Args:
+            window (int): The length of the sliding window in seconds.
+            max_account_failures (int): Failed attempts allowed per account.
+            max_ip_attempts (int): Attempts allowed per client IP.
+        """
+        self.max_account_failures = max_account_failures
+        self.max_ip_attempts = max_ip_attempts
+        self.account_failures = SlidingWindowCounter(window)
+        self.ip_attempts = SlidingWindowCounter(window)
+
+    def check(self, account: str, ip: str) -> None:
+        """
+        Record a login attempt and reject it if a limit is exceeded.
+
+        Args:
+            account (str): The account (email) the attempt is for.
+            ip (str): The client IP address.
+
+        Raises:
+            HTTPException: 429 with a ``Retry-After`` header if the client IP or
+                the account has exceeded its limit.
+        """
+        account = account.strip().lower()
+        if self.ip_attempts.count(ip) >= self.max_ip_attempts:
+            api_logger.warning(f"Login throttled for IP {ip}")
+            self._reject(self.ip_attempts.retry_after(ip))
+        if self.account_failures.count(account) >= self.max_account_failures:
+            api_logger.warning(f"Login throttled for account {account}")
+            self._reject(self.account_failures.retry_after(account))
+        self.ip_attempts.add(ip)
+
+    def record_failure(self, account: str) -> None:
+        """
+        Record a failed login for an account.
+
+        Args:
+            account (str): The account (email) the attempt was for.
+        """
+        self.account_failures.add(account.strip().lower())
+
+    def record_success(self, account: str) -> None:
+        """
+        Clear the failed logins of an account after a successful login.
+
+        Args:
+            account (str): The account (email) that logged in.
+        """
+        self.account_failures.reset(account.strip().lower())
+
+    @staticmethod
+    def _reject(retry_after: int) -> None:
+        raise HTTPException(
+            status_code=status.HTTP_429_TOO_MANY_REQUESTS,
+            detail="Too many login attempts, try again later",
+            headers={"Retry-After": str(retry_after)},
+        )
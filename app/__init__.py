@@ -3,9 +3,10 @@ import os
 from dotenv import load_dotenv
 from flask import Flask
 
-from config import env_config
+from config import engine_options, env_config
 from .admin import init_admin  # Import init_admin function
 from .auth import init_login_manager
+from .compression import init_compression
 from .db import init_db  # Import init_db function
 from .mail import init_mail  # Import init_mail function
 
@@ -21,6 +22,7 @@ def create_app():
     # Dynamically load environment config
     env = os.getenv("FLASK_ENV", "development")  # Default to 'development'
     app.config.from_object(env_config[env])
+    app.config.setdefault("SQLALCHEMY_ENGINE_OPTIONS", engine_options(env_config[env]))
 
     # Initialize the database with the app
     init_db(app)  # Use init_db function to initialize the database
@@ -34,6 +36,9 @@ def create_app():
     # Initialize the login manager
     init_login_manager(app)
 
+    # Compress responses
+    init_compression(app)
+
     # Import and register routes
     from .views import main
     from .auth import auth_bp  # Import auth blueprint
@@ -41,4 +46,9 @@ def create_app():
     app.register_blueprint(main)
     app.register_blueprint(auth_bp, url_prefix="/auth")
 
+    # Rebuild the static site after admin writes, if enabled
+    from .static_site import init_static_site
+
+    init_static_site(app)
+
     return app
@@ -1,9 +1,17 @@
-from flask import flash
+import base64
+import binascii
+import json
+from datetime import date
+
+from flask import current_app, flash, g, request
 from flask_admin import Admin
 from flask_admin.contrib.sqla import ModelView
 from flask_login import current_user
+from sqlalchemy import UniqueConstraint, inspect, tuple_
 from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import selectinload
 
+from logging_setup import app_logger
 from src.db.models import (
     User,
     Project,
@@ -17,6 +25,8 @@ from src.db.models import (
     Resume,
     Certification,
 )
+from .choices import list_select_field
+from .counts import CachedCountQuery
 from .db import database as db
 from .forms import (
     SkillForm,
@@ -48,17 +58,227 @@ class AdminModelView(ModelView):
     Base class for all admin views. Checks if the current user is authenticated
     and has admin privileges.
 
+    The list query loads every relationship shown in the list view with the
+    page: Flask-Admin joins the many-to-one ones and the collections are loaded
+    with one ``SELECT ... IN`` per page. The total row count of an unfiltered
+    list comes from ``row_counts`` instead of a ``COUNT(*)`` per page view.
+
     Attributes:
         column_list (tuple): List of column names to display in the list view.
         column_filters (tuple): List of column names to filter by in the list view.
     """
 
+    def __init__(self, model, session, *args, **kwargs):
+        super().__init__(model, session, *args, **kwargs)
+        relationships = inspect(self.model).relationships
+        self._collection_loads = [
+            selectinload(relationships[name].class_attribute)
+            for name, _ in self._list_columns
+            if name in relationships and relationships[name].uselist
+        ]
+
     def is_accessible(self):
         # Check if the current user is authenticated and has admin privileges
         return current_user.is_authenticated and current_user.is_admin
 
+    def get_query(self):
+        """
+        Return the list query, loading the collections shown in the list view.
+
+        Returns:
+            Query: A SQLAlchemy query object.
+        """
+        return super().get_query().options(*self._collection_loads)
+
+    def get_count_query(self):
+        """
+        Return the count query, answered from the row count cache when the list
+        is neither searched nor filtered.
+
+        Returns:
+            CachedCountQuery: The count query wrapped by the cache.
+        """
+        return CachedCountQuery(self.model, super().get_count_query())
+
+
+class KeysetPaginationMixin:
+    """
+    Mixin for ``AdminModelView`` subclasses that pages the list view by key.
+
+    Flask-Admin pages with ``LIMIT/OFFSET``, which reads and discards every row
+    before the requested page. This mixin orders the list by ``(sort column,
+    id)`` and fetches the next page with ``WHERE (sort column, id) > (last
+    row)``, an index range scan that costs the same on any page. The pager shows
+    previous/next links carrying the key of the first or last row
+    (``?before=`` / ``?after=``) instead of page numbers.
+
+    Only indexed, non-null columns of the model's own table can be keys. Once
+    the table holds more than ``ADMIN_INDEXED_SORT_ROWS`` rows, the list can
+    only be sorted by them. Below that, other sorts still page by offset.
 
-class SkillModelView(ModelView):
+    Attributes:
+        list_template (str): The list template rendering the keyset pager.
+    """
+
+    list_template = "admin/keyset_list.html"
+
+    def __init__(self, model, session, *args, **kwargs):
+        super().__init__(model, session, *args, **kwargs)
+        mapper = inspect(self.model)
+        table = self.model.__table__
+        leading = {list(index.columns)[0] for index in table.indexes}
+        leading |= {
+            list(constraint.columns)[0]
+            for constraint in table.constraints
+            if isinstance(constraint, UniqueConstraint) and constraint.columns
+        }
+        self._keyset_columns = {
+            name: column
+            for name, column in self._sortable_columns.items()
+            if column in leading and not column.nullable
+        }
+        self._keyset_columns[self._primary_key] = mapper.columns[self._primary_key]
+
+    def _indexed_sort_only(self) -> bool:
+        # Asked once per column by the list template, the count of the whole
+        # table is only taken once per request (see CachedCountQuery)
+        limit = current_app.config["ADMIN_INDEXED_SORT_ROWS"]
+        return self.get_count_query().scalar() > limit
+
+    def is_sortable(self, name):
+        if self._indexed_sort_only():
+            return name in self._keyset_columns
+        return super().is_sortable(name)
+
+    def _get_list_extra_args(self):
+        # Sorting, filtering or resizing a page starts over from the first page
+        view_args = super()._get_list_extra_args()
+        view_args.extra_args.pop("after", None)
+        view_args.extra_args.pop("before", None)
+        return view_args
+
+    def _encode_key(self, row, columns) -> str:
+        values = [getattr(row, column.key) for column in columns]
+        raw = json.dumps(values, default=str, separators=(",", ":")).encode()
+        return base64.urlsafe_b64encode(raw).decode().rstrip("=")
+
+    def _decode_key(self, cursor: str, columns):
+        try:
+            padded = cursor + "=" * (-len(cursor) % 4)
+            values = json.loads(base64.urlsafe_b64decode(padded))
+            if len(values) != len(columns):
+                raise ValueError(cursor)
+            return [
+                column.type.python_type.fromisoformat(value)
+                if issubclass(column.type.python_type, date)
+                else column.type.python_type(value)
+                for column, value in zip(columns, values)
+            ]
+        except (ValueError, TypeError, binascii.Error):
+            app_logger.warning(f"Invalid admin list cursor: {cursor}")
+            return None
+
+    def get_list(
+        self,
+        page,
+        sort_column,
+        sort_desc,
+        search,
+        filters,
+        execute=True,
+        page_size=None,
+    ):
+        """
+        Return the count and the rows of a list page, paged by key.
+
+        Args:
+            page (int): The page number, only used when paging by offset.
+            sort_column (str): The name of the column to sort by, or None.
+            sort_desc (bool): Whether to sort in descending order.
+            search (str): The search query.
+            filters (list): The active filters.
+            execute (bool): Whether to run the query or return it.
+            page_size (int): The number of rows per page.
+
+        Returns:
+            tuple: The number of rows and the rows of the page.
+        """
+        if sort_column is not None and sort_column not in self._keyset_columns:
+            if not self._indexed_sort_only():
+                return super().get_list(
+                    page, sort_column, sort_desc, search, filters, execute, page_size
+                )
+            sort_column, sort_desc = None, False
+        if sort_column is None and isinstance(self.column_default_sort, (str, tuple)):
+            default = self.column_default_sort
+            name, desc = (default, False) if isinstance(default, str) else default
+            if name in self._keyset_columns:
+                sort_column, sort_desc = name, desc
+        if page_size is None:
+            page_size = self.page_size
+        if not execute or not page_size:
+            return super().get_list(
+                page, sort_column, sort_desc, search, filters, execute, page_size
+            )
+
+        count, query = super().get_list(
+            None, None, False, search, filters, execute=False, page_size=False
+        )
+        pk = self._keyset_columns[self._primary_key]
+        column = self._keyset_columns.get(sort_column, pk)
+        columns = [pk] if column is pk else [column, pk]
+
+        backwards = "before" in request.args
+        cursor = request.args.get("before" if backwards else "after")
+        key = self._decode_key(cursor, columns) if cursor else None
+        descending = bool(sort_desc) != backwards
+        if key is not None:
+            row_key, cursor_key = tuple_(*columns), tuple_(*key)
+            query = query.filter(
+                row_key < cursor_key if descending else row_key > cursor_key
+            )
+        query = query.order_by(None).order_by(
+            *(column.desc() if descending else column for column in columns)
+        )
+
+        # One extra row tells whether there is a page after this one
+        rows = query.limit(page_size + 1).all()
+        more = len(rows) > page_size
+        rows = rows[:page_size]
+        if backwards:
+            rows.reverse()
+        has_previous = more if backwards else key is not None
+        has_next = key is not None if backwards else more
+        g.keyset_cursors = (
+            self._encode_key(rows[0], columns) if rows and has_previous else None,
+            self._encode_key(rows[-1], columns) if rows and has_next else None,
+        )
+        return count, rows
+
+    def get_keyset_pager(self):
+        """
+        Return the URLs of the pages around the listed one.
+
+        Returns:
+            tuple | None: The URL of the previous and of the next page, each
+                None if there is no such page, or None if the list was not
+                paged by key.
+        """
+        cursors = g.get("keyset_cursors")
+        if cursors is None:
+            return None
+        view_args = self._get_list_extra_args()
+
+        def url(arg, cursor):
+            if cursor is None:
+                return None
+            extra_args = {**view_args.extra_args, arg: cursor}
+            return self._get_list_url(view_args.clone(page=None, extra_args=extra_args))
+
+        return url("before", cursors[0]), url("after", cursors[1])
+
+
+class SkillModelView(AdminModelView):
     """
     Admin view for the Skill model.
 
@@ -78,6 +298,7 @@ class SkillModelView(ModelView):
     column_list = ("skill_name", "skill_category", "proficiency_level", "created_at")
     column_filters = ("skill_name", "skill_category", "proficiency_level")
     column_editable_list = ("skill_name", "skill_category", "proficiency_level")
+    form_overrides = {"skill_category": list_select_field(SkillCategory)}
 
     column_formatters = {
         "skill_category": lambda v, c, m, p: (
@@ -85,9 +306,6 @@ class SkillModelView(ModelView):
         )
     }
 
-    def is_accessible(self):
-        return current_user.is_authenticated and current_user.is_admin
-
     def create_skill(self, form: SkillForm) -> bool:
         """
         Create a new skill instance from the form data.
@@ -126,7 +344,7 @@ class SkillModelView(ModelView):
             return True
 
 
-class ExperienceModelView(ModelView):
+class ExperienceModelView(AdminModelView):
     """
     A ModelView for experiences.
 
@@ -164,9 +382,6 @@ class ExperienceModelView(ModelView):
         "description",
     )
 
-    def is_accessible(self):
-        return current_user.is_authenticated and current_user.is_admin
-
     def create_experience(self, form: ExperienceForm) -> bool:
         """
         Creates a new experience instance from the form data.
@@ -207,7 +422,7 @@ class ExperienceModelView(ModelView):
             return True
 
 
-class ProjectModelView(ModelView):
+class ProjectModelView(AdminModelView):
     """
     Admin view for the Project model.
 
@@ -246,11 +461,9 @@ class ProjectModelView(ModelView):
         "tech_stack",
         "project_category",
     )
+    form_overrides = {"project_category": list_select_field(ProjectCategory)}
     backref_name = "project_list"
 
-    def is_accessible(self):
-        return current_user.is_authenticated and current_user.is_admin
-
     def create_project(self, form: ProjectForm) -> bool:
         """
         Creates a new project instance from the form data.
@@ -291,7 +504,7 @@ class ProjectModelView(ModelView):
             return True
 
 
-class ImageView(ModelView):
+class ImageView(KeysetPaginationMixin, AdminModelView):
     """
     Admin view for managing images associated with projects.
 
@@ -310,6 +523,10 @@ class ImageView(ModelView):
     }
     column_list = ("name", "url", "image_category", "project")
     column_editable_list = ("name", "url", "image_category", "project")
+    form_overrides = {
+        "image_category": list_select_field(ImageCategory),
+        "project": list_select_field(Project, "title"),
+    }
 
     def create_image(self, form: ImageForm) -> bool:
         """
@@ -362,6 +579,17 @@ class ImageView(ModelView):
             return False
 
 
+class ContactMessageView(KeysetPaginationMixin, AdminModelView):
+    """
+    Admin view for the messages sent through the contact form, newest first.
+
+    Attributes:
+        column_default_sort (tuple): The column and direction of the default order.
+    """
+
+    column_default_sort = ("id", True)
+
+
 class ImageCategoryView(AdminModelView):
     """
     Admin view for managing image categories.
@@ -401,24 +629,6 @@ class ResumeModelView(AdminModelView):
         "user": lambda v, c, m, p: m.user.name if m.user else "",
     }
 
-    def get_query(self):
-        """
-        Override the default query to include a join with the User model.
-
-        Returns:
-            Query: A SQLAlchemy query object.
-        """
-        return self.session.query(self.model).join(User)
-
-    def get_count_query(self):
-        """
-        Override the default count query to include a join with the User model.
-
-        Returns:
-            Query: A SQLAlchemy query object for counting rows.
-        """
-        return self.session.query(db.func.count("*")).select_from(self.model).join(User)
-
     def create_resume(self, form: ResumeForm) -> bool:
         """
         Creates a new resume instance from the form data.
@@ -469,7 +679,7 @@ class ResumeModelView(AdminModelView):
             return False
 
 
-class CertificationModelView(ModelView):
+class CertificationModelView(AdminModelView):
     """
     Admin view for the Certification model.
 
@@ -499,9 +709,6 @@ class CertificationModelView(ModelView):
         "skills_acquired",
     )
 
-    def is_accessible(self):
-        return current_user.is_authenticated and current_user.is_admin
-
     def create_model(self, form):
         try:
             certification = Certification(
@@ -537,6 +744,6 @@ admin.add_view(ImageCategoryView(ImageCategory, db.session))
 admin.add_view(SkillModelView(Skill, db.session))
 admin.add_view(AdminModelView(SkillCategory, db.session))
 admin.add_view(ExperienceModelView(Experience, db.session))
-admin.add_view(AdminModelView(ContactMessage, db.session))
+admin.add_view(ContactMessageView(ContactMessage, db.session))
 admin.add_view(ResumeModelView(Resume, db.session))
 admin.add_view(CertificationModelView(Certification, db.session))
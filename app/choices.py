@@ -0,0 +1,205 @@
+"""
+Cached choices for the relationship dropdowns of the admin forms
+
+A dropdown only needs the ``(id, label)`` pairs of the related rows, so they are
+read with a two-column query instead of loading every ORM object, and kept in a
+process-wide cache shared by all form instances. This matters most for the
+editable list views, which build one dropdown per row and relationship column.
+Only the selected row is loaded as an ORM object, by primary key, when a form is
+submitted.
+
+Entries are dropped as soon as ``models_committed`` reports a write to their
+model, and expire after ``ADMIN_CHOICES_TTL`` seconds to pick up writes made by
+other processes.
+
+"""
+
+import os
+import threading
+import time
+from functools import partial
+
+from sqlalchemy import select
+from wtforms import widgets
+from wtforms.fields import SelectFieldBase
+from wtforms.validators import ValidationError
+
+from config import env_config
+from src.db.events import models_committed
+from .db import database as db
+
+
+class ChoiceCache:
+    """
+    Cache of the ``(id, label)`` pairs of a model's rows.
+
+    Attributes:
+        ttl (int): The maximum lifetime of an entry in seconds, 0 disables the cache.
+        entries (dict): The expiry time and the choices of every cached
+            ``(model, label attribute)``.
+    """
+
+    def __init__(self, ttl: int):
+        """
+        Initialize the cache.
+
+        Args:
+            ttl (int): The maximum lifetime of an entry in seconds, 0 disables the cache.
+        """
+        self.ttl = ttl
+        self.entries: dict[tuple, tuple[float, list[tuple[str, str]]]] = {}
+        self.lock = threading.Lock()
+
+    def get(self, model, label_attr: str) -> list[tuple[str, str]]:
+        """
+        Return the choices of a model, ordered by label.
+
+        Args:
+            model: The model class the choices are rows of.
+            label_attr (str): The column shown as the label of a choice.
+
+        Returns:
+            list[tuple[str, str]]: The primary key, as a string, and the label of
+                every row.
+        """
+        key = (model, label_attr)
+        entry = self.entries.get(key)
+        if entry is not None and entry[0] > time.monotonic():
+            return entry[1]
+
+        label = getattr(model, label_attr)
+        rows = db.session.execute(select(model.id, label).order_by(label, model.id))
+        choices = [(str(id_), str(label)) for id_, label in rows]
+        if self.ttl:
+            with self.lock:
+                self.entries[key] = (time.monotonic() + self.ttl, choices)
+        return choices
+
+    def invalidate(self, model) -> None:
+        """
+        Drop the cached choices of a model.
+
+        Args:
+            model: The model class whose rows have changed.
+        """
+        with self.lock:
+            for key in [key for key in self.entries if key[0] is model]:
+                del self.entries[key]
+
+
+choice_cache = ChoiceCache(
+    env_config[os.getenv("FLASK_ENV", "development")].ADMIN_CHOICES_TTL
+)
+
+
+@models_committed.connect
+def invalidate_choices(sender, ids, **kwargs):
+    """Drop the cached choices of the model whose rows were committed."""
+    choice_cache.invalidate(sender)
+
+
+class CachedSelectField(SelectFieldBase):
+    """
+    Select field for a many-to-one relationship, listing cached choices.
+
+    Like ``QuerySelectField`` its ``data`` is the selected ORM instance, so it
+    can be assigned to the relationship directly, but the instance is only
+    loaded for the submitted choice, with a primary key lookup.
+
+    Args:
+        label (str, optional): The label of the field.
+        validators (list, optional): The validators of the field.
+        model: The model class of the related rows.
+        label_attr (str): The column shown as the label of a choice.
+        allow_blank (bool): Whether an empty choice, giving ``None``, is offered.
+        blank_text (str): The label of the empty choice.
+    """
+
+    widget = widgets.Select()
+
+    def __init__(
+        self,
+        label=None,
+        validators=None,
+        model=None,
+        label_attr="name",
+        allow_blank=False,
+        blank_text="",
+        **kwargs,
+    ):
+        super().__init__(label, validators, **kwargs)
+        self.model = model
+        self.label_attr = label_attr
+        self.allow_blank = allow_blank
+        self.blank_text = blank_text
+
+    def _get_data(self):
+        if self._formdata is not None:
+            try:
+                self._data = db.session.get(self.model, int(self._formdata))
+            except ValueError:
+                self._data = None
+            if self._data is not None:
+                self._formdata = None
+        return self._data
+
+    def _set_data(self, data):
+        self._data = data
+        self._formdata = None
+
+    data = property(_get_data, _set_data)
+
+    def _selected_pk(self):
+        if self._formdata is not None:
+            return self._formdata
+        return str(self._data.id) if self._data is not None else None
+
+    def iter_choices(self):
+        selected = self._selected_pk()
+        if self.allow_blank:
+            yield ("__None", self.blank_text, selected is None, {})
+        for pk, label in choice_cache.get(self.model, self.label_attr):
+            yield (pk, label, pk == selected, {})
+
+    def process_formdata(self, valuelist):
+        if valuelist:
+            if self.allow_blank and valuelist[0] == "__None":
+                self.data = None
+            else:
+                self._data = None
+                self._formdata = valuelist[0]
+
+    def pre_validate(self, form):
+        if self.data is None and (self._formdata or not self.allow_blank):
+            raise ValidationError(self.gettext("Not a valid choice"))
+
+
+class CachedListSelectField(CachedSelectField):
+    """
+    ``CachedSelectField`` for the editable list views of Flask-Admin.
+
+    Its x-editable widget only renders fields typed as ``QuerySelectField`` as
+    relationship dropdowns and reads choices without render keywords.
+    """
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.type = "QuerySelectField"
+
+    def iter_choices(self):
+        for pk, label, selected, _ in super().iter_choices():
+            yield (pk, label, selected)
+
+
+def list_select_field(model, label_attr: str = "name"):
+    """
+    Build an editable list column field for ``ModelView.form_overrides``.
+
+    Args:
+        model: The model class of the related rows.
+        label_attr (str): The column shown as the label of a choice.
+
+    Returns:
+        The field factory, called by Flask-Admin with the field arguments.
+    """
+    return partial(CachedListSelectField, model=model, label_attr=label_attr)
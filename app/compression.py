@@ -0,0 +1,68 @@
+from flask import request
+
+from logging_setup import app_logger
+from src.compression import (
+    SUPPORTED_ENCODINGS,
+    Compressor,
+    encoded_etag,
+    negotiate_encoding,
+    strip_encoded_etags,
+)
+
+
+def init_compression(app):
+    """
+    Compress the responses of the given Flask application.
+
+    The encoding is negotiated from ``Accept-Encoding``. Streamed and file
+    responses, bodies below ``COMPRESS_MIN_SIZE`` and media types that do not
+    compress well are sent as is. Compressed bodies are cached by content, so
+    pages that render identically are not recompressed on every hit.
+
+    Args:
+        app (Flask): The Flask application instance to compress the responses of.
+    """
+    if "br" not in SUPPORTED_ENCODINGS:
+        app_logger.warning(
+            "brotli is not installed, responses are only gzip-compressed"
+        )
+    compressor = Compressor(
+        min_size=app.config["COMPRESS_MIN_SIZE"],
+        gzip_level=app.config["COMPRESS_GZIP_LEVEL"],
+        brotli_quality=app.config["COMPRESS_BROTLI_QUALITY"],
+        cache_size=app.config["COMPRESS_CACHE_SIZE"],
+    )
+    app.extensions["compressor"] = compressor
+
+    @app.after_request
+    def compress_response(response):
+        if response.direct_passthrough or response.is_streamed:
+            return response
+        encoding = negotiate_encoding(request.headers.get("Accept-Encoding"))
+        if encoding is None:
+            return response
+
+        # Revalidation of a compressed page (app.page_cache): 304 responses have
+        # no body, so their ETag is mapped to the encoded one the client holds
+        if response.status_code == 304:
+            if_none_match = request.headers.get("If-None-Match", "")
+            etag, weak = response.get_etag()
+            if etag and strip_encoded_etags(if_none_match) != if_none_match:
+                response.set_etag(encoded_etag(f'"{etag}"', encoding)[1:-1], weak)
+            response.vary.add("Accept-Encoding")
+            return response
+
+        body = response.get_data()
+        if not compressor.should_compress(
+            response.content_type, response.content_encoding, len(body)
+        ):
+            return response
+
+        etag, weak = response.get_etag()
+        strong_etag = f'"{etag}"' if etag and not weak else None
+        response.set_data(compressor.compress(body, encoding, strong_etag))
+        response.content_encoding = encoding
+        response.vary.add("Accept-Encoding")
+        if etag:
+            response.set_etag(encoded_etag(f'"{etag}"', encoding)[1:-1], weak)
+        return response
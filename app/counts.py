@@ -0,0 +1,148 @@
+"""
+Cached row counts for the admin list views
+
+Every list view page shows the total number of rows, which Flask-Admin gets
+with a ``SELECT count(*)`` on each request. That is a full scan of the table, so
+the count of a list without search or filters is cached per model instead.
+Filtered and searched lists are still counted exactly.
+
+On PostgreSQL, a table whose planner estimate (``pg_class.reltuples``, kept up
+to date by autovacuum) exceeds ``ADMIN_COUNT_ESTIMATE_ROWS`` is not counted at
+all: the estimate is shown instead.
+
+Entries are dropped as soon as ``models_committed`` reports a write to their
+model, and expire after ``ADMIN_COUNT_TTL`` seconds to pick up writes made by
+other processes. Within a request the count of a model is taken at most once,
+even with the cache disabled, since a list page asks for it several times.
+
+"""
+
+import os
+import threading
+import time
+
+from flask import g, has_app_context
+from sqlalchemy import text
+
+from config import env_config
+from src.db.events import models_committed
+from .db import database as db
+
+
+class RowCountCache:
+    """
+    Cache of the number of rows of a model's table.
+
+    Attributes:
+        ttl (int): The maximum lifetime of an entry in seconds, 0 disables the cache.
+        estimate_rows (int): The table size above which the PostgreSQL estimate
+            is used instead of an exact count, 0 always counts exactly.
+        entries (dict): The expiry time and the row count of every cached model.
+    """
+
+    def __init__(self, ttl: int, estimate_rows: int):
+        """
+        Initialize the cache.
+
+        Args:
+            ttl (int): The maximum lifetime of an entry in seconds, 0 disables the cache.
+            estimate_rows (int): The table size above which the PostgreSQL
+                estimate is used instead of an exact count, 0 always counts exactly.
+        """
+        self.ttl = ttl
+        self.estimate_rows = estimate_rows
+        self.entries: dict[type, tuple[float, int]] = {}
+        self.lock = threading.Lock()
+
+    def get(self, model, count_query) -> int:
+        """
+        Return the number of rows of a model's table.
+
+        Args:
+            model: The model class whose rows are counted.
+            count_query: The query counting them exactly, run on a cache miss
+                when the table is small or its size cannot be estimated.
+
+        Returns:
+            int: The exact or estimated number of rows.
+        """
+        entry = self.entries.get(model)
+        if entry is not None and entry[0] > time.monotonic():
+            return entry[1]
+
+        count = self.estimate(model)
+        if count is None:
+            count = count_query.scalar()
+        if self.ttl:
+            with self.lock:
+                self.entries[model] = (time.monotonic() + self.ttl, count)
+        return count
+
+    def estimate(self, model):
+        """
+        Return the PostgreSQL planner estimate of a large table's row count.
+
+        Args:
+            model: The model class whose rows are counted.
+
+        Returns:
+            int | None: The estimate, or None if the table is not above
+                ``estimate_rows``, was never analyzed, or the database is not
+                PostgreSQL.
+        """
+        if not self.estimate_rows or db.engine.dialect.name != "postgresql":
+            return None
+        rows = db.session.execute(
+            text("SELECT reltuples::bigint FROM pg_class WHERE oid = to_regclass(:t)"),
+            {"t": model.__table__.name},
+        ).scalar()
+        return rows if rows is not None and rows > self.estimate_rows else None
+
+    def invalidate(self, model) -> None:
+        """
+        Drop the cached row count of a model.
+
+        Args:
+            model: The model class whose rows have changed.
+        """
+        with self.lock:
+            self.entries.pop(model, None)
+
+
+config = env_config[os.getenv("FLASK_ENV", "development")]
+row_counts = RowCountCache(config.ADMIN_COUNT_TTL, config.ADMIN_COUNT_ESTIMATE_ROWS)
+
+
+@models_committed.connect
+def invalidate_row_count(sender, ids, **kwargs):
+    """Drop the cached row count of the model whose rows were committed."""
+    row_counts.invalidate(sender)
+    if has_app_context():
+        g.get("row_counts", {}).pop(sender, None)
+
+
+class CachedCountQuery:
+    """
+    Count query of a list view that answers from ``row_counts``.
+
+    Flask-Admin narrows the count query with ``filter()`` and ``join()`` when a
+    list is searched or filtered. Those calls are passed to the wrapped query
+    and return it unwrapped, so only the count of the whole table is cached.
+
+    Args:
+        model: The model class whose rows are counted.
+        query: The query counting them exactly.
+    """
+
+    def __init__(self, model, query):
+        self.model = model
+        self.query = query
+
+    def __getattr__(self, name):
+        return getattr(self.query, name)
+
+    def scalar(self) -> int:
+        counts = g.setdefault("row_counts", {})
+        if self.model not in counts:
+            counts[self.model] = row_counts.get(self.model, self.query)
+        return counts[self.model]
@@ -12,9 +12,8 @@ from wtforms import (
     HiddenField,
 )
 from wtforms.validators import DataRequired, URL, Length
-from wtforms_sqlalchemy.fields import QuerySelectField
 
-from app.db import database as db
+from app.choices import CachedSelectField
 from src.db.models import SkillCategory, ProjectCategory, Project, ImageCategory
 
 
@@ -59,16 +58,15 @@ class SkillForm(FlaskForm):
 
     Attributes:
         skill_name (StringField): Field for the name of the skill.
-        skill_category (QuerySelectField): Field for the category of the skill.
+        skill_category (CachedSelectField): Field for the category of the skill.
         proficiency_level (SelectField): Field for the proficiency level of the skill.
         user_id (HiddenField): Field for the user ID the skill belongs to.
     """
 
     skill_name = StringField("Skill Name", validators=[DataRequired()])
-    skill_category = QuerySelectField(
+    skill_category = CachedSelectField(
         "Skill Category",
-        query_factory=lambda: db.session.query(SkillCategory).all(),
-        get_label=lambda x: x.name,
+        model=SkillCategory,
         validators=[DataRequired()],
     )
     proficiency_level = SelectField(
@@ -119,7 +117,7 @@ class ProjectForm(FlaskForm):
         description (TextAreaField): Field for the description of the project.
         url (StringField): Field for the URL of the project.
         tech_stack (StringField): Field for the tech stack used in the project.
-        project_category (QuerySelectField): Field for the project category.
+        project_category (CachedSelectField): Field for the project category.
         user_id (HiddenField): Field for the user ID the project belongs to.
     """
 
@@ -127,10 +125,9 @@ class ProjectForm(FlaskForm):
     description = TextAreaField("Description", validators=[DataRequired()])
     url = StringField("URL", validators=[DataRequired(), URL()])
     tech_stack = StringField("Tech Stack", validators=[DataRequired()])
-    project_category = QuerySelectField(
+    project_category = CachedSelectField(
         "Project Category",
-        query_factory=lambda: db.session.query(ProjectCategory).all(),
-        get_label=lambda x: x.name,
+        model=ProjectCategory,
         validators=[DataRequired()],
     )
     user_id = HiddenField(
@@ -145,8 +142,8 @@ class ImageForm(FlaskForm):
     Attributes:
         name (StringField): Field for the name of the image.
         url (StringField): Field for the URL of the image.
-        image_category (QuerySelectField): Field for the image category.
-        project (QuerySelectField): Field for the project this image belongs to.
+        image_category (CachedSelectField): Field for the image category.
+        project (CachedSelectField): Field for the project this image belongs to.
     """
 
     name = StringField("Name")
@@ -157,17 +154,16 @@ class ImageForm(FlaskForm):
             DataRequired(),
         ],
     )
-    image_category = QuerySelectField(
+    image_category = CachedSelectField(
         "Image Category",
-        query_factory=lambda: db.session.query(ImageCategory).all(),
-        get_label=lambda image_category: image_category.name,
+        model=ImageCategory,
         allow_blank=True,
         validators=[DataRequired()],
     )
-    project = QuerySelectField(
+    project = CachedSelectField(
         "Project",
-        query_factory=lambda: db.session.query(Project).all(),
-        get_label=lambda project: project.title,
+        model=Project,
+        label_attr="title",
         allow_blank=True,
     )
 
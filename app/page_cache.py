@@ -0,0 +1,346 @@
+"""
+Full-page cache for the pages rendered by the Flask app
+
+The public pages are the same for every anonymous visitor and only change when
+their data is edited, so a rendered page is stored under its host, path and query string
+and served without running the view or Jinja until it expires or a commit
+touching its data invalidates its namespace.
+
+Pages are keyed by the generation of their namespace read before the view runs,
+as in the API response cache, so a page rendered from data read before a commit
+but stored after the commit's invalidation is never served.
+
+Every page is sent with an ``ETag`` and a ``Last-Modified`` date and with
+``Cache-Control: no-cache``, so browsers revalidate on each visit and get an
+empty ``304 Not Modified`` while the page is unchanged.
+
+Redis is used when ``PAGE_CACHE_REDIS_URL`` is configured, so every worker shares
+the same entries and invalidations. Without it each worker keeps a bounded
+in-process LRU; an invalidation then only reaches the worker that committed the
+change, and other workers may serve the old page until ``PAGE_CACHE_TTL`` expires.
+
+"""
+
+import hashlib
+import json
+import os
+import time
+from datetime import datetime, timezone
+from functools import wraps
+from typing import Optional
+from urllib.parse import urlencode
+
+from flask import Response, make_response, request, session
+from flask_login import current_user
+from redis.exceptions import RedisError
+from werkzeug.http import parse_etags
+
+from config import env_config
+from logging_setup import app_logger
+from src.cache_backends import LRUBackend, RedisBackend
+from src.compression import strip_encoded_etags
+from src.db.events import models_committed
+from src.db.models import Image, Project, ProjectCategory
+
+# Prefix for every key the cache writes to Redis
+KEY_PREFIX = "page-cache"
+
+# WSGI environ key of the requests made by the static site build, which are
+# always rendered fresh (see app.static_site)
+STATIC_BUILD_ENVIRON = "portfolio.static_build"
+
+# Models whose rows the pages of each namespace display
+NAMESPACE_MODELS = {
+    "pages": (Project, ProjectCategory, Image),
+}
+
+
+class CachedPage:
+    """
+    A rendered page with its validators.
+
+    Attributes:
+        body (bytes): The rendered page.
+        content_type (str): The content type of the page.
+        etag (str): The unquoted entity tag of the body.
+        last_modified (int): The time the page was rendered, in Unix seconds.
+    """
+
+    def __init__(self, body: bytes, content_type: str, etag: str, last_modified: int):
+        self.body = body
+        self.content_type = content_type
+        self.etag = etag
+        self.last_modified = last_modified
+
+    @classmethod
+    def from_response(cls, response: Response) -> "CachedPage":
+        """
+        Capture a rendered response.
+
+        Args:
+            response (Response): The response of the view.
+
+        Returns:
+            CachedPage: The page, tagged with the SHA-256 of its body.
+        """
+        body = response.get_data()
+        return cls(
+            body,
+            response.content_type,
+            hashlib.sha256(body).hexdigest()[:32],
+            int(time.time()),
+        )
+
+    def encode(self) -> bytes:
+        """
+        Serialize the page into the bytes stored in the cache.
+
+        Returns:
+            bytes: A JSON header line with the validators, followed by the body.
+        """
+        head = json.dumps(
+            {
+                "content_type": self.content_type,
+                "etag": self.etag,
+                "last_modified": self.last_modified,
+            }
+        )
+        return head.encode() + b"\n" + self.body
+
+    @classmethod
+    def decode(cls, value: bytes) -> "CachedPage":
+        """
+        Rebuild a page from the bytes stored in the cache.
+
+        Args:
+            value (bytes): The bytes produced by ``encode``.
+
+        Returns:
+            CachedPage: The cached page.
+        """
+        head, body = value.split(b"\n", 1)
+        meta = json.loads(head)
+        return cls(body, meta["content_type"], meta["etag"], meta["last_modified"])
+
+    def is_fresh(self) -> bool:
+        """
+        Check the validators of the current request against the page.
+
+        ``If-None-Match`` takes precedence over ``If-Modified-Since``. Tags of
+        compressed representations are mapped back to the tag of the body.
+
+        Returns:
+            bool: True if the client's copy is still current.
+        """
+        if_none_match = request.headers.get("If-None-Match")
+        if if_none_match:
+            return parse_etags(strip_encoded_etags(if_none_match)).contains_weak(
+                self.etag
+            )
+        if_modified_since = request.if_modified_since
+        return (
+            if_modified_since is not None
+            and if_modified_since.timestamp() >= self.last_modified
+        )
+
+    def to_response(self, cache_status: str) -> Response:
+        """
+        Build the response sending the page, or a 304 if the client's copy is current.
+
+        Args:
+            cache_status (str): The value of the ``X-Cache`` header, HIT or MISS.
+
+        Returns:
+            Response: The page or an empty 304 response with its validators.
+        """
+        if self.is_fresh():
+            response = Response(status=304)
+        else:
+            response = Response(self.body, content_type=self.content_type)
+        response.set_etag(self.etag)
+        response.last_modified = datetime.fromtimestamp(
+            self.last_modified, timezone.utc
+        )
+        response.cache_control.no_cache = True
+        response.headers["X-Cache"] = cache_status
+        return response
+
+
+class PageCache:
+    """
+    Page cache over the configured backend.
+
+    Backend failures are logged and treated as misses, so an unavailable Redis
+    slows the pages down instead of failing them.
+
+    """
+
+    def __init__(self, config=None):
+        """
+        Initialize the cache backend from the configuration.
+
+        Args:
+            config (type[Config], optional): The configuration class holding the
+                cache settings. Defaults to the class selected by ``FLASK_ENV``.
+        """
+        if config is None:
+            config = env_config[os.getenv("FLASK_ENV", "development")]
+        self.ttl = config.PAGE_CACHE_TTL
+        if config.PAGE_CACHE_REDIS_URL:
+            self.backend = RedisBackend(config.PAGE_CACHE_REDIS_URL, KEY_PREFIX)
+        else:
+            self.backend = LRUBackend(config.PAGE_CACHE_MAX_ENTRIES)
+
+    @property
+    def enabled(self) -> bool:
+        return self.ttl > 0
+
+    def generation(self, namespace: str) -> Optional[int]:
+        """
+        Read the current generation of a namespace.
+
+        Args:
+            namespace (str): The namespace of the view the page belongs to.
+
+        Returns:
+            int, optional: The generation, or None if the backend failed.
+        """
+        try:
+            return self.backend.generation(namespace)
+        except RedisError as e:
+            app_logger.warning(f"Page cache generation lookup failed: {e}")
+            return None
+
+    def get(self, namespace: str, key: str) -> Optional[CachedPage]:
+        """
+        Look up a cached page.
+
+        Args:
+            namespace (str): The namespace of the view the page belongs to.
+            key (str): The key of the request.
+
+        Returns:
+            CachedPage, optional: The cached page, or None on a miss.
+        """
+        try:
+            value = self.backend.get(namespace, key)
+        except RedisError as e:
+            app_logger.warning(f"Page cache lookup failed: {e}")
+            return None
+        return CachedPage.decode(value) if value is not None else None
+
+    def set(self, namespace: str, key: str, page: CachedPage) -> None:
+        """
+        Store a page.
+
+        Args:
+            namespace (str): The namespace of the view the page belongs to.
+            key (str): The key of the request.
+            page (CachedPage): The page to store.
+        """
+        try:
+            self.backend.set(namespace, key, page.encode(), self.ttl)
+        except RedisError as e:
+            app_logger.warning(f"Page cache store failed: {e}")
+
+    def invalidate(self, namespace: str) -> None:
+        """
+        Move a namespace to its next generation and drop its cached pages.
+
+        Args:
+            namespace (str): The namespace whose data has changed.
+        """
+        if not self.enabled:
+            return
+        try:
+            self.backend.clear(namespace)
+        except RedisError as e:
+            app_logger.error(f"Page cache invalidation of {namespace} failed: {e}")
+
+
+def page_key() -> str:
+    """
+    Build the cache key of the current request from its host, path and sorted
+    query parameters.
+
+    Returns:
+        str: The cache key.
+    """
+    query = urlencode(sorted(request.args.items(multi=True)))
+    return f"{request.host}{request.path}?{query}"
+
+
+def is_personalized() -> bool:
+    """
+    Check whether the current visitor may see a page of their own.
+
+    Logged-in users (the admin) and visitors with pending flashed messages are
+    served freshly rendered pages, and their pages are not stored.
+
+    Returns:
+        bool: True if the page cache must be bypassed.
+    """
+    return current_user.is_authenticated or bool(session.get("_flashes"))
+
+
+def cached_page(namespace: str):
+    """
+    Serve a view's GET responses through the page cache.
+
+    Only complete ``200`` responses that did not modify the session are stored.
+
+    Args:
+        namespace (str): The namespace the view's pages are stored under.
+
+    Returns:
+        The view decorator.
+    """
+
+    def decorator(view):
+        @wraps(view)
+        def cached_view(*args, **kwargs):
+            if (
+                request.method != "GET"
+                or not page_cache.enabled
+                or is_personalized()
+                or request.environ.get(STATIC_BUILD_ENVIRON)
+            ):
+                return view(*args, **kwargs)
+
+            # Read before the view, so a commit landing while it renders
+            # files the page under a generation that is already stale
+            generation = page_cache.generation(namespace)
+            if generation is None:
+                return view(*args, **kwargs)
+
+            key = f"{generation}:{page_key()}"
+            page = page_cache.get(namespace, key)
+            if page is not None:
+                return page.to_response("HIT")
+
+            response = make_response(view(*args, **kwargs))
+            if (
+                response.status_code != 200
+                or response.is_streamed
+                or response.direct_passthrough
+                or session.modified
+            ):
+                return response
+            page = CachedPage.from_response(response)
+            page_cache.set(namespace, key, page)
+            return page.to_response("MISS")
+
+        return cached_view
+
+    return decorator
+
+
+page_cache = PageCache()
+
+
+@models_committed.connect
+def invalidate_pages(sender, ids, **kwargs):
+    """Drop the cached pages that display rows of the committed model."""
+    for namespace, models in NAMESPACE_MODELS.items():
+        if sender in models:
+            page_cache.invalidate(namespace)
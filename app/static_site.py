@@ -0,0 +1,300 @@
+"""
+Static build of the public site
+
+Every public page (the pages of ``render_page`` and one ``project_detail`` page
+per project) is rendered through the app and written to an output directory as
+``<path>/index.html``, so nginx or a CDN can serve the site without Python::
+
+    location / { try_files $uri $uri/index.html @flask; }
+
+The contact form, the resume redirect, the login and the admin are not static
+and stay proxied to the Flask app.
+
+``app/static`` is copied twice: under its own names, which the stylesheets'
+relative ``url()`` references rely on, and under content-hashed names
+(``css/main.3f2a9c1e.css``) that the rendered pages link to and that can be
+cached forever.
+
+Builds are incremental. ``manifest.json`` in the output directory records, for
+every asset, its size, modification time and hash, and for every page a digest
+of its inputs: the templates, the rows it displays and the hashes of the assets
+it links to. Only pages whose digest changed are rendered again, and pages of
+deleted projects are removed.
+
+With ``STATIC_SITE_AUTOBUILD`` enabled, the Flask app rebuilds the site in the
+background a few seconds after an admin commit touching the projects.
+
+"""
+
+import hashlib
+import json
+import os
+import re
+import shutil
+import threading
+
+from flask import Flask
+from sqlalchemy import select
+
+from logging_setup import app_logger
+from src.db.events import models_committed
+from src.db.models import Image, Project, ProjectCategory
+from .db import database
+from .page_cache import STATIC_BUILD_ENVIRON
+from .views import PAGES
+
+MANIFEST_NAME = "manifest.json"
+
+# Models whose rows the built pages display
+BUILD_MODELS = (Project, ProjectCategory, Image)
+
+# Seconds an automatic rebuild waits for further commits
+AUTOBUILD_DELAY = 5
+
+# Links to app/static in the rendered HTML, e.g. "/static/css/main.css"
+STATIC_LINK = re.compile(r"""(?<=["'(])/static/([^"'()?#\s]+)""")
+
+STATIC_FOLDER = os.path.join(os.path.dirname(__file__), "static")
+TEMPLATE_FOLDER = os.path.join(os.path.dirname(__file__), "templates")
+
+
+def _digest(*parts) -> str:
+    return hashlib.sha256(
+        json.dumps(parts, default=str, separators=(",", ":")).encode()
+    ).hexdigest()
+
+
+def _file_hash(path: str) -> str:
+    sha256 = hashlib.sha256()
+    with open(path, "rb") as file:
+        for block in iter(lambda: file.read(1 << 16), b""):
+            sha256.update(block)
+    return sha256.hexdigest()
+
+
+def _write(path: str, data: bytes) -> None:
+    # Replace atomically, the directory may be served while it is rebuilt
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    temporary = f"{path}.tmp"
+    with open(temporary, "wb") as file:
+        file.write(data)
+    os.replace(temporary, path)
+
+
+def _fingerprinted(name: str, file_hash: str) -> str:
+    root, extension = os.path.splitext(name)
+    return f"{root}.{file_hash[:8]}{extension}"
+
+
+def _rows(*statements) -> list:
+    return [
+        [list(row) for row in database.session.execute(statement)]
+        for statement in statements
+    ]
+
+
+def build_assets(output: str, previous: dict) -> dict:
+    """
+    Copy ``app/static`` into the output directory with fingerprinted copies.
+
+    Args:
+        output (str): The output directory.
+        previous (dict): The assets of the previous build's manifest.
+
+    Returns:
+        dict: The size, modification time and hash of every asset, by path
+            relative to ``app/static``.
+    """
+    assets = {}
+    for directory, _, names in os.walk(STATIC_FOLDER):
+        for name in names:
+            source = os.path.join(directory, name)
+            relative = os.path.relpath(source, STATIC_FOLDER).replace(os.sep, "/")
+            stat = os.stat(source)
+            entry = previous.get(relative)
+            if (
+                entry
+                and entry["size"] == stat.st_size
+                and entry["mtime"] == stat.st_mtime_ns
+            ):
+                file_hash = entry["hash"]
+            else:
+                file_hash = _file_hash(source)
+            assets[relative] = {
+                "size": stat.st_size,
+                "mtime": stat.st_mtime_ns,
+                "hash": file_hash,
+            }
+
+            target = os.path.join(output, "static", relative)
+            for copy in (target, _fingerprinted(target, file_hash)):
+                if (
+                    entry is None
+                    or entry["hash"] != file_hash
+                    or not os.path.exists(copy)
+                ):
+                    os.makedirs(os.path.dirname(copy), exist_ok=True)
+                    shutil.copy2(source, copy)
+
+    # Drop the copies of deleted and changed assets
+    for relative, entry in previous.items():
+        current = assets.get(relative)
+        stale = [] if current else [relative]
+        if not current or current["hash"] != entry["hash"]:
+            stale.append(_fingerprinted(relative, entry["hash"]))
+        for name in stale:
+            path = os.path.join(output, "static", name)
+            if os.path.exists(path):
+                os.remove(path)
+    return assets
+
+
+def page_inputs() -> dict:
+    """
+    List the pages to build with a digest of the data they display.
+
+    Returns:
+        dict: The data digest of every page, by URL path.
+    """
+    project_data = _digest(
+        _rows(
+            select(Project.__table__).order_by(Project.id),
+            select(ProjectCategory.__table__).order_by(ProjectCategory.id),
+            select(Image.__table__).order_by(Image.id),
+        )
+    )
+    pages = {}
+    for page in PAGES:
+        path = "/" if page == "index" else f"/{page}"
+        pages[path] = project_data if page == "projects" else ""
+    for project in database.session.execute(select(Project.__table__)):
+        pages[f"/projects/{project.slug}"] = _digest(list(project))
+    return pages
+
+
+def _output_file(output: str, path: str) -> str:
+    return os.path.join(output, *path.strip("/").split("/"), "index.html")
+
+
+def build_static(app: Flask, output: str, force: bool = False) -> dict:
+    """
+    Build the static site, rendering only the pages whose inputs changed.
+
+    Args:
+        app (Flask): The Flask application to render the pages with.
+        output (str): The output directory.
+        force (bool): Whether to render every page and rehash every asset.
+
+    Returns:
+        dict: The number of pages ``rendered``, ``skipped`` and ``removed``.
+    """
+    manifest_path = os.path.join(output, MANIFEST_NAME)
+    manifest = {"assets": {}, "pages": {}}
+    if not force and os.path.exists(manifest_path):
+        with open(manifest_path, encoding="utf-8") as file:
+            manifest = json.load(file)
+
+    os.makedirs(output, exist_ok=True)
+    assets = build_assets(output, manifest["assets"])
+    templates = _digest(
+        sorted(
+            (os.path.relpath(path, TEMPLATE_FOLDER), _file_hash(path))
+            for directory, _, names in os.walk(TEMPLATE_FOLDER)
+            for path in (os.path.join(directory, name) for name in names)
+        )
+    )
+
+    def link(match: re.Match) -> str:
+        asset = assets.get(match.group(1))
+        if asset is None:
+            return match.group(0)
+        return "/static/" + _fingerprinted(match.group(1), asset["hash"])
+
+    stats = {"rendered": 0, "skipped": 0, "removed": 0}
+    pages = {}
+    client = app.test_client()
+    with app.app_context():
+        inputs = page_inputs()
+    for path, data in inputs.items():
+        file = _output_file(output, path)
+        previous = manifest["pages"].get(path)
+        if previous and os.path.exists(file):
+            linked = [assets.get(name, {}).get("hash") for name in previous["assets"]]
+            if previous["digest"] == _digest(templates, data, linked):
+                pages[path] = previous
+                stats["skipped"] += 1
+                continue
+
+        response = client.get(path, environ_base={STATIC_BUILD_ENVIRON: True})
+        if response.status_code != 200:
+            app_logger.error(f"Static build of {path} failed: {response.status}")
+            continue
+        html = response.get_data(as_text=True)
+        linked_names = sorted(
+            {name for name in STATIC_LINK.findall(html) if name in assets}
+        )
+        _write(file, STATIC_LINK.sub(link, html).encode())
+        linked = [assets[name]["hash"] for name in linked_names]
+        pages[path] = {
+            "digest": _digest(templates, data, linked),
+            "assets": linked_names,
+        }
+        stats["rendered"] += 1
+
+    for path in manifest["pages"].keys() - pages.keys():
+        file = _output_file(output, path)
+        if os.path.exists(file):
+            os.remove(file)
+        stats["removed"] += 1
+
+    _write(
+        manifest_path,
+        json.dumps({"assets": assets, "pages": pages}, indent=1).encode(),
+    )
+    app_logger.info(
+        f"Static site built in {output}: {stats['rendered']} pages rendered, "
+        f"{stats['skipped']} unchanged, {stats['removed']} removed"
+    )
+    return stats
+
+
+def init_static_site(app: Flask) -> None:
+    """
+    Rebuild the static site after commits touching the pages' data.
+
+    Enabled by ``STATIC_SITE_AUTOBUILD``. Commits made within
+    ``AUTOBUILD_DELAY`` seconds of each other trigger a single incremental build
+    of ``STATIC_SITE_DIR``, run in a background thread.
+
+    Args:
+        app (Flask): The Flask application to render the pages with.
+    """
+    if not app.config["STATIC_SITE_AUTOBUILD"]:
+        return
+    output = app.config["STATIC_SITE_DIR"]
+    lock = threading.Lock()
+    building = threading.Lock()
+    timer = None
+
+    def build() -> None:
+        nonlocal timer
+        with lock:
+            timer = None
+        # A build scheduled during a running one waits for it to finish
+        with building:
+            try:
+                build_static(app, output)
+            except Exception as e:
+                app_logger.error(f"Automatic static build failed: {e}")
+
+    def schedule(sender, ids, **kwargs) -> None:
+        nonlocal timer
+        if sender not in BUILD_MODELS:
+            return
+        with lock:
+            if timer is None:
+                timer = threading.Timer(AUTOBUILD_DELAY, build)
+                timer.daemon = True
+                timer.start()
+
+    models_committed.connect(schedule, weak=False)
@@ -11,25 +11,33 @@ from flask import (
 )
 
 from logging_setup import app_logger
+from src.db.loaders import PROJECTS_PAGE_LOADERS
 from src.db.models import ContactMessage, Project
 from .db import database
 from .forms import ContactForm
 from .mail import send_email_notification
+from .page_cache import cached_page
 
 main = Blueprint("main", __name__)
 
+# Pages rendered by render_page, by template name
+PAGES = ("index", "about", "education", "skills", "projects")
+
 
 @main.route("/<page>")
 @main.route("/")
+@cached_page("pages")
 def render_page(page="index"):
     """
     Render the page based on the current route.
-    If route is one of the predefined routes: ("index", "about", "education", "skills", "projects")
-    then render the corresponding template.
+    If route is one of the predefined routes (``PAGES``) then render the
+    corresponding template.
     """
     try:
         if page == "projects":
-            projects = database.session.query(Project).all()
+            projects = (
+                database.session.query(Project).options(*PROJECTS_PAGE_LOADERS).all()
+            )
             return render_template("projects.html", projects=projects)
         else:
             return render_template(
@@ -41,25 +49,34 @@ def render_page(page="index"):
         abort(404)  # Return 404 if the template does not exist
 
 
-@main.route("/projects/<project_name>")
-def project_detail(project_name):
+@main.route("/projects/<slug>")
+@cached_page("pages")
+def project_detail(slug):
     """
-    Render the project detail page based on project name.
+    Render the project detail page based on the project slug.
+
+    Legacy URLs built from the URL-encoded project title are permanently
+    redirected to the slug URL.
     """
     try:
-        # Decode the project name from the URL
-        decoded_project_name = unquote(project_name)
-
-        # Query the project by its title
-        project = (
-            database.session.query(Project)
-            .filter_by(title=decoded_project_name)
-            .first()
-        )
+        # A single probe of the unique slug index
+        project = database.session.query(Project).filter_by(slug=slug).one_or_none()
 
         if not project:
+            # Legacy URL: the title was URL-encoded twice
+            legacy_project = (
+                database.session.query(Project.slug)
+                .filter_by(title=unquote(slug))
+                .first()
+            )
+            if legacy_project:
+                app_logger.info(f"Redirecting legacy project URL: {slug}")
+                return redirect(
+                    url_for("main.project_detail", slug=legacy_project.slug), 301
+                )
+
             app_logger.error("Project not found")
-            app_logger.error(f"Details: {project_name}")
+            app_logger.error(f"Details: {slug}")
             abort(404)  # Return a 404 error if the project is not found
 
         return render_template("projects/project_detail.html", project=project)
@@ -9,15 +9,30 @@ The command-line interface accepts a single argument, "command", which
 specifies which app setup to run. The available commands are "start" and "stop".
 The available services are "app", "api", and "all".
 
+The "dump" and "restore" commands copy the content of the database to and from
+an NDJSON file given with "--path".
+
+The "build-static" command renders the public pages and static files into the
+directory given with "--output", rebuilding only what changed since the last
+build unless "--force" is given.
+
 Usage:
     python cli.py [command] [service]
 
 Example:
     python3 cli.py start all
     python3 cli.py stop all
+    python3 cli.py dump --path portfolio-dump.ndjson.gz
+    python3 cli.py restore --path portfolio-dump.ndjson.gz --replace
+    python3 cli.py build-static --output static-site
 """
 
-from cli.setup import parse_arguments, run_setup
+from cli.setup import (
+    parse_arguments,
+    run_build_static,
+    run_data_command,
+    run_setup,
+)
 
 from logging_setup import cli_logger
 
@@ -30,6 +45,14 @@ def cli() -> None:
     """
     cli_logger.info("Starting CLI...")
     args = parse_arguments()
+    if args.command in ("dump", "restore"):
+        cli_logger.info(f"Running data command: {args.command} {args.path}")
+        run_data_command(args.command, args.path, args.batch_size, args.replace)
+        return
+    if args.command == "build-static":
+        cli_logger.info(f"Building static site: {args.output}")
+        run_build_static(args.output, args.force)
+        return
     cli_logger.info(f"Running setup: {args.command} {args.service}")
     run_setup(args.command, args.service)
 
@@ -0,0 +1,227 @@
+"""
+Dump and restore the content of the portfolio database.
+
+Every table of ``src.db.models.metadata`` is streamed to a single NDJSON file,
+parents before children. Each table starts with a header line naming the table
+and its columns, followed by one JSON array per row::
+
+    {"table": "users", "columns": ["id", "name", ...]}
+    [1, "admin", ...]
+
+Rows are read through a server-side cursor and written in batches, so memory use
+does not depend on the size of the tables. Files ending in ``.gz`` are
+compressed. On PostgreSQL, restores load each table with ``COPY ... FROM STDIN``.
+
+The target database of a restore must already be migrated to the same
+revision as the source (``alembic upgrade head``).
+
+"""
+
+import gzip
+import json
+import os
+from datetime import date, datetime
+from typing import IO, Iterator
+
+from sqlalchemy import Connection, Table, create_engine, func, select, text
+
+from logging_setup import cli_logger
+from src.db.models import metadata
+
+# Tables holding per-environment secrets, which are never copied
+SKIPPED_TABLES = {"refresh_tokens"}
+
+DEFAULT_BATCH_SIZE = 1000
+
+
+def _tables() -> list[Table]:
+    """Return the tables to copy, parents before children."""
+    return [
+        table for table in metadata.sorted_tables if table.name not in SKIPPED_TABLES
+    ]
+
+
+def _open(path: str, mode: str) -> IO[str]:
+    if path.endswith(".gz"):
+        return gzip.open(path, mode + "t", encoding="utf-8")
+    return open(path, mode, encoding="utf-8")
+
+
+def _engine():
+    # A dedicated engine, since the application engines apply a statement
+    # timeout in production that a dump of a large table could exceed
+    return create_engine(os.getenv("DATABASE_URL"))
+
+
+def _encode(value):
+    if isinstance(value, (date, datetime)):
+        return value.isoformat()
+    raise TypeError(f"Cannot serialize {type(value).__name__}")
+
+
+def _decoders(table: Table, columns: list[str]) -> list:
+    """Return a function restoring the Python value of every column, or None."""
+    decoders = []
+    for name in columns:
+        try:
+            python_type = table.c[name].type.python_type
+        except NotImplementedError:
+            python_type = None
+        if python_type in (date, datetime):
+            decoders.append(python_type.fromisoformat)
+        else:
+            decoders.append(None)
+    return decoders
+
+
+def dump(path: str, batch_size: int = DEFAULT_BATCH_SIZE) -> None:
+    """
+    Dump every table to an NDJSON file.
+
+    Args:
+        path (str): The file to write, compressed if it ends in ``.gz``.
+        batch_size (int): The number of rows fetched from the server at a time.
+    """
+    engine = _engine()
+    with engine.connect() as connection, _open(path, "w") as file:
+        for table in _tables():
+            columns = [column.name for column in table.columns]
+            file.write(json.dumps({"table": table.name, "columns": columns}) + "\n")
+            result = connection.execution_options(yield_per=batch_size).execute(
+                select(table).order_by(*table.primary_key.columns)
+            )
+            count = 0
+            for row in result:
+                file.write(json.dumps(list(row), default=_encode) + "\n")
+                count += 1
+            cli_logger.info(f"Dumped {count} rows of {table.name}")
+    engine.dispose()
+    cli_logger.info(f"Database dumped to {path}")
+
+
+def _read(file: IO[str]) -> Iterator[tuple[str, list[str], Iterator[list]]]:
+    """
+    Iterate over the tables of a dump file.
+
+    Yields:
+        tuple[str, list[str], Iterator[list]]: The table name, its columns and an
+            iterator over its rows, which must be consumed before the next table.
+    """
+    line = file.readline()
+    while line:
+        header = json.loads(line)
+        pending = []
+
+        def rows():
+            while True:
+                row_line = file.readline()
+                if not row_line or row_line.startswith("{"):
+                    pending.append(row_line)
+                    return
+                yield json.loads(row_line)
+
+        yield header["table"], header["columns"], rows()
+        line = pending[0] if pending else ""
+
+
+def _batches(rows: Iterator[list], size: int) -> Iterator[list[list]]:
+    batch = []
+    for row in rows:
+        batch.append(row)
+        if len(batch) >= size:
+            yield batch
+            batch = []
+    if batch:
+        yield batch
+
+
+def _copy_rows(connection: Connection, table: Table, columns: list[str], rows) -> int:
+    """Load rows into a PostgreSQL table with ``COPY ... FROM STDIN``."""
+    cursor = connection.connection.driver_connection.cursor()
+    column_list = ", ".join(f'"{name}"' for name in columns)
+    count = 0
+    with cursor.copy(f'COPY "{table.name}" ({column_list}) FROM STDIN') as copy:
+        for row in rows:
+            copy.write_row(row)
+            count += 1
+    return count
+
+
+def _reset_sequences(connection: Connection) -> None:
+    """Move the PostgreSQL ID sequences past the restored rows."""
+    for table in _tables():
+        if "id" not in table.c or not table.c.id.autoincrement:
+            continue
+        connection.execute(
+            text(
+                "SELECT setval(pg_get_serial_sequence(:table, 'id'), "
+                "COALESCE(MAX(id), 1), MAX(id) IS NOT NULL) FROM " + f'"{table.name}"'
+            ),
+            {"table": table.name},
+        )
+
+
+def restore(
+    path: str, batch_size: int = DEFAULT_BATCH_SIZE, replace: bool = False
+) -> None:
+    """
+    Restore the tables of an NDJSON dump in a single transaction.
+
+    Args:
+        path (str): The dump file, compressed if it ends in ``.gz``.
+        batch_size (int): The number of rows inserted per statement, when the
+            rows cannot be loaded with ``COPY``.
+        replace (bool): Delete the existing rows first. Without it the restore is
+            aborted if any of the tables already holds rows.
+    """
+    tables = {table.name: table for table in _tables()}
+    engine = _engine()
+    if not replace:
+        with engine.connect() as connection:
+            for table in tables.values():
+                if connection.scalar(select(func.count()).select_from(table)):
+                    cli_logger.error(
+                        f"Table {table.name} is not empty, "
+                        "use --replace to overwrite the existing data"
+                    )
+                    engine.dispose()
+                    return
+
+    with engine.begin() as connection, _open(path, "r") as file:
+        if replace:
+            for table in reversed(list(tables.values())):
+                connection.execute(table.delete())
+
+        # COPY is only exposed by the psycopg 3 driver
+        use_copy = connection.dialect.driver == "psycopg"
+        for name, columns, rows in _read(file):
+            table = tables.get(name)
+            if table is None:
+                cli_logger.warning(f"Skipping unknown table {name}")
+                for _ in rows:
+                    pass
+                continue
+
+            decoders = _decoders(table, columns)
+            count = 0
+            decoded = (
+                [
+                    decode(value) if decode and value is not None else value
+                    for decode, value in zip(decoders, row)
+                ]
+                for row in rows
+            )
+            if use_copy:
+                count = _copy_rows(connection, table, columns, decoded)
+            else:
+                for batch in _batches(decoded, batch_size):
+                    connection.execute(
+                        table.insert(), [dict(zip(columns, row)) for row in batch]
+                    )
+                    count += len(batch)
+            cli_logger.info(f"Restored {count} rows of {name}")
+
+        if connection.dialect.name == "postgresql":
+            _reset_sequences(connection)
+    engine.dispose()
+    cli_logger.info(f"Database restored from {path}")
@@ -2,7 +2,9 @@ import argparse
 import os
 from typing import Optional, Callable, Dict
 
+from config import env_config
 from logging_setup import cli_logger
+from .data import DEFAULT_BATCH_SIZE, dump, restore
 from .operations import (
     run_flask_app,
     run_fast_api,
@@ -46,6 +48,41 @@ def run_setup(command: str, service: str) -> None:
         cli_logger.warning(f"Unknown command or service: {command} {service}")
 
 
+def run_data_command(
+    command: str, path: str, batch_size: int, replace: bool = False
+) -> None:
+    """
+    Dump the database to a file or restore it from one.
+
+    Args:
+        command (str): The command to run. Expected values are "dump" and "restore".
+        path (str): The NDJSON file to write or read, compressed if it ends in ".gz".
+        batch_size (int): The number of rows read or written at a time.
+        replace (bool): Whether a restore may overwrite existing data.
+    """
+    if command == "dump":
+        dump(path, batch_size)
+    elif command == "restore":
+        restore(path, batch_size, replace)
+    else:
+        cli_logger.warning(f"Unknown data command: {command}")
+
+
+def run_build_static(output: str, force: bool = False) -> None:
+    """
+    Render the public pages and static files into a directory.
+
+    Args:
+        output (str): The directory to write the site to.
+        force (bool): Whether to rebuild every page instead of the changed ones.
+    """
+    # Imported here: loading the Flask app is only needed by this command
+    from app import create_app
+    from app.static_site import build_static
+
+    build_static(create_app(), output, force)
+
+
 def parse_arguments() -> argparse.Namespace:
     """
     Parse command-line arguments to determine which setup to run.
@@ -54,14 +91,17 @@ def parse_arguments() -> argparse.Namespace:
         argparse.Namespace: The parsed arguments.
     """
     parser = argparse.ArgumentParser(
-        description="Run Flask and FastAPI apps",
+        description=(
+            "Run Flask and FastAPI apps, dump and restore the database, "
+            "or build the static site"
+        ),
         formatter_class=argparse.ArgumentDefaultsHelpFormatter,
     )
     parser.add_argument(
         "command",
         nargs="?",
         default=os.getenv("DEFAULT_COMMAND"),
-        choices=["start", "stop"],
+        choices=["start", "stop", "dump", "restore", "build-static"],
         help="Command to run",
     )
     parser.add_argument(
@@ -71,4 +111,30 @@ def parse_arguments() -> argparse.Namespace:
         choices=["app", "api", "all"],
         help="Service to run",
     )
+    parser.add_argument(
+        "--path",
+        default="portfolio-dump.ndjson.gz",
+        help="Dump file to write or restore from",
+    )
+    parser.add_argument(
+        "--batch-size",
+        type=int,
+        default=DEFAULT_BATCH_SIZE,
+        help="Rows read or written at a time by dump and restore",
+    )
+    parser.add_argument(
+        "--replace",
+        action="store_true",
+        help="Let restore delete the existing data first",
+    )
+    parser.add_argument(
+        "--output",
+        default=env_config[os.getenv("FLASK_ENV", "development")].STATIC_SITE_DIR,
+        help="Directory build-static writes the site to",
+    )
+    parser.add_argument(
+        "--force",
+        action="store_true",
+        help="Let build-static rebuild every page, not only the changed ones",
+    )
     return parser.parse_args()
@@ -16,14 +16,81 @@ class Config:
     MAIL_USERNAME = os.getenv("MAIL_USERNAME")
     MAIL_PASSWORD = os.getenv("MAIL_PASSWORD")
 
+    # Database connection pool settings (per worker process)
+    DB_POOL_SIZE = int(os.getenv("DB_POOL_SIZE", 5))  # Persistent connections
+    DB_MAX_OVERFLOW = int(os.getenv("DB_MAX_OVERFLOW", 10))  # Extra connections
+    DB_POOL_TIMEOUT = int(os.getenv("DB_POOL_TIMEOUT", 30))  # Wait for a connection
+    DB_POOL_RECYCLE = int(os.getenv("DB_POOL_RECYCLE", 1800))  # Connection max age
+    DB_POOL_PRE_PING = True  # Check connections before handing them out
+    DB_STATEMENT_TIMEOUT = int(os.getenv("DB_STATEMENT_TIMEOUT", 0))  # ms, 0 = off
+
+    # API response cache settings
+    CACHE_REDIS_URL = os.getenv("CACHE_REDIS_URL")  # In-process LRU when unset
+    CACHE_TTL = int(os.getenv("CACHE_TTL", 300))  # Seconds, 0 = caching off
+    CACHE_MAX_ENTRIES = int(os.getenv("CACHE_MAX_ENTRIES", 1024))  # In-process only
+
+    # Flask page cache settings
+    PAGE_CACHE_REDIS_URL = os.getenv(
+        "PAGE_CACHE_REDIS_URL"
+    )  # In-process LRU when unset
+    PAGE_CACHE_TTL = int(os.getenv("PAGE_CACHE_TTL", 3600))  # Seconds, 0 = caching off
+    PAGE_CACHE_MAX_ENTRIES = int(os.getenv("PAGE_CACHE_MAX_ENTRIES", 256))  # In-process
+
+    # Static site build settings (python run.py build-static)
+    STATIC_SITE_DIR = os.getenv("STATIC_SITE_DIR", "static-site")  # Output directory
+    # Rebuild after admin commits touching projects (Flask app)
+    STATIC_SITE_AUTOBUILD = (
+        os.getenv("STATIC_SITE_AUTOBUILD", "false").lower() == "true"
+    )
+
+    # Response compression settings (Flask app and API)
+    COMPRESS_MIN_SIZE = int(os.getenv("COMPRESS_MIN_SIZE", 500))  # Bytes
+    COMPRESS_GZIP_LEVEL = int(os.getenv("COMPRESS_GZIP_LEVEL", 6))  # 1-9
+    COMPRESS_BROTLI_QUALITY = int(os.getenv("COMPRESS_BROTLI_QUALITY", 4))  # 0-11
+    COMPRESS_CACHE_SIZE = int(os.getenv("COMPRESS_CACHE_SIZE", 256))  # 0 = off
+
+    # Admin form dropdown choices cache (Flask app, per worker process)
+    ADMIN_CHOICES_TTL = int(os.getenv("ADMIN_CHOICES_TTL", 300))  # Seconds, 0 = off
+
+    # Admin list view row counts cache (Flask app, per worker process)
+    ADMIN_COUNT_TTL = int(os.getenv("ADMIN_COUNT_TTL", 60))  # Seconds, 0 = off
+    # Tables above this many rows show the PostgreSQL estimate, 0 = always count
+    ADMIN_COUNT_ESTIMATE_ROWS = int(os.getenv("ADMIN_COUNT_ESTIMATE_ROWS", 100_000))
+    # Keyset-paged admin lists above this many rows only sort by indexed columns
+    ADMIN_INDEXED_SORT_ROWS = int(os.getenv("ADMIN_INDEXED_SORT_ROWS", 10_000))
+
+    # Verified access token cache settings (API, per worker process)
+    AUTH_CACHE_TTL = int(os.getenv("AUTH_CACHE_TTL", 300))  # Seconds, 0 = off
+    AUTH_CACHE_MAX_ENTRIES = int(os.getenv("AUTH_CACHE_MAX_ENTRIES", 1024))
+
+    # Password hashing pool and login throttling settings (API, per worker process)
+    AUTH_HASH_WORKERS = int(os.getenv("AUTH_HASH_WORKERS", 2))  # Hashing threads
+    AUTH_HASH_MAX_PENDING = int(os.getenv("AUTH_HASH_MAX_PENDING", 8))  # Queue cap
+    AUTH_HASH_WAIT = float(os.getenv("AUTH_HASH_WAIT", 5))  # Seconds, then 503
+    AUTH_THROTTLE_WINDOW = int(os.getenv("AUTH_THROTTLE_WINDOW", 300))  # Seconds
+    AUTH_MAX_FAILURES_PER_ACCOUNT = int(os.getenv("AUTH_MAX_FAILURES_PER_ACCOUNT", 5))
+    AUTH_MAX_ATTEMPTS_PER_IP = int(os.getenv("AUTH_MAX_ATTEMPTS_PER_IP", 30))
+
+    # Token lifetimes (API)
+    ACCESS_TOKEN_TTL = int(os.getenv("ACCESS_TOKEN_TTL", 1800))  # Seconds
+    REFRESH_TOKEN_TTL = int(os.getenv("REFRESH_TOKEN_TTL", 14 * 24 * 3600))  # Seconds
+    REFRESH_REVOKED_CACHE_SIZE = int(os.getenv("REFRESH_REVOKED_CACHE_SIZE", 4096))
+
 
 class DevelopmentConfig(Config):
     DEBUG = True
     SQLALCHEMY_ECHO = True  # Log SQL queries in development for debugging
+    DB_POOL_SIZE = int(os.getenv("DB_POOL_SIZE", 2))
+    DB_MAX_OVERFLOW = int(os.getenv("DB_MAX_OVERFLOW", 3))
+    CACHE_TTL = int(os.getenv("CACHE_TTL", 30))
+    PAGE_CACHE_TTL = int(os.getenv("PAGE_CACHE_TTL", 0))  # Templates change often
 
 
 class TestingConfig(Config):
     TESTING = True
+    DB_POOL_SIZE = int(os.getenv("DB_POOL_SIZE", 1))
+    DB_MAX_OVERFLOW = int(os.getenv("DB_MAX_OVERFLOW", 2))
+    DB_POOL_TIMEOUT = int(os.getenv("DB_POOL_TIMEOUT", 5))
 
 
 class ProductionConfig(Config):
@@ -31,6 +98,10 @@ class ProductionConfig(Config):
     TESTING = False
     SESSION_COOKIE_SECURE = True  # Enforce secure cookies in production
     SQLALCHEMY_TRACK_MODIFICATIONS = False  # Optimize for production
+    DB_POOL_SIZE = int(os.getenv("DB_POOL_SIZE", 10))
+    DB_MAX_OVERFLOW = int(os.getenv("DB_MAX_OVERFLOW", 5))
+    DB_POOL_TIMEOUT = int(os.getenv("DB_POOL_TIMEOUT", 10))
+    DB_STATEMENT_TIMEOUT = int(os.getenv("DB_STATEMENT_TIMEOUT", 30000))
 
 
 env_config = {
@@ -38,3 +109,28 @@ env_config = {
     "testing": TestingConfig,
     "production": ProductionConfig,
 }
+
+
+def engine_options(config) -> dict:
+    """
+    Build SQLAlchemy engine keyword arguments from a configuration class.
+
+    Args:
+        config (type[Config]): The configuration class to read the pool settings from.
+
+    Returns:
+        dict: Keyword arguments for ``create_engine`` / ``create_async_engine``.
+    """
+    options = {
+        "pool_size": config.DB_POOL_SIZE,
+        "max_overflow": config.DB_MAX_OVERFLOW,
+        "pool_timeout": config.DB_POOL_TIMEOUT,
+        "pool_recycle": config.DB_POOL_RECYCLE,
+        "pool_pre_ping": config.DB_POOL_PRE_PING,
+    }
+    if config.DB_STATEMENT_TIMEOUT:
+        # Enforced by PostgreSQL itself, so runaway queries are cancelled server-side
+        options["connect_args"] = {
+            "options": f"-c statement_timeout={config.DB_STATEMENT_TIMEOUT}"
+        }
+    return options
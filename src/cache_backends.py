@@ -0,0 +1,190 @@
+"""
+Cache backends shared by the API response cache and the Flask page cache
+
+Entries are bytes stored under a namespace and a key. Every namespace has a
+generation counter that ``clear`` increments before it drops the entries, so a
+cache that keys its entries by the generation read before rendering never
+serves a value rendered from data older than the last invalidation.
+
+The in-process LRU is synchronous and guarded by a lock, so it serves both the
+threaded Flask workers and, through ``AsyncLRUBackend``, the API's event loop.
+Redis comes as a synchronous and an asyncio backend over the same key layout.
+
+"""
+
+import threading
+import time
+from collections import OrderedDict
+from typing import Optional
+
+import redis
+from redis import asyncio as aioredis
+
+
+class LRUBackend:
+    """
+    Bounded in-process cache backend.
+
+    Entries are kept in insertion order of their last use and the least recently
+    used entry is evicted once ``max_entries`` is reached.
+
+    """
+
+    name = "memory"
+
+    def __init__(self, max_entries: int):
+        self.max_entries = max_entries
+        self.entries: OrderedDict[tuple[str, str], tuple[float, bytes]] = OrderedDict()
+        self.generations: dict[str, int] = {}
+        self.lock = threading.Lock()
+
+    def generation(self, namespace: str) -> int:
+        with self.lock:
+            return self.generations.get(namespace, 0)
+
+    def get(self, namespace: str, key: str) -> Optional[bytes]:
+        with self.lock:
+            entry = self.entries.get((namespace, key))
+            if entry is None:
+                return None
+            expires_at, value = entry
+            if expires_at < time.monotonic():
+                del self.entries[(namespace, key)]
+                return None
+            self.entries.move_to_end((namespace, key))
+            return value
+
+    def set(self, namespace: str, key: str, value: bytes, ttl: int) -> None:
+        with self.lock:
+            self.entries[(namespace, key)] = (time.monotonic() + ttl, value)
+            self.entries.move_to_end((namespace, key))
+            while len(self.entries) > self.max_entries:
+                self.entries.popitem(last=False)
+
+    def clear(self, namespace: str) -> None:
+        with self.lock:
+            self.generations[namespace] = self.generations.get(namespace, 0) + 1
+            for entry_key in [k for k in self.entries if k[0] == namespace]:
+                del self.entries[entry_key]
+
+    def size(self) -> Optional[int]:
+        return len(self.entries)
+
+
+class AsyncLRUBackend:
+    """
+    Awaitable interface over ``LRUBackend`` for the API.
+
+    The lock is only held for dictionary operations, so calling the synchronous
+    backend from the event loop does not block it.
+
+    """
+
+    name = LRUBackend.name
+
+    def __init__(self, max_entries: int):
+        self.lru = LRUBackend(max_entries)
+
+    async def generation(self, namespace: str) -> int:
+        return self.lru.generation(namespace)
+
+    async def get(self, namespace: str, key: str) -> Optional[bytes]:
+        return self.lru.get(namespace, key)
+
+    async def set(self, namespace: str, key: str, value: bytes, ttl: int) -> None:
+        self.lru.set(namespace, key, value, ttl)
+
+    async def clear(self, namespace: str) -> None:
+        self.lru.clear(namespace)
+
+    def size(self) -> Optional[int]:
+        return self.lru.size()
+
+
+class RedisKeys:
+    """
+    Key layout of the Redis backends.
+
+    Every entry is its own key with a TTL, and the keys of a namespace are
+    tracked in a set so the namespace can be cleared without scanning. The
+    generation of a namespace is a counter key without TTL, incremented with
+    ``INCR`` so every worker sees the same value.
+
+    """
+
+    name = "redis"
+
+    def __init__(self, prefix: str):
+        self.prefix = prefix
+
+    def _entry_key(self, namespace: str, key: str) -> str:
+        return f"{self.prefix}:{namespace}:{key}"
+
+    def _index_key(self, namespace: str) -> str:
+        return f"{self.prefix}:{namespace}"
+
+    def _generation_key(self, namespace: str) -> str:
+        return f"{self.prefix}-generation:{namespace}"
+
+    def size(self) -> Optional[int]:
+        return None
+
+
+class RedisBackend(RedisKeys):
+    """Redis cache backend shared by all workers, for synchronous callers."""
+
+    def __init__(self, url: str, prefix: str):
+        super().__init__(prefix)
+        self.client = redis.Redis.from_url(url)
+
+    def generation(self, namespace: str) -> int:
+        return int(self.client.get(self._generation_key(namespace)) or 0)
+
+    def get(self, namespace: str, key: str) -> Optional[bytes]:
+        return self.client.get(self._entry_key(namespace, key))
+
+    def set(self, namespace: str, key: str, value: bytes, ttl: int) -> None:
+        index_key = self._index_key(namespace)
+        with self.client.pipeline(transaction=False) as pipe:
+            pipe.set(self._entry_key(namespace, key), value, ex=ttl)
+            pipe.sadd(index_key, key)
+            pipe.expire(index_key, ttl)
+            pipe.execute()
+
+    def clear(self, namespace: str) -> None:
+        # Bumped first: values in flight are stored under the old generation
+        self.client.incr(self._generation_key(namespace))
+        index_key = self._index_key(namespace)
+        keys = self.client.smembers(index_key)
+        entry_keys = [self._entry_key(namespace, k.decode()) for k in keys]
+        self.client.delete(index_key, *entry_keys)
+
+
+class AsyncRedisBackend(RedisKeys):
+    """Redis cache backend shared by all workers, for asyncio callers."""
+
+    def __init__(self, url: str, prefix: str):
+        super().__init__(prefix)
+        self.client = aioredis.Redis.from_url(url)
+
+    async def generation(self, namespace: str) -> int:
+        return int(await self.client.get(self._generation_key(namespace)) or 0)
+
+    async def get(self, namespace: str, key: str) -> Optional[bytes]:
+        return await self.client.get(self._entry_key(namespace, key))
+
+    async def set(self, namespace: str, key: str, value: bytes, ttl: int) -> None:
+        index_key = self._index_key(namespace)
+        async with self.client.pipeline(transaction=False) as pipe:
+            pipe.set(self._entry_key(namespace, key), value, ex=ttl)
+            pipe.sadd(index_key, key)
+            pipe.expire(index_key, ttl)
+            await pipe.execute()
+
+    async def clear(self, namespace: str) -> None:
+        # Bumped first: values in flight are stored under the old generation
+        await self.client.incr(self._generation_key(namespace))
+        index_key = self._index_key(namespace)
+        keys = await self.client.smembers(index_key)
+        entry_keys = [self._entry_key(namespace, k.decode()) for k in keys]
+        await self.client.delete(index_key, *entry_keys)
@@ -0,0 +1,238 @@
+"""
+Content-encoding helpers shared by the Flask app and the API
+
+Brotli, a dependency of the project, is preferred over gzip when the client
+accepts both, since it produces smaller bodies for text at comparable speed.
+Without the ``brotli`` package only gzip is offered, and the Flask app and the
+API log a warning at startup.
+
+"""
+
+import gzip
+import hashlib
+import threading
+from collections import OrderedDict
+from typing import Iterable, Optional
+
+try:
+    import brotli
+except ImportError:  # pragma: no cover - fallback when brotli is missing
+    brotli = None
+
+# Encodings this server can produce, in order of preference
+SUPPORTED_ENCODINGS = ("br", "gzip") if brotli is not None else ("gzip",)
+
+# Media types worth compressing besides text/*
+COMPRESSIBLE_TYPES = {
+    "application/json",
+    "application/javascript",
+    "application/xml",
+    "image/svg+xml",
+}
+
+
+def parse_accept_encoding(header: str) -> dict[str, float]:
+    """
+    Parse an ``Accept-Encoding`` header into encodings and their q-values.
+
+    Args:
+        header (str): The header value, e.g. ``"gzip, br;q=0.8, *;q=0"``.
+
+    Returns:
+        dict[str, float]: The q-value of every listed encoding.
+    """
+    accepted = {}
+    for item in header.split(","):
+        name, _, params = item.strip().partition(";")
+        name = name.strip().lower()
+        if not name:
+            continue
+        quality = 1.0
+        params = params.strip()
+        if params.startswith("q="):
+            try:
+                quality = float(params[2:])
+            except ValueError:
+                quality = 0.0
+        accepted[name] = quality
+    return accepted
+
+
+def negotiate_encoding(
+    header: Optional[str], available: Iterable[str] = SUPPORTED_ENCODINGS
+) -> Optional[str]:
+    """
+    Pick the preferred encoding the client accepts.
+
+    Args:
+        header (str, optional): The ``Accept-Encoding`` request header.
+        available (Iterable[str]): The encodings to choose from, most preferred first.
+
+    Returns:
+        str, optional: The chosen encoding, or None to send the body as is.
+    """
+    if not header:
+        return None
+    accepted = parse_accept_encoding(header)
+    wildcard = accepted.get("*", 0.0)
+    best, best_quality = None, 0.0
+    for encoding in available:
+        quality = accepted.get(encoding, wildcard)
+        if quality > best_quality:
+            best, best_quality = encoding, quality
+    return best
+
+
+def compress(body: bytes, encoding: str, level: Optional[int] = None) -> bytes:
+    """
+    Compress a body with the given encoding.
+
+    Args:
+        body (bytes): The body to compress.
+        encoding (str): ``"gzip"`` or ``"br"``.
+        level (int, optional): The compression level (gzip 1-9, brotli 0-11).
+            Defaults to the highest level, suitable for bodies compressed once.
+
+    Returns:
+        bytes: The compressed body.
+    """
+    if encoding == "gzip":
+        return gzip.compress(body, compresslevel=9 if level is None else level, mtime=0)
+    if encoding == "br" and brotli is not None:
+        return brotli.compress(body, quality=11 if level is None else level)
+    raise ValueError(f"Unsupported content encoding: {encoding}")
+
+
+def encoded_etag(etag: str, encoding: str) -> str:
+    """
+    Derive the ETag of an encoded representation from the ETag of the identity one.
+
+    Args:
+        etag (str): The quoted entity tag of the uncompressed body.
+        encoding (str): The content encoding applied to the body.
+
+    Returns:
+        str: The entity tag with the encoding appended, e.g. ``"abc-gzip"``.
+    """
+    suffix = f'-{encoding}"'
+    if etag.endswith(suffix) or not etag.endswith('"'):
+        return etag
+    return etag[:-1] + suffix
+
+
+def strip_encoded_etags(if_none_match: str) -> str:
+    """
+    Map the encoded ETags of an ``If-None-Match`` header back to identity ETags.
+
+    Lets the conditional request handling behind the compression layer compare
+    the tags against the ETag of the uncompressed body.
+
+    Args:
+        if_none_match (str): The header value.
+
+    Returns:
+        str: The header value with encoding suffixes removed.
+    """
+    tags = []
+    for tag in if_none_match.split(","):
+        tag = tag.strip()
+        for encoding in SUPPORTED_ENCODINGS:
+            suffix = f'-{encoding}"'
+            if tag.endswith(suffix):
+                tag = tag[: -len(suffix)] + '"'
+                break
+        tags.append(tag)
+    return ", ".join(tags)
+
+
+class Compressor:
+    """
+    Response body compressor with a cache of compressed bodies.
+
+    Compressed bodies are cached under the response ETag when there is one and
+    under a hash of the body otherwise, together with the encoding, so a popular
+    payload is compressed once per encoding instead of on every hit. Hashing is
+    much cheaper than compressing, and keying by content means a cached body can
+    only ever be served for identical content.
+
+    """
+
+    def __init__(
+        self,
+        min_size: int = 500,
+        gzip_level: int = 6,
+        brotli_quality: int = 4,
+        cache_size: int = 256,
+    ):
+        """
+        Initialize the compressor.
+
+        Args:
+            min_size (int): Bodies smaller than this many bytes are sent as is.
+            gzip_level (int): The gzip compression level (1-9).
+            brotli_quality (int): The brotli quality (0-11).
+            cache_size (int): The number of compressed bodies to keep, 0 disables the cache.
+        """
+        self.min_size = min_size
+        self.levels = {"gzip": gzip_level, "br": brotli_quality}
+        self.cache_size = cache_size
+        self.cache: OrderedDict[tuple[str, str], bytes] = OrderedDict()
+        self.lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def should_compress(
+        self, content_type: Optional[str], content_encoding: Optional[str], size: int
+    ) -> bool:
+        """
+        Check whether a response body is worth compressing.
+
+        Args:
+            content_type (str, optional): The ``Content-Type`` response header.
+            content_encoding (str, optional): The ``Content-Encoding`` response header.
+            size (int): The size of the body in bytes.
+
+        Returns:
+            bool: Whether the body should be compressed.
+        """
+        if content_encoding or size < self.min_size or not content_type:
+            return False
+        media_type = content_type.split(";", 1)[0].strip().lower()
+        return (
+            media_type.startswith("text/")
+            or media_type in COMPRESSIBLE_TYPES
+            or media_type.endswith(("+json", "+xml"))
+        )
+
+    def compress(self, body: bytes, encoding: str, etag: Optional[str] = None) -> bytes:
+        """
+        Compress a body, reusing a previously compressed copy of it if cached.
+
+        Args:
+            body (bytes): The body to compress.
+            encoding (str): ``"gzip"`` or ``"br"``.
+            etag (str, optional): The strong ETag of the body, used as the cache key.
+
+        Returns:
+            bytes: The compressed body.
+        """
+        if not self.cache_size:
+            return compress(body, encoding, self.levels[encoding])
+
+        if etag is None or etag.startswith("W/"):
+            etag = hashlib.blake2b(body, digest_size=16).hexdigest()
+        key = (etag, encoding)
+        with self.lock:
+            compressed = self.cache.get(key)
+            if compressed is not None:
+                self.cache.move_to_end(key)
+                self.hits += 1
+                return compressed
+            self.misses += 1
+
+        compressed = compress(body, encoding, self.levels[encoding])
+        with self.lock:
+            self.cache[key] = compressed
+            while len(self.cache) > self.cache_size:
+                self.cache.popitem(last=False)
+        return compressed
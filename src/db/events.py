@@ -0,0 +1,56 @@
+"""
+Commit notifications for in-process caches
+
+Caches that hold data derived from database rows subscribe to
+``models_committed`` to drop their entries once a change to those rows is
+committed. Every ORM session (Flask-SQLAlchemy, the API's sync and async
+sessions, scripts) is covered, because the listeners are registered on the
+``Session`` class itself.
+
+Only changes made through ORM objects in a session are seen. Bulk
+``update()``/``delete()`` statements and writes from other processes are not,
+so caches relying on this signal still need a TTL.
+
+"""
+
+from collections import defaultdict
+
+from blinker import Namespace
+from sqlalchemy import event, inspect
+from sqlalchemy.orm import Session
+
+signals = Namespace()
+
+# Sent once per model class after a commit that inserted, updated or deleted
+# instances of it. Receivers get the model class as sender and the primary keys
+# of the changed rows as ``ids``.
+models_committed = signals.signal("models-committed")
+
+# Session.info key the pending changes are collected under
+CHANGES_KEY = "committed_model_changes"
+
+
+@event.listens_for(Session, "after_flush")
+def collect_changes(session, flush_context):
+    """Record the primary keys of the rows written by a flush."""
+    changes = session.info.setdefault(CHANGES_KEY, defaultdict(set))
+    modified = [instance for instance in session.dirty if session.is_modified(instance)]
+    for instance in (*session.new, *modified, *session.deleted):
+        state = inspect(instance)
+        # New rows only get their identity once the flush is finalized
+        key = state.identity or state.mapper.primary_key_from_instance(instance)
+        changes[type(instance)].add(key[0] if len(key) == 1 else tuple(key))
+
+
+@event.listens_for(Session, "after_commit")
+def send_changes(session):
+    """Notify the receivers of the rows written by the committed transaction."""
+    changes = session.info.pop(CHANGES_KEY, None)
+    for model, ids in (changes or {}).items():
+        models_committed.send(model, ids=frozenset(ids))
+
+
+@event.listens_for(Session, "after_rollback")
+def discard_changes(session):
+    """Forget the rows written by a rolled back transaction."""
+    session.info.pop(CHANGES_KEY, None)
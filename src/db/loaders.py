@@ -0,0 +1,36 @@
+"""
+Loader strategies for relationship attributes
+
+Every consumer that walks relationships of a model (an API response schema or a
+Flask template) has its loader options declared here, next to the relationships
+it reads. Queries apply them with ``.options(*LOADERS)`` so related rows are
+fetched in a fixed number of queries instead of one lazy load per row.
+
+- ``joinedload`` is used for many-to-one relationships, which add at most one row
+  to each result row.
+- ``selectinload`` is used for collections, which are fetched with a single
+  ``WHERE ... IN (...)`` query for the whole result.
+"""
+
+from sqlalchemy.orm import joinedload, selectinload
+
+from src.db.models import Project, Skill
+
+# ============================ API schemas =============================
+
+# api.schemas.project.ProjectSchema serializes ``images``
+PROJECT_SCHEMA_LOADERS = (selectinload(Project.images),)
+
+# api.schemas.skill.SkillSchema serializes ``skill_category``
+SKILL_SCHEMA_LOADERS = (joinedload(Skill.skill_category),)
+
+# Same for skills returned by INSERT/UPDATE ... RETURNING, which cannot be joined
+SKILL_RETURNING_LOADERS = (selectinload(Skill.skill_category),)
+
+# ============================ Flask views =============================
+
+# app/templates/projects.html reads ``project_category.name`` and loops ``images``
+PROJECTS_PAGE_LOADERS = (
+    joinedload(Project.project_category),
+    selectinload(Project.images),
+)
@@ -1,18 +1,32 @@
+import itertools
+import re
+import unicodedata
+from typing import Optional
+
 from flask_login import UserMixin
 from sqlalchemy import (
+    DDL,
     Column,
+    Index,
     Integer,
     String,
+    Table,
     Text,
     DateTime,
     Date,
     Boolean,
     ForeignKey,
+    event,
     func,
+    inspect,
+    select,
+    text,
 )
 from sqlalchemy import MetaData
 from sqlalchemy.ext.declarative import declarative_base
-from sqlalchemy.orm import relationship
+from sqlalchemy.dialects.postgresql import insert as postgresql_insert
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+from sqlalchemy.orm import Session, relationship
 
 # ========================== SQLAlchemy Setup ==========================
 
@@ -81,6 +95,7 @@ class Project(Base):
         id (int): Unique identifier for the project.
         user_id (int): Foreign key referencing the User model.
         title (str): Title of the project.
+        slug (str): Unique URL name of the project, derived from the title.
         description (str): Description of the project.
         tech_stack (str): Technologies used in the project.
         url (str): URL of the project.
@@ -88,23 +103,29 @@ class Project(Base):
         project_category_id (int): Foreign key referencing the ProjectCategory model.
         images (list[Image]): List of associated images.
         project_category (ProjectCategory): The category this project belongs to.
+        tags (list[Tag]): The technologies of ``tech_stack``, kept in sync with it.
     """
 
     __tablename__ = "projects"
 
     id = Column(Integer, primary_key=True)
-    user_id = Column(Integer, ForeignKey("users.id"), nullable=False)
-    title = Column(String(100), nullable=False)
+    user_id = Column(Integer, ForeignKey("users.id"), nullable=False, index=True)
+    title = Column(String(100), nullable=False, index=True)
+    # Set from the title whenever it is written, see assign_project_slugs
+    slug = Column(String(100), nullable=False, unique=True, index=True)
     description = Column(Text)
     tech_stack = Column(String(255))
     url = Column(String(255))
     created_at = Column(DateTime, default=func.current_timestamp())
     project_category_id = Column(
-        Integer, ForeignKey("project_categories.id"), nullable=False
+        Integer, ForeignKey("project_categories.id"), nullable=False, index=True
     )
 
     images = relationship("Image", back_populates="project")
     project_category = relationship("ProjectCategory", back_populates="projects")
+    tags = relationship(
+        "Tag", secondary="project_tags", viewonly=True, order_by="Tag.name"
+    )
 
     def __init__(
         self, user_id, title, description, tech_stack, url, project_category_id
@@ -211,9 +232,9 @@ class Image(Base):
     name = Column(String(100), nullable=False)
     url = Column(String(255), nullable=False)
     image_category_id = Column(
-        Integer, ForeignKey("image_categories.id"), nullable=True
+        Integer, ForeignKey("image_categories.id"), nullable=True, index=True
     )
-    project_id = Column(Integer, ForeignKey("projects.id"), nullable=True)
+    project_id = Column(Integer, ForeignKey("projects.id"), nullable=True, index=True)
     project = relationship("Project", back_populates="images")
     image_category = relationship("ImageCategory", back_populates="images")
 
@@ -263,7 +284,7 @@ class ImageCategory(Base):
 
     id = Column(Integer, primary_key=True)
     name = Column(String(50), nullable=False)
-    images = relationship("Image", back_populates="image_category", lazy="joined")
+    images = relationship("Image", back_populates="image_category")
 
     def __init__(self, name):
         """Initialize an ImageCategory instance.
@@ -296,9 +317,14 @@ class Skill(Base):
     """
 
     __tablename__ = "skills"
+    # Serves the skill_category_id foreign key and the skills of a category,
+    # which are listed in ID order
+    __table_args__ = (
+        Index("ix_skills_skill_category_id_id", "skill_category_id", "id"),
+    )
 
     id = Column(Integer, primary_key=True)
-    user_id = Column(Integer, ForeignKey("users.id"), nullable=False)
+    user_id = Column(Integer, ForeignKey("users.id"), nullable=False, index=True)
     skill_category_id = Column(
         Integer, ForeignKey("skill_categories.id"), nullable=False
     )
@@ -364,7 +390,7 @@ class Experience(Base):
     __tablename__ = "experiences"
 
     id = Column(Integer, primary_key=True)
-    user_id = Column(Integer, ForeignKey("users.id"), nullable=False)
+    user_id = Column(Integer, ForeignKey("users.id"), nullable=False, index=True)
     company_name = Column(String(100), nullable=False)
     role = Column(String(100), nullable=False)
     start_date = Column(Date)
@@ -447,7 +473,7 @@ class Resume(Base):
     __tablename__ = "resume"
 
     id = Column(Integer, primary_key=True)
-    user_id = Column(Integer, ForeignKey("users.id"), nullable=False)
+    user_id = Column(Integer, ForeignKey("users.id"), nullable=False, index=True)
     link = Column(String(255), nullable=False)
     created_at = Column(DateTime, default=func.current_timestamp())
     user = relationship("User", backref="resume", lazy=True)
@@ -480,12 +506,13 @@ class Certification(Base):
         credential_url (str): URL of the credential.
         skills_acquired (str): Skills acquired through the certification.
         user (User): The user who owns the certification.
+        tags (list[Tag]): The skills of ``skills_acquired``, kept in sync with it.
     """
 
     __tablename__ = "certifications"
 
     id = Column(Integer, primary_key=True)
-    user_id = Column(Integer, ForeignKey("users.id"), nullable=False)
+    user_id = Column(Integer, ForeignKey("users.id"), nullable=False, index=True)
     name = Column(String(255), nullable=False)
     issuing_organization = Column(String(255), nullable=False)
     issue_date = Column(Date, nullable=False)
@@ -497,6 +524,9 @@ class Certification(Base):
     )  # Assuming skills are stored as a comma-separated string
 
     user = relationship("User", backref="certifications", lazy=True)
+    tags = relationship(
+        "Tag", secondary="certification_tags", viewonly=True, order_by="Tag.name"
+    )
 
     def __init__(
         self,
@@ -540,3 +570,409 @@ class Certification(Base):
             f"credential_url='{self.credential_url}', "
             f"skills_acquired='{self.skills_acquired}')"
         )
+
+
+class RefreshToken(Base):
+    """RefreshToken model tracking the refresh tokens issued to API clients.
+
+    Every login starts a new token family. Each refresh revokes the presented
+    token and issues the next one of the same family, so a token that is
+    presented again after it was rotated reveals a leak, and the whole family
+    is revoked.
+
+    Attributes:
+        id (int): Unique identifier for the refresh token.
+        jti (str): Unique ID of the token, the ``jti`` claim of the JWT.
+        family_id (str): ID shared by all tokens rotated from the same login.
+        user_id (int): Foreign key referencing the User model.
+        expires_at (datetime): Expiration time of the token (UTC).
+        revoked (bool): Whether the token has been rotated or revoked.
+        created_at (datetime): Timestamp when the token was issued.
+    """
+
+    __tablename__ = "refresh_tokens"
+
+    id = Column(Integer, primary_key=True)
+    jti = Column(String(64), unique=True, nullable=False)
+    family_id = Column(String(64), nullable=False, index=True)
+    user_id = Column(
+        Integer, ForeignKey("users.id", ondelete="CASCADE"), nullable=False, index=True
+    )
+    expires_at = Column(DateTime, nullable=False)
+    revoked = Column(Boolean, nullable=False, default=False)
+    created_at = Column(DateTime, default=func.current_timestamp())
+
+    def __repr__(self):
+        """Return a string representation of the RefreshToken instance."""
+        return (
+            f"RefreshToken(user_id={self.user_id}, family_id='{self.family_id}', "
+            f"revoked={self.revoked})"
+        )
+
+
+# ================================ Tags ================================
+
+# ``Project.tech_stack`` and ``Certification.skills_acquired`` stay the editable,
+# comma-separated source of truth. Every write to them is mirrored into the
+# normalized ``tags`` table and its association tables, which back the indexed
+# ``?tech=`` and ``?skill=`` filters of the API.
+
+
+class Tag(Base):
+    """Tag model representing a technology or skill shared by projects and certifications.
+
+    Attributes:
+        id (int): Unique identifier for the tag.
+        name (str): Name of the tag, as first written.
+        key (str): Case-insensitive lookup key of the tag, see ``tag_key``.
+    """
+
+    __tablename__ = "tags"
+
+    id = Column(Integer, primary_key=True)
+    name = Column(String(255), nullable=False)
+    key = Column(String(255), nullable=False, unique=True)
+
+    def __str__(self):
+        """Return the name of the tag."""
+        return self.name
+
+
+# Each association is keyed by its owner first, for loading the tags of a row,
+# and indexed by tag first, for filtering rows by tag
+project_tags = Table(
+    "project_tags",
+    metadata,
+    Column(
+        "project_id",
+        Integer,
+        ForeignKey("projects.id", ondelete="CASCADE"),
+        primary_key=True,
+    ),
+    Column(
+        "tag_id", Integer, ForeignKey("tags.id", ondelete="CASCADE"), primary_key=True
+    ),
+    Index("ix_project_tags_tag_id", "tag_id", "project_id"),
+)
+
+certification_tags = Table(
+    "certification_tags",
+    metadata,
+    Column(
+        "certification_id",
+        Integer,
+        ForeignKey("certifications.id", ondelete="CASCADE"),
+        primary_key=True,
+    ),
+    Column(
+        "tag_id", Integer, ForeignKey("tags.id", ondelete="CASCADE"), primary_key=True
+    ),
+    Index("ix_certification_tags_tag_id", "tag_id", "certification_id"),
+)
+
+# The comma-separated column and the association table mirroring it, per model
+TAGGED_COLUMNS = {
+    Project: ("tech_stack", project_tags, project_tags.c.project_id),
+    Certification: (
+        "skills_acquired",
+        certification_tags,
+        certification_tags.c.certification_id,
+    ),
+}
+
+
+def tag_key(name: str) -> str:
+    """Return the case-insensitive lookup key of a tag name.
+
+    Args:
+        name (str): The name of the tag.
+
+    Returns:
+        str: The key, e.g. ``"fastapi"`` for ``" FastAPI "``.
+    """
+    return name.strip().casefold()
+
+
+def split_tags(value) -> list[str]:
+    """Split a comma-separated string into tag names.
+
+    Blank entries and case-insensitive duplicates are dropped.
+
+    Args:
+        value (str, optional): The comma-separated string.
+
+    Returns:
+        list[str]: The tag names, in their original order.
+    """
+    names = {}
+    for name in (value or "").split(","):
+        name = name.strip()
+        if name:
+            names.setdefault(tag_key(name), name)
+    return list(names.values())
+
+
+def sync_tags(session: Session, model, values: dict) -> None:
+    """Replace the tags of rows with the ones of their comma-separated column.
+
+    Runs a fixed number of statements for any number of rows: the missing tags
+    are inserted at once, then the associations of the rows are replaced.
+
+    Args:
+        session (Session): The session whose transaction the statements join.
+        model: ``Project`` or ``Certification``.
+        values (dict): The comma-separated column value of every row, by ID.
+    """
+    if not values:
+        return
+    _, association, owner_column = TAGGED_COLUMNS[model]
+    connection = session.connection()
+    names = {id_: split_tags(value) for id_, value in values.items()}
+    wanted = {tag_key(name): name for row in names.values() for name in row}
+
+    found = {}
+    if wanted:
+        found.update(
+            connection.execute(select(Tag.key, Tag.id).where(Tag.key.in_(wanted))).all()
+        )
+        missing = [
+            {"name": name, "key": key}
+            for key, name in wanted.items()
+            if key not in found
+        ]
+        if missing:
+            # Ignore tags created meanwhile by a concurrent transaction
+            dialect = connection.dialect.name
+            if dialect in ("postgresql", "sqlite"):
+                insert = {"postgresql": postgresql_insert, "sqlite": sqlite_insert}
+                statement = insert[dialect](Tag).on_conflict_do_nothing()
+            else:
+                statement = Tag.__table__.insert()
+            connection.execute(statement, missing)
+            found.update(
+                connection.execute(
+                    select(Tag.key, Tag.id).where(
+                        Tag.key.in_([row["key"] for row in missing])
+                    )
+                ).all()
+            )
+
+    connection.execute(association.delete().where(owner_column.in_(names)))
+    links = [
+        {owner_column.name: id_, "tag_id": found[tag_key(name)]}
+        for id_, row in names.items()
+        for name in row
+    ]
+    if links:
+        connection.execute(association.insert(), links)
+
+
+def filter_by_tag(statement, model, name: str):
+    """Restrict a select of projects or certifications to the ones with a tag.
+
+    The tag is looked up by its unique key and its rows are joined through the
+    ``(tag_id, owner_id)`` index of the association table.
+
+    Args:
+        statement (Select): The select statement of the model.
+        model: ``Project`` or ``Certification``.
+        name (str): The name of the tag, in any case.
+
+    Returns:
+        Select: The filtered statement.
+    """
+    _, association, owner_column = TAGGED_COLUMNS[model]
+    return (
+        statement.join(association, owner_column == model.id)
+        .join(Tag, Tag.id == association.c.tag_id)
+        .where(Tag.key == tag_key(name))
+    )
+
+
+@event.listens_for(Session, "after_flush")
+def sync_flushed_tags(session, flush_context):
+    """Mirror the comma-separated columns written by a flush into the tags."""
+    for model, (column, _, _) in TAGGED_COLUMNS.items():
+        values = {
+            instance.id: getattr(instance, column)
+            for instance in (*session.new, *session.dirty)
+            if isinstance(instance, model)
+            and (
+                instance in session.new
+                or inspect(instance).attrs[column].history.has_changes()
+            )
+        }
+        sync_tags(session, model, values)
+
+
+# =============================== Slugs ================================
+
+# Longest slug derived from a title, leaving room for a "-<n>" suffix
+SLUG_BASE_LENGTH = 90
+
+# Number of suffixed slugs looked up at once when the plain slug is used
+SLUG_CANDIDATES = 10
+
+
+def slugify(title: str) -> str:
+    """Turn a title into a lowercase, ASCII, hyphen-separated URL name.
+
+    Args:
+        title (str): The title, e.g. ``"Portfolio: Flask & FastAPI"``.
+
+    Returns:
+        str: The slug, e.g. ``"portfolio-flask-fastapi"``.
+    """
+    ascii_title = (
+        unicodedata.normalize("NFKD", title or "").encode("ascii", "ignore").decode()
+    )
+    slug = re.sub(r"[^a-z0-9]+", "-", ascii_title.lower()).strip("-")
+    return slug[:SLUG_BASE_LENGTH].rstrip("-") or "project"
+
+
+def unique_slug(
+    connection, title: str, project_id: Optional[int] = None, taken: set = frozenset()
+) -> str:
+    """Derive a slug from a title that no other project uses.
+
+    Args:
+        connection (Connection): The connection to look the existing slugs up with.
+        title (str): The title of the project.
+        project_id (int, optional): The ID of the project, whose own slug is free.
+        taken (set): Slugs already handed out but not written yet.
+
+    Returns:
+        str: The slug, suffixed with ``-2``, ``-3``, ... if the plain one is used.
+    """
+    base = slugify(title)
+    # Candidates are probed in batches of equality lookups on the unique index
+    for start in itertools.count(0, SLUG_CANDIDATES):
+        candidates = [
+            base if n == 1 else f"{base}-{n}"
+            for n in range(start + 1, start + SLUG_CANDIDATES + 1)
+        ]
+        statement = select(Project.slug).where(Project.slug.in_(candidates))
+        if project_id is not None:
+            statement = statement.where(Project.id != project_id)
+        used = set(connection.scalars(statement)) | set(taken)
+        for slug in candidates:
+            if slug not in used:
+                return slug
+
+
+@event.listens_for(Session, "before_flush")
+def assign_project_slugs(session, flush_context, instances):
+    """Set the slug of every project whose title is about to be written."""
+    # New projects created with an explicit slug keep it
+    new = [
+        instance
+        for instance in session.new
+        if isinstance(instance, Project) and not instance.slug
+    ]
+    renamed = [
+        instance
+        for instance in session.dirty
+        if isinstance(instance, Project)
+        and inspect(instance).attrs.title.history.has_changes()
+    ]
+    taken = set()
+    for project in (*new, *renamed):
+        project.slug = unique_slug(
+            session.connection(), project.title, project.id, taken
+        )
+        taken.add(project.slug)
+
+
+# ========================== Full-text search ==========================
+
+# Constants of the search expressions are rendered inline rather than bound, so
+# that queries repeat the exact expression of the indexes below and PostgreSQL
+# can use them
+SEARCH_CONFIG = text("'english'::regconfig")
+
+
+def search_document(*columns):
+    """Build the ``tsvector`` expression searched over the given text columns.
+
+    Args:
+        *columns (Column): The columns to search, NULLs are treated as empty text.
+
+    Returns:
+        The ``to_tsvector`` SQL expression.
+    """
+    empty, space = text("''"), text("' '")
+    document = func.coalesce(columns[0], empty)
+    for column in columns[1:]:
+        document = document.op("||")(space).op("||")(func.coalesce(column, empty))
+    return func.to_tsvector(SEARCH_CONFIG, document)
+
+
+# Columns searched by /api/search, per table
+SEARCH_COLUMNS = {
+    "projects": ("title", "description", "tech_stack"),
+    "certifications": ("name", "skills_acquired"),
+}
+
+PROJECT_SEARCH_DOCUMENT = search_document(
+    *(Project.__table__.c[name] for name in SEARCH_COLUMNS["projects"])
+)
+CERTIFICATION_SEARCH_DOCUMENT = search_document(
+    *(Certification.__table__.c[name] for name in SEARCH_COLUMNS["certifications"])
+)
+
+# PostgreSQL: GIN expression indexes over the search documents
+Index("ix_projects_search", PROJECT_SEARCH_DOCUMENT, postgresql_using="gin").ddl_if(
+    dialect="postgresql"
+)
+Index(
+    "ix_certifications_search", CERTIFICATION_SEARCH_DOCUMENT, postgresql_using="gin"
+).ddl_if(dialect="postgresql")
+
+
+def fts5_ddl(table: str, columns: tuple) -> list[str]:
+    """Build the DDL of an FTS5 index kept in sync with a table by triggers.
+
+    Used on SQLite, which has no ``tsvector``, so search can be run without
+    PostgreSQL (e.g. in development).
+
+    Args:
+        table (str): The name of the indexed table.
+        columns (tuple): The names of the indexed columns.
+
+    Returns:
+        list[str]: The statements creating the FTS5 table and its triggers.
+    """
+    names = ", ".join(columns)
+    new = ", ".join(f"new.{column}" for column in columns)
+    old = ", ".join(f"old.{column}" for column in columns)
+    delete_old = (
+        f"INSERT INTO {table}_fts({table}_fts, rowid, {names}) "
+        f"VALUES ('delete', old.id, {old});"
+    )
+    insert_new = f"INSERT INTO {table}_fts(rowid, {names}) VALUES (new.id, {new});"
+    return [
+        f"CREATE VIRTUAL TABLE {table}_fts USING fts5("
+        f"{names}, content='{table}', content_rowid='id')",
+        f"CREATE TRIGGER {table}_fts_insert AFTER INSERT ON {table} "
+        f"BEGIN {insert_new} END",
+        f"CREATE TRIGGER {table}_fts_delete AFTER DELETE ON {table} "
+        f"BEGIN {delete_old} END",
+        f"CREATE TRIGGER {table}_fts_update AFTER UPDATE ON {table} "
+        f"BEGIN {delete_old} {insert_new} END",
+    ]
+
+
+# SQLite: FTS5 tables created and dropped together with the indexed tables
+for _model in (Project, Certification):
+    _table = _model.__tablename__
+    for _statement in fts5_ddl(_table, SEARCH_COLUMNS[_table]):
+        event.listen(
+            _model.__table__,
+            "after_create",
+            DDL(_statement).execute_if(dialect="sqlite"),
+        )
+    event.listen(
+        _model.__table__,
+        "before_drop",
+        DDL(f"DROP TABLE IF EXISTS {_table}_fts").execute_if(dialect="sqlite"),
+    )
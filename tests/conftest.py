@@ -0,0 +1,21 @@
+"""
+Shared test setup
+
+The configuration is read from the environment when the packages are imported,
+so it is prepared here, before any test module imports them. Unless
+``DATABASE_URL`` is exported, the suite runs against a throwaway SQLite
+database, and a developer's ``.env`` is never used.
+
+"""
+
+import os
+import tempfile
+
+if "DATABASE_URL" not in os.environ:
+    _directory = tempfile.mkdtemp(prefix="portfolio-tests-")
+    os.environ["DATABASE_URL"] = f"sqlite:///{_directory}/portfolio.db"
+    os.environ["ASYNC_DATABASE_URL"] = f"sqlite+aiosqlite:///{_directory}/portfolio.db"
+
+os.environ.setdefault("FLASK_ENV", "testing")
+os.environ.setdefault("FAST_ENV", "testing")
+os.environ.setdefault("SECRET_KEY", "test-secret-key")
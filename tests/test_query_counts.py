@@ -0,0 +1,206 @@
+"""
+Query-count regression tests for the list endpoints
+
+Every list endpoint is requested against a database seeded with a growing number
+of rows, and the SELECT statements it issues are counted. The count must not
+depend on the number of rows: if it does, a relationship is lazy loaded per row
+and its consumer in ``src/db/loaders.py`` is missing a loader option.
+
+The endpoints run against a SQLite database of their own, whatever
+``DATABASE_URL`` points to.
+
+"""
+
+import os
+from datetime import date, datetime
+
+import pytest
+from fastapi.testclient import TestClient
+from sqlalchemy import create_engine, event
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
+from sqlalchemy.orm import Session
+
+from api import create_api
+from api.cache import response_cache
+from api.db import database as api_database
+from app import create_app
+from app.db import database as app_database
+from app.page_cache import page_cache
+from config import env_config
+from src.db.models import (
+    Certification,
+    Experience,
+    Image,
+    ImageCategory,
+    Project,
+    ProjectCategory,
+    Skill,
+    SkillCategory,
+    User,
+    metadata,
+)
+
+# Rows seeded per table, one fresh database per size
+SIZES = (1, 10, 30)
+
+API_LIST_ENDPOINTS = (
+    "/api/projects",
+    "/api/skills",
+    "/api/experiences",
+    "/api/certifications",
+)
+
+APP_LIST_ENDPOINTS = ("/projects",)
+
+
+def seed(session: Session, size: int) -> None:
+    """
+    Insert ``size`` projects (two images each), skills, experiences and
+    certifications.
+
+    Every project and skill gets its own category so that a per-row lazy load
+    cannot be hidden by the identity map.
+
+    Args:
+        session (Session): The session to insert with.
+        size (int): The number of rows per table.
+    """
+    user = User(name="user", email="user@example.com", password_hash="-")
+    image_category = ImageCategory(name="screenshots")
+    session.add_all([user, image_category])
+    session.flush()
+    for index in range(size):
+        project_category = ProjectCategory(name=f"category-{index}")
+        skill_category = SkillCategory(name=f"category-{index}")
+        session.add_all([project_category, skill_category])
+        session.flush()
+        project = Project(
+            user_id=user.id,
+            title=f"project-{index}",
+            description="-",
+            tech_stack=f"Python, Tech {index}",
+            url="-",
+            project_category_id=project_category.id,
+        )
+        session.add(project)
+        session.flush()
+        session.add_all(
+            [
+                Image(f"image-{index}-{n}", "-", image_category.id, project.id)
+                for n in range(2)
+            ]
+        )
+        session.add_all(
+            [
+                Skill(user.id, skill_category.id, f"skill-{index}", "-"),
+                Experience(
+                    user.id, f"company-{index}", "-", datetime(2024, 1, 1), None, "-"
+                ),
+                Certification(
+                    user.id,
+                    f"certification-{index}",
+                    "-",
+                    date(2024, 1, 1),
+                    None,
+                    None,
+                    f"SQL, Skill {index}",
+                ),
+            ]
+        )
+    session.commit()
+
+
+@pytest.fixture(scope="module")
+def database_url(tmp_path_factory):
+    return f"{tmp_path_factory.mktemp('query-counts')}/portfolio.db"
+
+
+@pytest.fixture(scope="module")
+def statements():
+    return []
+
+
+@pytest.fixture(scope="module")
+def seed_database(database_url):
+    engine = create_engine(f"sqlite:///{database_url}")
+
+    def reseed(size: int) -> None:
+        metadata.drop_all(engine)
+        metadata.create_all(engine)
+        with Session(engine) as session:
+            seed(session, size)
+
+    yield reseed
+    engine.dispose()
+
+
+@pytest.fixture(scope="module")
+def api_client(database_url, statements):
+    engine = create_async_engine(f"sqlite+aiosqlite:///{database_url}")
+    event.listen(
+        engine.sync_engine,
+        "before_cursor_execute",
+        lambda *args: statements.append(args[2]),
+    )
+    sessions = async_sessionmaker(engine, class_=AsyncSession, expire_on_commit=False)
+
+    async def get_db_session():
+        async with sessions() as session:
+            yield session
+
+    api = create_api()
+    api.dependency_overrides[api_database.get_async_db_session] = get_db_session
+    with pytest.MonkeyPatch.context() as monkeypatch:
+        monkeypatch.setattr(response_cache, "ttl", 0)
+        with TestClient(api) as client:
+            yield client
+
+
+@pytest.fixture(scope="module")
+def app_client(database_url, statements):
+    config = env_config[os.getenv("FLASK_ENV", "development")]
+    with pytest.MonkeyPatch.context() as monkeypatch:
+        monkeypatch.setattr(
+            config, "SQLALCHEMY_DATABASE_URI", f"sqlite:///{database_url}"
+        )
+        monkeypatch.setattr(page_cache, "ttl", 0)
+        app = create_app()
+        with app.app_context():
+            event.listen(
+                app_database.engine,
+                "before_cursor_execute",
+                lambda *args: statements.append(args[2]),
+            )
+        yield app.test_client()
+
+
+def count_selects(client, path: str, statements: list) -> int:
+    statements.clear()
+    response = client.get(path)
+    assert response.status_code == 200, f"GET {path}: {response.status_code}"
+    return sum(1 for s in statements if s.lstrip().upper().startswith("SELECT"))
+
+
+@pytest.fixture(scope="module")
+def query_counts(seed_database, api_client, app_client, statements):
+    """The SELECT count of every list endpoint, for every size in ``SIZES``."""
+    counts = {}
+    for size in SIZES:
+        seed_database(size)
+        for path in API_LIST_ENDPOINTS:
+            counts.setdefault(path, {})[size] = count_selects(
+                api_client, path, statements
+            )
+        for path in APP_LIST_ENDPOINTS:
+            counts.setdefault(path, {})[size] = count_selects(
+                app_client, path, statements
+            )
+    return counts
+
+
+@pytest.mark.parametrize("path", API_LIST_ENDPOINTS + APP_LIST_ENDPOINTS)
+def test_list_endpoint_query_count_is_constant(query_counts, path):
+    counts = query_counts[path]
+    assert len(set(counts.values())) == 1, (
+        f"GET {path} issues a number of queries that grows with the rows: {counts}"
+    )
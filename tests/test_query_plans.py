@@ -0,0 +1,296 @@
+"""
+Query-plan tests for the indexed access paths
+
+Runs ``EXPLAIN`` on the lookups issued by the API crud functions and the Flask
+views and fails if any of them reads a table with a sequential scan while that
+table holds more than ``THRESHOLD`` rows, i.e. when a query that should be
+served by an index is not.
+
+The plans are taken from PostgreSQL, so the tests are skipped unless
+``DATABASE_URL`` points to a PostgreSQL database. The tables are created and
+seeded in a schema of their own, inside a transaction that is rolled back, so
+the database is left untouched.
+
+"""
+
+import os
+import uuid
+from datetime import date, datetime
+
+import pytest
+from sqlalchemy import Connection, create_engine, func, insert, select, update
+
+from src.db.models import (
+    Certification,
+    Experience,
+    Image,
+    ImageCategory,
+    Project,
+    ProjectCategory,
+    RefreshToken,
+    Skill,
+    SkillCategory,
+    Tag,
+    User,
+    certification_tags,
+    filter_by_tag,
+    metadata,
+    project_tags,
+)
+
+DATABASE_URL = os.getenv("DATABASE_URL", "")
+
+pytestmark = pytest.mark.skipif(
+    not DATABASE_URL.startswith("postgresql"),
+    reason="query plans are checked on PostgreSQL only",
+)
+
+# Rows seeded per table
+ROWS = 5000
+
+# Tables with at most this many rows may be fully scanned, since the planner
+# rightly prefers a scan over an index for small tables
+THRESHOLD = 1000
+
+
+def seed(connection: Connection, rows: int) -> None:
+    """
+    Insert ``rows`` projects, images, skills, experiences and certifications.
+
+    The rows are spread over many users, categories and tags so that every
+    indexed lookup is selective, as it is on a real database.
+
+    Args:
+        connection (Connection): The connection to insert with.
+        rows (int): The number of rows per table.
+    """
+    groups = max(rows // 10, 1)
+    connection.execute(
+        insert(User),
+        [
+            {
+                "name": f"user-{n}",
+                "email": f"user-{n}@example.com",
+                "password_hash": "-",
+            }
+            for n in range(groups)
+        ],
+    )
+    for model in (ProjectCategory, ImageCategory, SkillCategory):
+        connection.execute(insert(model), [{"name": f"c-{n}"} for n in range(groups)])
+    connection.execute(
+        insert(Tag), [{"name": f"Tag {n}", "key": f"tag {n}"} for n in range(groups)]
+    )
+
+    owner = lambda n: n % groups + 1  # noqa: E731
+    connection.execute(
+        insert(Project),
+        [
+            {
+                "user_id": owner(n),
+                "title": f"project-{n}",
+                "slug": f"project-{n}",
+                "description": "-",
+                "tech_stack": "-",
+                "url": "-",
+                "project_category_id": owner(n),
+                "created_at": datetime(2024, 1, 1),
+            }
+            for n in range(rows)
+        ],
+    )
+    connection.execute(
+        insert(Image),
+        [
+            {
+                "name": f"image-{n}",
+                "url": "-",
+                "image_category_id": owner(n),
+                "project_id": n + 1,
+            }
+            for n in range(rows)
+        ],
+    )
+    connection.execute(
+        insert(Skill),
+        [
+            {
+                "user_id": owner(n),
+                "skill_category_id": owner(n),
+                "skill_name": f"skill-{n}",
+            }
+            for n in range(rows)
+        ],
+    )
+    connection.execute(
+        insert(Experience),
+        [{"user_id": owner(n), "company_name": "-", "role": "-"} for n in range(rows)],
+    )
+    connection.execute(
+        insert(Certification),
+        [
+            {
+                "user_id": owner(n),
+                "name": f"certification-{n}",
+                "issuing_organization": "-",
+                "issue_date": date(2024, 1, 1),
+                "skills_acquired": "-",
+            }
+            for n in range(rows)
+        ],
+    )
+    for association, owner_column in (
+        (project_tags, "project_id"),
+        (certification_tags, "certification_id"),
+    ):
+        connection.execute(
+            insert(association),
+            [{owner_column: n + 1, "tag_id": owner(n)} for n in range(rows)],
+        )
+    connection.execute(
+        insert(RefreshToken),
+        [
+            {
+                "jti": f"jti-{n}",
+                "family_id": f"family-{n // 4}",
+                "user_id": owner(n),
+                "expires_at": datetime(2030, 1, 1),
+                "revoked": False,
+            }
+            for n in range(rows)
+        ],
+    )
+
+
+def queries(connection: Connection) -> dict:
+    """
+    Build the statements to check, with parameters taken from the database.
+
+    Every statement mirrors a lookup of the crud functions or views named in
+    its key.
+
+    Args:
+        connection (Connection): The connection to read the parameters with.
+
+    Returns:
+        dict: The statement of every checked lookup, by name.
+    """
+    first = lambda column: connection.scalar(select(func.min(column)))  # noqa: E731
+    project_ids = connection.scalars(
+        select(Project.id).order_by(Project.id).limit(50)
+    ).all()
+    tag_name = connection.scalar(select(Tag.name).order_by(Tag.id).limit(1)) or "-"
+    return {
+        "api.crud.skill.get_skills_by_category": select(Skill)
+        .where(Skill.skill_category_id == first(Skill.skill_category_id))
+        .order_by(Skill.id),
+        "api.pagination.paginate (projects)": select(Project)
+        .where(Project.id > first(Project.id))
+        .order_by(Project.id)
+        .limit(51),
+        "PROJECT_SCHEMA_LOADERS (Project.images)": select(Image).where(
+            Image.project_id.in_(project_ids)
+        ),
+        "ImageCategory.images": select(Image).where(
+            Image.image_category_id == first(Image.image_category_id)
+        ),
+        "app.views.project_detail": select(Project).where(
+            Project.slug == connection.scalar(select(func.min(Project.slug)))
+        ),
+        "app.views.project_detail (legacy title URL)": select(Project.slug)
+        .where(Project.title == connection.scalar(select(func.min(Project.title))))
+        .limit(1),
+        "src.db.models.unique_slug": select(Project.slug).where(
+            Project.slug.in_(["project-1", "project-1-2", "project-1-3"])
+        ),
+        "api.crud.project.update_project": select(Project.id).where(
+            Project.id == first(Project.id), Project.user_id == first(Project.user_id)
+        ),
+        "api.crud.project.delete_project (images)": update(Image)
+        .where(Image.project_id == first(Project.id))
+        .values(project_id=None),
+        "api.crud.project.get_projects_page (?tech=)": filter_by_tag(
+            select(Project), Project, tag_name
+        )
+        .order_by(Project.id)
+        .limit(51),
+        "api.crud.education.get_certifications_page (?skill=)": filter_by_tag(
+            select(Certification), Certification, tag_name
+        )
+        .order_by(Certification.id)
+        .limit(51),
+        "api.routes.security.login_for_access_token": select(User).where(
+            User.email == connection.scalar(select(func.min(User.email)))
+        ),
+        "api.crud.refresh_token.revoke_token_family": update(RefreshToken)
+        .where(RefreshToken.family_id == "family-0")
+        .values(revoked=True),
+        "api.crud.refresh_token.rotate_refresh_token": select(RefreshToken.id).where(
+            RefreshToken.jti == "jti-0"
+        ),
+    }
+
+
+def sequential_scans(connection: Connection, statement) -> list[str]:
+    """
+    Return the tables a statement reads with a sequential scan.
+
+    Args:
+        connection (Connection): The connection to run ``EXPLAIN`` with.
+        statement: The statement to explain. It is not executed.
+
+    Returns:
+        list[str]: The names of the scanned tables.
+    """
+    sql = str(
+        statement.compile(
+            dialect=connection.dialect, compile_kwargs={"literal_binds": True}
+        )
+    )
+    plan = connection.exec_driver_sql(f"EXPLAIN (FORMAT JSON) {sql}").scalar()
+    nodes, tables = [plan[0]["Plan"]], []
+    while nodes:
+        node = nodes.pop()
+        if node["Node Type"] == "Seq Scan":
+            tables.append(node["Relation Name"])
+        nodes.extend(node.get("Plans", []))
+    return tables
+
+
+@pytest.fixture(scope="module")
+def connection():
+    engine = create_engine(DATABASE_URL)
+    schema = f"query_plans_{uuid.uuid4().hex[:8]}"
+    with engine.connect() as connection:
+        transaction = connection.begin()
+        connection.exec_driver_sql(f"CREATE SCHEMA {schema}")
+        connection.exec_driver_sql(f"SET LOCAL search_path TO {schema}")
+        metadata.create_all(connection)
+        seed(connection, ROWS)
+        for table in metadata.sorted_tables:
+            connection.exec_driver_sql(f"ANALYZE {table.name}")
+        yield connection
+        transaction.rollback()
+    engine.dispose()
+
+
+def test_lookups_use_an_index(connection):
+    counts = {
+        table.name: connection.scalar(select(func.count()).select_from(table))
+        for table in metadata.sorted_tables
+    }
+    failures = {
+        name: tables
+        for name, statement in queries(connection).items()
+        if (
+            tables := [
+                f"{table} ({counts[table]} rows)"
+                for table in sequential_scans(connection, statement)
+                if counts.get(table, 0) > THRESHOLD
+            ]
+        )
+    }
+    assert not failures, (
+        "Lookups scanning a whole table, add or fix the index they should use: "
+        f"{failures}"
+    )